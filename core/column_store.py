@@ -0,0 +1,304 @@
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.schema_inference import EXAMPLE_COUNT
+
+# On-disk representation of each column kind
+KIND_DTYPES = {
+    'numeric': np.float64,
+    'datetime': np.int64,
+    'text': np.int32
+}
+NAT_VALUE = np.iinfo(np.int64).min
+MISSING_CODE = -1
+
+class ColumnStore:
+    """
+    Columns spilled to memory-mapped NumPy files in a scratch directory
+    
+    Text columns are stored as int32 codes into a per-column dictionary
+    file, written as new values appear. While spilling, values are matched
+    to codes by their 64-bit hash, so memory holds 12 bytes per distinct
+    value rather than the values themselves.
+    """
+    
+    def __init__(self, scratch_dir=None):
+        self.scratch_dir = Path(tempfile.mkdtemp(prefix='report_columns_', dir=scratch_dir))
+        self.n_rows = 0
+        self.columns = []
+        self.kinds = {}
+        # Values that did not fit a column's kind, in Schema.report's format
+        self.coercions = {}
+        # Schema.report of the load, set by ExcelHandler.load_out_of_core
+        self.schema = None
+        self._files = {}
+        self._paths = {}
+        self._dictionary_files = {}
+        self._dictionary_paths = {}
+        self._dictionary_bytes = {}
+        self._category_lookup = {}
+        self._category_counts = {}
+        self._pending_nulls = {}
+        self._finalizer = weakref.finalize(self, shutil.rmtree, str(self.scratch_dir), True)
+        
+    @classmethod
+    def from_chunks(cls, chunks, scratch_dir=None):
+        """
+        Build a store by appending DataFrame chunks column by column
+        
+        Args:
+            chunks (iterable): DataFrame chunks with consistent columns
+            scratch_dir (str): Parent directory for the spill files
+            
+        Returns:
+            ColumnStore: Finished store
+        """
+        store = cls(scratch_dir)
+        try:
+            for chunk in chunks:
+                store.append(chunk)
+            store.finish()
+        except Exception:
+            store.cleanup()
+            raise
+        return store
+        
+    @staticmethod
+    def column_kind(series):
+        """Storage kind of a pandas column"""
+        if pd.api.types.is_bool_dtype(series):
+            return 'text'
+        if pd.api.types.is_numeric_dtype(series):
+            return 'numeric'
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return 'datetime'
+        return 'text'
+        
+    def append(self, chunk):
+        """Append one chunk; column kinds are fixed by their first non-null values"""
+        for col in chunk.columns:
+            if col not in self._pending_nulls and col not in self.kinds:
+                self.columns.append(col)
+                self._pending_nulls[col] = self.n_rows
+                
+            series = chunk[col]
+            if col not in self.kinds:
+                if series.isna().all():
+                    self._pending_nulls[col] += len(series)
+                    continue
+                self._start_column(col, self.column_kind(series))
+                
+            self._write(col, series)
+            
+        for col in self.columns:
+            if col not in chunk.columns:
+                self._write_nulls(col, len(chunk))
+                
+        self.n_rows += len(chunk)
+        
+    def finish(self):
+        """Close spill files; columns that never held a value are dropped"""
+        for col in list(self._pending_nulls):
+            if col not in self.kinds:
+                self.columns.remove(col)
+        self._pending_nulls.clear()
+        
+        self._close_files()
+        self._category_lookup.clear()
+        
+    def _close_files(self):
+        handles = list(self._files.values())
+        handles += [handle for pair in self._dictionary_files.values() for handle in pair]
+        for handle in handles:
+            handle.close()
+        self._files.clear()
+        self._dictionary_files.clear()
+        
+    def _start_column(self, col, kind):
+        """Open the spill file for a column and back-fill earlier rows as nulls"""
+        self.kinds[col] = kind
+        position = len(self._paths)
+        self._paths[col] = self.scratch_dir / f"col_{position}.bin"
+        self._files[col] = open(self._paths[col], 'wb')
+        
+        if kind == 'text':
+            # Value bytes, and the end offset of each value
+            self._dictionary_paths[col] = (
+                self.scratch_dir / f"col_{position}.dict",
+                self.scratch_dir / f"col_{position}.offsets"
+            )
+            self._dictionary_files[col] = tuple(open(path, 'wb') for path in self._dictionary_paths[col])
+            self._dictionary_bytes[col] = 0
+            self._category_lookup[col] = (np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int32))
+            self._category_counts[col] = 0
+            
+        self._write_nulls(col, self._pending_nulls.pop(col))
+        
+    def _write_nulls(self, col, count):
+        if col not in self.kinds:
+            self._pending_nulls[col] = self._pending_nulls.get(col, 0) + count
+            return
+            
+        kind = self.kinds[col]
+        fill = {'numeric': np.nan, 'datetime': NAT_VALUE, 'text': MISSING_CODE}[kind]
+        np.full(count, fill, dtype=KIND_DTYPES[kind]).tofile(self._files[col])
+        
+    def _write(self, col, series):
+        """Encode a chunk of one column into its on-disk representation"""
+        kind = self.kinds[col]
+        not_null = series.notna().to_numpy()
+        
+        if kind == 'numeric':
+            values = pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            self._record_coercions(col, series, not_null & np.isnan(values))
+        elif kind == 'datetime':
+            stamps = pd.to_datetime(series, errors='coerce')
+            if getattr(stamps.dt, 'tz', None) is not None:
+                stamps = stamps.dt.tz_localize(None)
+            values = stamps.to_numpy(dtype='datetime64[ns]').view('int64')
+            self._record_coercions(col, series, not_null & (values == NAT_VALUE))
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            mapping = self._category_codes(col, np.array([str(value) for value in uniques], dtype=object))
+            values = np.where(codes >= 0, mapping[codes] if len(mapping) else MISSING_CODE, MISSING_CODE)
+            
+        np.ascontiguousarray(values, dtype=KIND_DTYPES[kind]).tofile(self._files[col])
+        
+    def _category_codes(self, col, labels):
+        """
+        Codes of a chunk's distinct text values; unseen values are appended
+        to the column's dictionary file
+        """
+        known_hashes, known_codes = self._category_lookup[col]
+        hashes = pd.util.hash_array(labels)
+        
+        # Distinct values can share a label (1 and '1'); give them one code
+        distinct, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        positions = np.searchsorted(known_hashes, distinct).clip(max=max(len(known_hashes) - 1, 0))
+        found = known_hashes[positions] == distinct if len(known_hashes) else np.zeros(len(distinct), dtype=bool)
+        codes = np.where(found, known_codes[positions] if len(known_codes) else 0, 0).astype(np.int32)
+        
+        # New values get the next codes in order of first appearance
+        new = np.flatnonzero(~found)
+        new = new[np.argsort(first[new], kind='stable')]
+        count = self._category_counts[col]
+        codes[new] = np.arange(count, count + len(new), dtype=np.int32)
+        
+        if len(new):
+            encoded = [label.encode('utf-8', 'surrogatepass') for label in labels[first[new]]]
+            ends = self._dictionary_bytes[col] + np.cumsum([len(value) for value in encoded], dtype=np.int64)
+            values_file, offsets_file = self._dictionary_files[col]
+            values_file.write(b''.join(encoded))
+            ends.tofile(offsets_file)
+            self._dictionary_bytes[col] = int(ends[-1])
+            self._category_counts[col] = count + len(new)
+            
+            hashes = np.concatenate([known_hashes, distinct[new]])
+            order = np.argsort(hashes, kind='stable')
+            self._category_lookup[col] = (hashes[order], np.concatenate([known_codes, codes[new]])[order])
+            
+        return codes[inverse]
+        
+    def _record_coercions(self, col, series, failed):
+        """Log values that did not fit the column's kind and were stored as missing"""
+        if not failed.any():
+            return
+            
+        kind = self.kinds[col]
+        entry = self.coercions.setdefault(col, {
+            'kind': kind,
+            'dtype': 'float64' if kind == 'numeric' else 'datetime64[ns]',
+            'date_format': None,
+            'values_converted': 0,
+            'values_coerced_to_missing': 0,
+            'examples': []
+        })
+        entry['values_coerced_to_missing'] += int(failed.sum())
+        for value in series[failed].astype(str).unique()[:EXAMPLE_COUNT]:
+            if len(entry['examples']) < EXAMPLE_COUNT and value not in entry['examples']:
+                entry['examples'].append(value)
+        
+    def column(self, col):
+        """
+        Memory-mapped buffer of a column
+        
+        Numeric columns are float64 with NaN for missing values, datetimes
+        int64 nanoseconds with NAT_VALUE, text int32 category codes with -1.
+        """
+        if col not in self.kinds:
+            raise ValueError(f"Column '{col}' not found in data")
+        if self.n_rows == 0:
+            return np.empty(0, dtype=KIND_DTYPES[self.kinds[col]])
+        return np.memmap(self._paths[col], dtype=KIND_DTYPES[self.kinds[col]], mode='r', shape=(self.n_rows,))
+        
+    def categories(self, col, codes=None):
+        """
+        Distinct text values of a text column, read from its dictionary file
+        
+        Args:
+            col (str): Text column
+            codes (numpy.ndarray): Category codes to decode, or None for all
+            
+        Returns:
+            list: Values, indexed by category code when codes is None
+        """
+        if col not in self._dictionary_paths:
+            return []
+        values_path, offsets_path = self._dictionary_paths[col]
+        ends = np.fromfile(offsets_path, dtype=np.int64)
+        if codes is None:
+            codes = np.arange(len(ends))
+        if not len(codes):
+            return []
+            
+        starts = np.concatenate([[0], ends[:-1]])
+        # An empty file cannot be mapped; it only holds empty strings
+        blob = np.memmap(values_path, dtype=np.uint8, mode='r') if ends[-1] else b''
+        return [
+            bytes(blob[start:end]).decode('utf-8', 'surrogatepass')
+            for start, end in zip(starts[codes].tolist(), ends[codes].tolist())
+        ]
+        
+    def series(self, col, start=0, stop=None):
+        """Decode rows start..stop of a column back into a pandas Series"""
+        values = np.asarray(self.column(col)[start:stop])
+        kind = self.kinds[col]
+        
+        if kind == 'numeric':
+            return pd.Series(values, name=col)
+        if kind == 'datetime':
+            # NAT_VALUE is NumPy's own NaT bit pattern
+            return pd.Series(values.view('datetime64[ns]'), name=col)
+            
+        # Only the codes in view are decoded from the dictionary
+        present = values >= 0
+        codes, positions = np.unique(values[present], return_inverse=True)
+        decoded = np.full(len(values), None, dtype=object)
+        decoded[present] = np.array(self.categories(col, codes), dtype=object)[positions]
+        return pd.Series(decoded, name=col, dtype=object)
+        
+    def head(self, n=5):
+        """First rows of the store as a DataFrame"""
+        return pd.DataFrame({col: self.series(col, 0, n) for col in self.columns})
+        
+    def nbytes(self):
+        """Size of the spilled columns and text dictionaries on disk"""
+        paths = [self._paths[col] for col in self.columns]
+        paths += [path for col in self.columns for path in self._dictionary_paths.get(col, ())]
+        return sum(path.stat().st_size for path in paths)
+        
+    def cleanup(self):
+        """Delete the scratch directory"""
+        self._close_files()
+        self._finalizer()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
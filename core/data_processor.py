@@ -1,7 +1,22 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from statistics import NormalDist
 import re
+import warnings
+
+from core.filter_engine import ColumnIndexCache, FilterSpec, Predicate
+from core.frequency_cache import FrequencyCache
+from core.histogram import HISTOGRAM_BINS, Histogram
+from core.profile_snapshot import ProfileSnapshot
+from core.schema_inference import EXAMPLE_COUNT
+
+# Cells per float block of the batched numeric summary; bounds the block
+# and the temporaries of the nan-aware reductions to a small share of the frame
+NUMERIC_BATCH_CELLS = 2 ** 18
+
+# Report types process_all builds by default
+REPORT_TYPES = ("summary", "detailed", "overview")
 
 class DataProcessor:
     """Processes and analyzes data for report generation"""
@@ -9,38 +24,76 @@ class DataProcessor:
     def __init__(self):
         self.data = None
         self.processed_data = {}
+        self.profile_snapshot = None
+        self._column_indexes = None
+        self._numeric_summary = None
+        self._frequencies = None
+        self._shared_data = None
+        self._shared = {}
         
-    def process_data(self, data, report_type="summary"):
+    def process_data(self, data, report_type="summary", source_file=None):
         """
         Process data based on report type
         
         Args:
             data (pandas.DataFrame): Raw data
             report_type (str): Type of report to generate
+            source_file (str): Workbook path; enables incremental profiling
+                through a snapshot stored next to it
             
         Returns:
             dict: Processed data ready for report generation
         """
-        self.data = data.copy()
+        return self.process_all(data, [report_type], source_file)[report_type]
+        
+    def process_all(self, data, report_types=REPORT_TYPES, source_file=None):
+        """
+        Profile the data once and build several report types from it
+        
+        Basic statistics, the profile snapshot and the per-dataset caches
+        (numeric summary, frequency tables, missing counts, duplicates) are
+        computed once and shared by every report type.
+        
+        Args:
+            data (pandas.DataFrame): Raw data
+            report_types (list): Report types to build
+            source_file (str): Workbook path; enables incremental profiling
+                through a snapshot stored next to it
+                
+        Returns:
+            dict: Processed data per report type
+        """
+        # Shared read-only with the caller; copy-on-write (pandas 3) protects it
+        self.data = data
+        self.profile_snapshot = None
+        
+        incremental_info = None
+        if source_file:
+            incremental_info = self.update_profile_snapshot(source_file)
         
         # Basic data analysis
         basic_stats = self.get_basic_statistics()
-        
-        # Process based on report type
-        if report_type == "summary":
-            processed = self.process_summary_report()
-        elif report_type == "detailed":
-            processed = self.process_detailed_report()
-        elif report_type == "overview":
-            processed = self.process_overview_report()
-        else:
-            processed = self.process_summary_report()
+        if incremental_info:
+            basic_stats['incremental_profile'] = incremental_info
+            
+        results = {}
+        for report_type in dict.fromkeys(report_types):
+            # Process based on report type
+            if report_type == "summary":
+                processed = self.process_summary_report()
+            elif report_type == "detailed":
+                processed = self.process_detailed_report()
+            elif report_type == "overview":
+                processed = self.process_overview_report()
+            else:
+                processed = self.process_summary_report()
+                
+            # Combine with basic stats
+            processed.update(basic_stats)
+            results[report_type] = processed
             
-        # Combine with basic stats
-        processed.update(basic_stats)
-        
         self.processed_data = processed
-        return processed
+        return results
         
     def get_basic_statistics(self):
         """Get basic statistics about the data"""
@@ -49,8 +102,8 @@ class DataProcessor:
             'total_columns': len(self.data.columns),
             'column_names': list(self.data.columns),
             'data_types': self.data.dtypes.to_dict(),
-            'missing_values': self.data.isnull().sum().to_dict(),
-            'memory_usage': self.data.memory_usage(deep=True).sum(),
+            'missing_values': self.get_missing_values(),
+            'memory_usage': self.get_memory_usage(),
             'numeric_columns': list(self.data.select_dtypes(include=[np.number]).columns),
             'text_columns': list(self.data.select_dtypes(include=['object']).columns),
             'datetime_columns': list(self.data.select_dtypes(include=['datetime64']).columns)
@@ -58,17 +111,486 @@ class DataProcessor:
         
         # Add numeric statistics
         if stats['numeric_columns']:
-            numeric_data = self.data[stats['numeric_columns']]
+            summary = self.get_numeric_summary()
             stats['numeric_stats'] = {
-                'mean': numeric_data.mean().to_dict(),
-                'median': numeric_data.median().to_dict(),
-                'std': numeric_data.std().to_dict(),
-                'min': numeric_data.min().to_dict(),
-                'max': numeric_data.max().to_dict()
+                stat: {col: summary[col][stat] for col in stats['numeric_columns']}
+                for stat in ('mean', 'median', 'std', 'min', 'max')
             }
+            
+        # Header row and type coercions found while loading
+        if self.data.attrs.get('schema'):
+            stats['schema'] = self.data.attrs['schema']
         
         return stats
         
+    def get_missing_values(self):
+        """Missing value count per column"""
+        return self.get_missing_counts().to_dict()
+        
+    def shared(self, name, build):
+        """Value computed once per dataset and shared by every report type"""
+        if self._shared_data is not self.data:
+            self._shared_data = self.data
+            self._shared = {}
+        if name not in self._shared:
+            self._shared[name] = build()
+        return self._shared[name]
+        
+    def get_missing_counts(self):
+        """Missing values per column as a Series, from the snapshot when one is loaded"""
+        if self.profile_snapshot is not None:
+            snapshot_stats = self.profile_snapshot.stats
+            return self.shared('missing_counts', lambda: pd.Series(
+                {col: snapshot_stats[col]['missing'] for col in self.data.columns}, dtype='int64'
+            ))
+        return self.shared('missing_counts', lambda: self.data.isnull().sum())
+        
+    def get_duplicate_count(self):
+        """Number of rows that repeat an earlier row"""
+        if self.profile_snapshot is not None:
+            return self.profile_snapshot.duplicate_rows
+        return self.shared('duplicate_rows', self._count_duplicates)
+        
+    def _count_duplicates(self):
+        # DataFrame.duplicated factorizes every column at once, a frame-sized
+        # int64 block; row hashes are built column by column, and only rows
+        # whose hash repeats are compared exactly
+        hashes = pd.util.hash_pandas_object(self.data, index=False)
+        candidates = hashes.duplicated(keep=False).to_numpy()
+        if not candidates.any():
+            return 0
+        return int(self.data[candidates].duplicated().sum())
+        
+    def get_memory_usage(self):
+        """Deep memory usage of the data in bytes"""
+        if self.profile_snapshot is not None:
+            column_memory = sum(col_stats['memory'] for col_stats in self.profile_snapshot.stats.values())
+            return column_memory + self.data.index.memory_usage(deep=True)
+        return self.shared('memory_usage', lambda: self.data.memory_usage(deep=True).sum())
+        
+    def update_profile_snapshot(self, source_file):
+        """
+        Reuse the stored snapshot when the workbook only gained rows
+        
+        When the saved rows are still the first rows of the data, only the
+        appended rows are profiled and merged into the snapshot. The summary
+        report is then read from the snapshot, so the saved rows are not
+        processed again. A full run only saves the snapshot; its report is
+        computed from the data, so nothing is estimated.
+        
+        Args:
+            source_file (str): Path to the workbook the data was loaded from
+            
+        Returns:
+            dict: Profiling mode and the number of rows that were profiled
+        """
+        snapshot = ProfileSnapshot.load(source_file)
+        
+        if snapshot is not None and snapshot.matches_prefix(self.data):
+            profiled_rows = len(self.data) - snapshot.row_count
+            snapshot.extend(self.data)
+            mode = 'incremental'
+        else:
+            snapshot = ProfileSnapshot.from_data(self.data)
+            profiled_rows = len(self.data)
+            mode = 'full'
+            
+        snapshot.save(source_file)
+        if mode == 'incremental':
+            self.profile_snapshot = snapshot
+        
+        return {'mode': mode, 'profiled_rows': profiled_rows}
+        
+    @staticmethod
+    def summarize_snapshot_column(col_stats):
+        """
+        analyze_numeric_data-style statistics from a snapshot column
+        
+        Count, mean, std and extremes are exact. The median, quartiles and
+        outlier count are exact too while the column's value counts are
+        kept (few distinct values); otherwise they are read from the
+        column's histogram.
+        
+        Args:
+            col_stats (dict): Column statistics from ProfileSnapshot.stats
+            
+        Returns:
+            dict: Statistics of the column
+        """
+        count = col_stats['count']
+        if col_stats.get('values'):
+            distinct, counts = np.array(sorted(col_stats['values']), dtype='float64').T
+            # Same linear interpolation as np.percentile, over the counted values
+            cumulative = np.cumsum(counts)
+            positions = np.array([0.25, 0.5, 0.75]) * (count - 1)
+            low = distinct[np.searchsorted(cumulative, np.floor(positions), side='right')]
+            high = distinct[np.searchsorted(cumulative, np.ceil(positions), side='right')]
+            q1, median, q3 = (low + (positions - np.floor(positions)) * (high - low)).tolist()
+            iqr = q3 - q1
+            outside = (distinct < q1 - 1.5 * iqr) | (distinct > q3 + 1.5 * iqr)
+            outliers = int(counts[outside].sum())
+        else:
+            histogram = Histogram.from_dict(col_stats['histogram'])
+            q1, median, q3 = (histogram.quantile(q) for q in (0.25, 0.5, 0.75))
+            iqr = q3 - q1
+            outliers = histogram.count_outside(q1 - 1.5 * iqr, q3 + 1.5 * iqr) if count else 0
+            
+        return {
+            'count': count,
+            'mean': col_stats['mean'] if count else np.nan,
+            'median': median,
+            'std': float(np.sqrt(col_stats['m2'] / (count - 1))) if count > 1 else np.nan,
+            'min': col_stats['min'] if count else np.nan,
+            'max': col_stats['max'] if count else np.nan,
+            'quartiles': {
+                'q1': q1,
+                'q3': q3
+            },
+            'outliers_count': outliers
+        }
+        
+    def process_sample(self, sample, population_rows, report_type="summary", confidence=0.95):
+        """
+        Process a row sample and attach confidence intervals for the population
+        
+        Args:
+            sample (pandas.DataFrame): Uniform row sample
+            population_rows (int): Number of rows the sample was drawn from
+            report_type (str): Type of report to generate
+            confidence (float): Confidence level of the intervals
+            
+        Returns:
+            dict: Processed data ready for report generation
+        """
+        processed = self.process_data(sample, report_type=report_type)
+        processed['sampling'] = self.estimate_confidence_intervals(population_rows, confidence)
+        return processed
+        
+    def estimate_confidence_intervals(self, population_rows, confidence=0.95):
+        """
+        Confidence intervals for column means and proportions from the sample
+        
+        Means use the normal approximation and proportions the Wilson score
+        interval, both with a finite population correction.
+        
+        Args:
+            population_rows (int): Number of rows the sample was drawn from
+            confidence (float): Confidence level of the intervals
+            
+        Returns:
+            dict: Sample size, population size and interval estimates
+        """
+        n = len(self.data)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        fpc = np.sqrt((population_rows - n) / (population_rows - 1)) if population_rows > 1 else 0.0
+        
+        means = {}
+        numeric = self.data.select_dtypes(include=[np.number])
+        if len(numeric.columns):
+            values = numeric.to_numpy(dtype='float64', na_value=np.nan)
+            counts = np.count_nonzero(~np.isnan(values), axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                estimates = np.nanmean(values, axis=0)
+                margins = z * np.nanstd(values, axis=0, ddof=1) / np.sqrt(counts) * fpc
+            for i, col in enumerate(numeric.columns):
+                if counts[i] > 1:
+                    means[col] = {
+                        'estimate': float(estimates[i]),
+                        'lower': float(estimates[i] - margins[i]),
+                        'upper': float(estimates[i] + margins[i])
+                    }
+                    
+        proportions = {}
+        for col, present in self.data.notna().sum().items():
+            proportions[f"{col} (non-missing)"] = self._wilson_interval(int(present), n, z, fpc)
+            
+        frequencies = self.get_frequencies()
+        for col in self.data.select_dtypes(include=['object']).columns:
+            table = frequencies.get(col)
+            if table.values:
+                proportions[f"{col} = {table.values[0]}"] = self._wilson_interval(int(table.counts[0]), n, z, fpc)
+                
+        return {
+            'confidence': confidence,
+            'sample_rows': n,
+            'population_rows': population_rows,
+            'means': means,
+            'proportions': proportions
+        }
+        
+    @staticmethod
+    def _wilson_interval(successes, n, z, fpc=1.0):
+        """Wilson score interval for a proportion"""
+        if n == 0:
+            return {'estimate': None, 'lower': None, 'upper': None}
+            
+        p = successes / n
+        denominator = 1 + z ** 2 / n
+        centre = (p + z ** 2 / (2 * n)) / denominator
+        margin = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator * fpc
+        return {
+            'estimate': p,
+            'lower': float(max(0.0, centre - margin)),
+            'upper': float(min(1.0, centre + margin))
+        }
+        
+    def process_column_store(self, store):
+        """
+        Process an out-of-core ColumnStore into a summary report
+        
+        Statistics are computed one memory-mapped column at a time, so
+        resident memory is bounded by a single column rather than the table.
+        
+        Args:
+            store (ColumnStore): Spilled columns from ExcelHandler.load_out_of_core
+            
+        Returns:
+            dict: Processed data ready for report generation
+        """
+        self.data = None
+        self.profile_snapshot = None
+        n_rows = store.n_rows
+        
+        missing_values = {}
+        data_types = {}
+        numeric_analysis = {}
+        text_analysis = {}
+        time_series = {}
+        top_values = {}
+        unique_counts = {}
+        row_hashes = np.zeros(n_rows, dtype=np.uint64)
+        
+        for col in store.columns:
+            kind = store.kinds[col]
+            values = np.asarray(store.column(col))
+            
+            if kind == 'numeric':
+                data_types[col] = 'float64'
+                present = values[~np.isnan(values)]
+                distinct, counts = np.unique(present, return_counts=True)
+                if len(present):
+                    numeric_analysis[col] = self.summarize_numeric_array(present.reshape(-1, 1))[0]
+                if len(distinct) < 20:
+                    top_values[col] = self._top_counts(distinct, counts)
+            elif kind == 'datetime':
+                data_types[col] = 'datetime64[ns]'
+                present = values[values != np.iinfo(np.int64).min]
+                distinct = np.unique(present)
+                if len(present):
+                    time_series[col] = self.summarize_timestamps(present)
+            else:
+                data_types[col] = 'object'
+                categories = store.categories(col)
+                present = values[values >= 0]
+                counts = np.bincount(present, minlength=len(categories))
+                distinct = np.flatnonzero(counts)
+                top_values[col] = self._top_counts(categories, counts)
+                text_analysis[col] = self._summarize_categories(categories, counts)
+                
+            missing_values[col] = int(n_rows - len(present))
+            unique_counts[col] = int(len(distinct))
+            
+            # Fold the column into running row hashes for duplicate detection
+            column_hashes = pd.util.hash_array(values)
+            row_hashes ^= column_hashes + np.uint64(0x9E3779B97F4A7C15) + (row_hashes << np.uint64(6)) + (row_hashes >> np.uint64(2))
+            del values, present
+            
+        total_cells = n_rows * len(store.columns)
+        missing_cells = sum(missing_values.values())
+        duplicate_rows = int(n_rows - len(np.unique(row_hashes))) if n_rows else 0
+        completeness = (1 - missing_cells / total_cells) if total_cells else 1.0
+        uniqueness = (1 - duplicate_rows / n_rows) if n_rows else 1.0
+        
+        numeric_columns = [col for col in store.columns if store.kinds[col] == 'numeric']
+        numeric_stats = {
+            stat: {col: numeric_analysis.get(col, {}).get(stat, np.nan) for col in numeric_columns}
+            for stat in ('mean', 'median', 'std', 'min', 'max')
+        }
+        
+        processed = {
+            'report_type': 'summary',
+            'title': 'Data Summary Report',
+            'out_of_core': True,
+            'sections': [{
+                'title': 'Data Overview',
+                'content': {
+                    'total_records': n_rows,
+                    'total_fields': len(store.columns),
+                    'data_quality': {
+                        'completeness_percentage': round(completeness * 100, 2),
+                        'missing_values_count': int(missing_cells),
+                        'duplicate_rows': duplicate_rows,
+                        'quality_score': round((completeness + uniqueness) / 2 * 100, 1)
+                    },
+                    'top_values': top_values
+                }
+            }],
+            'total_rows': n_rows,
+            'total_columns': len(store.columns),
+            'column_names': list(store.columns),
+            'data_types': data_types,
+            'missing_values': missing_values,
+            'unique_counts': unique_counts,
+            'memory_usage': store.nbytes(),
+            'numeric_columns': numeric_columns,
+            'text_columns': [col for col in store.columns if store.kinds[col] == 'text'],
+            'datetime_columns': [col for col in store.columns if store.kinds[col] == 'datetime']
+        }
+        
+        schema = self.column_store_schema(store, n_rows - np.array([missing_values[col] for col in store.columns]))
+        if schema:
+            processed['schema'] = schema
+            
+        if numeric_columns:
+            processed['numeric_stats'] = numeric_stats
+            processed['sections'].append({'title': 'Numeric Analysis', 'content': numeric_analysis})
+        if text_analysis:
+            processed['sections'].append({'title': 'Text Analysis', 'content': text_analysis})
+        if time_series:
+            processed['sections'].append({'title': 'Time Series Analysis', 'content': time_series})
+            
+        self.processed_data = processed
+        return processed
+        
+    @staticmethod
+    def column_store_schema(store, present_counts):
+        """
+        The load's schema report with the store's own coercions merged in
+        
+        The store coerces values that do not fit a column's kind, fixed by
+        its first chunk, and stores them as missing.
+        
+        Args:
+            store (ColumnStore): Spilled columns
+            present_counts (numpy.ndarray): Non-missing values per column
+            
+        Returns:
+            dict: Schema.report-style metadata, or None when there is nothing to show
+        """
+        if store.schema is None and not store.coercions:
+            return None
+            
+        schema = dict(store.schema or {'header_row': 0, 'column_kinds': {}})
+        coercions = {col: dict(entry) for col, entry in schema.get('coercions', {}).items()}
+        present = dict(zip(store.columns, present_counts.tolist()))
+        
+        for col, entry in store.coercions.items():
+            if col not in coercions:
+                coercions[col] = dict(entry, values_converted=present.get(col, 0))
+                continue
+            merged = coercions[col]
+            merged['values_coerced_to_missing'] += entry['values_coerced_to_missing']
+            new_examples = [value for value in entry['examples'] if value not in merged['examples']]
+            merged['examples'] = (merged['examples'] + new_examples)[:EXAMPLE_COUNT]
+            
+        schema['coercions'] = coercions
+        return schema
+        
+    def summarize_numeric_array(self, values):
+        """
+        Summary statistics for each column of a 2-D float array
+        
+        Args:
+            values (numpy.ndarray): Array of shape (rows, columns), NaN for missing
+            
+        Returns:
+            list: One analyze_numeric_data-style dict per column
+        """
+        counts = np.count_nonzero(~np.isnan(values), axis=0)
+        summaries = []
+        
+        if values.shape[0] == 0:
+            # Empty tables summarize to NaN like all-missing columns
+            values = np.full((1, values.shape[1]), np.nan)
+            
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            q1, median, q3 = np.nanpercentile(values, [25, 50, 75], axis=0)
+            means = np.nanmean(values, axis=0)
+            stds = np.nanstd(values, axis=0, ddof=1)
+            mins = np.nanmin(values, axis=0)
+            maxs = np.nanmax(values, axis=0)
+            
+            iqr = q3 - q1
+            outliers = np.count_nonzero((values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr), axis=0)
+            
+        for i in range(values.shape[1]):
+            summaries.append({
+                'count': int(counts[i]),
+                'mean': float(means[i]),
+                'median': float(median[i]),
+                'std': float(stds[i]),
+                'min': float(mins[i]),
+                'max': float(maxs[i]),
+                'quartiles': {
+                    'q1': float(q1[i]),
+                    'q3': float(q3[i])
+                },
+                'outliers_count': int(outliers[i])
+            })
+            
+        return summaries
+        
+    @staticmethod
+    def _top_counts(values, counts, top_n=5):
+        """Most frequent values from parallel value and count arrays"""
+        order = np.argsort(-np.asarray(counts), kind='stable')[:top_n]
+        return {values[i]: int(counts[i]) for i in order if counts[i] > 0}
+        
+    @staticmethod
+    def _summarize_categories(categories, counts):
+        """Text statistics from distinct values weighted by their counts"""
+        text = pd.Series([str(value) for value in categories], dtype=object)
+        total = counts.sum()
+        
+        return {
+            'unique_count': int(np.count_nonzero(counts)),
+            'most_common': DataProcessor._top_counts(categories, counts, top_n=3),
+            'avg_length': float((text.str.len().to_numpy() * counts).sum() / total) if total else 0.0,
+            'contains_numbers': int(counts[text.str.contains(r'\d').to_numpy(dtype=bool)].sum()),
+            'contains_special_chars': int(counts[text.str.contains(r'[^a-zA-Z0-9\s]').to_numpy(dtype=bool)].sum())
+        }
+        
+    def compare_statistics(self, old_data, new_data, columns):
+        """
+        Per-column statistic changes between two versions of a table
+        
+        Args:
+            old_data (pandas.DataFrame): Earlier version
+            new_data (pandas.DataFrame): Later version
+            columns (list): Columns present in both versions
+            
+        Returns:
+            dict: {column: {statistic: {'old', 'new', 'delta'}}}
+        """
+        def delta(old, new):
+            return {'old': old, 'new': new, 'delta': new - old}
+            
+        deltas = {}
+        for col in columns:
+            deltas[col] = {
+                'missing': delta(int(old_data[col].isna().sum()), int(new_data[col].isna().sum())),
+                'unique': delta(int(old_data[col].nunique()), int(new_data[col].nunique()))
+            }
+            
+        numeric_columns = [
+            col for col in columns
+            if pd.api.types.is_numeric_dtype(old_data[col]) and pd.api.types.is_numeric_dtype(new_data[col])
+            and not pd.api.types.is_bool_dtype(old_data[col]) and not pd.api.types.is_bool_dtype(new_data[col])
+        ]
+        if numeric_columns:
+            old_summaries = self.summarize_numeric_array(
+                old_data[numeric_columns].to_numpy(dtype='float64', na_value=np.nan)
+            )
+            new_summaries = self.summarize_numeric_array(
+                new_data[numeric_columns].to_numpy(dtype='float64', na_value=np.nan)
+            )
+            for col, old_stats, new_stats in zip(numeric_columns, old_summaries, new_summaries):
+                for stat in ('mean', 'median', 'std', 'min', 'max'):
+                    deltas[col][stat] = delta(old_stats[stat], new_stats[stat])
+                    
+        return deltas
+        
     def process_summary_report(self):
         """Process data for summary report"""
         summary = {
@@ -105,6 +627,11 @@ class DataProcessor:
             }
             summary['sections'].append(text_section)
             
+        # Time series section
+        time_series = self.analyze_datetime_data()
+        if time_series:
+            summary['sections'].append({'title': 'Time Series Analysis', 'content': time_series})
+            
         return summary
         
     def process_detailed_report(self):
@@ -124,6 +651,9 @@ class DataProcessor:
             }
             detailed['sections'].append(section)
             
+        # Distribution of every column, drawn as sparklines
+        detailed['histograms'] = self.get_histograms()
+        
         # Correlation analysis
         if len(self.data.select_dtypes(include=[np.number]).columns) > 1:
             correlation_section = {
@@ -147,8 +677,8 @@ class DataProcessor:
             'title': 'Quick Statistics',
             'content': {
                 'shape': f"{len(self.data)} rows × {len(self.data.columns)} columns",
-                'completeness': f"{((self.data.count().sum() / (len(self.data) * len(self.data.columns))) * 100):.1f}%",
-                'unique_values': {col: self.data[col].nunique() for col in self.data.columns},
+                'completeness': f"{((1 - self.get_missing_counts().sum() / (len(self.data) * len(self.data.columns))) * 100):.1f}%",
+                'unique_values': {col: self.get_frequencies().nunique(col) for col in self.data.columns},
                 'sample_data': self.data.head(10).to_dict('records')
             }
         }
@@ -166,13 +696,13 @@ class DataProcessor:
     def assess_data_quality(self):
         """Assess overall data quality"""
         total_cells = len(self.data) * len(self.data.columns)
-        missing_cells = self.data.isnull().sum().sum()
+        missing_cells = self.get_missing_counts().sum()
         completeness = ((total_cells - missing_cells) / total_cells) * 100
         
         quality = {
             'completeness_percentage': round(completeness, 2),
             'missing_values_count': int(missing_cells),
-            'duplicate_rows': int(self.data.duplicated().sum()),
+            'duplicate_rows': self.get_duplicate_count(),
             'quality_score': self.calculate_quality_score()
         }
         
@@ -181,8 +711,8 @@ class DataProcessor:
     def calculate_quality_score(self):
         """Calculate a simple data quality score"""
         # Factors: completeness, uniqueness, consistency
-        completeness = (1 - (self.data.isnull().sum().sum() / (len(self.data) * len(self.data.columns))))
-        uniqueness = (1 - (self.data.duplicated().sum() / len(self.data)))
+        completeness = (1 - (self.get_missing_counts().sum() / (len(self.data) * len(self.data.columns))))
+        uniqueness = (1 - (self.get_duplicate_count() / len(self.data)))
         
         # Simple average (can be made more sophisticated)
         score = (completeness + uniqueness) / 2 * 100
@@ -190,42 +720,210 @@ class DataProcessor:
         
     def get_top_values_per_column(self, top_n=5):
         """Get top values for each column"""
+        if self.profile_snapshot is not None:
+            return self.get_snapshot_top_values(top_n)
+            
+        top_values = {}
+        frequencies = self.get_frequencies()
+        
+        for column in self.data.columns:
+            if self.data[column].dtype == 'object' or frequencies.nunique(column) < 20:
+                top_values[column] = frequencies.get(column).top(top_n)
+                
+        return top_values
+        
+    def get_snapshot_top_values(self, top_n=5):
+        """Top values for each column, from the snapshot's value counts"""
         top_values = {}
         
         for column in self.data.columns:
-            if self.data[column].dtype == 'object' or self.data[column].nunique() < 20:
-                value_counts = self.data[column].value_counts().head(top_n)
-                top_values[column] = value_counts.to_dict()
+            col_stats = self.profile_snapshot.stats[column]
+            values = col_stats['values']
+            if values is None:
+                # Dropped once the column passed ProfileSnapshot's category limit
+                continue
+            distinct = self.profile_snapshot.column_array('distinct', column)
+            n_unique = len(distinct) if distinct is not None else len(values)
+            if self.data[column].dtype == 'object' or n_unique < 20:
+                # Most frequent first; ties keep their order of first appearance
+                ranked = sorted(values, key=lambda item: -item[1])
+                top_values[column] = dict(ranked[:top_n])
                 
         return top_values
         
     def analyze_numeric_data(self):
         """Analyze numeric columns"""
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+        summary = self.get_numeric_summary()
         
-        if len(numeric_cols) == 0:
+        if not summary:
             return {'message': 'No numeric columns found'}
             
+        return dict(summary)
+        
+    def get_frequencies(self):
+        """Frequency tables for the current data, rebuilt when the data changes"""
+        if self._frequencies is None or self._frequencies.data is not self.data:
+            self._frequencies = FrequencyCache(self.data)
+        return self._frequencies
+        
+    def get_numeric_summary(self):
+        """
+        Statistics of every numeric column, computed once per dataset
+        
+        The numeric columns are converted to 2-D float arrays of at most
+        NUMERIC_BATCH_CELLS cells, and all quantiles, moments, extremes and
+        IQR outlier counts come from batched calls over each array, so no
+        float copy of the whole frame is made. The result is shared by the summary,
+        detailed and basic statistics and rebuilt when the data changes.
+        
+        Returns:
+            dict: analyze_numeric_data-style statistics per column
+        """
+        if self._numeric_summary is None or self._numeric_summary[0] is not self.data:
+            numeric_data = self.data.select_dtypes(include=[np.number])
+            summary = {}
+            if self.profile_snapshot is not None:
+                snapshot_stats = self.profile_snapshot.stats
+                summary = {col: self.summarize_snapshot_column(snapshot_stats[col]) for col in numeric_data.columns}
+            elif len(numeric_data.columns):
+                step = max(1, NUMERIC_BATCH_CELLS // max(len(numeric_data), 1))
+                for start in range(0, len(numeric_data.columns), step):
+                    batch = numeric_data.iloc[:, start:start + step]
+                    values = batch.to_numpy(dtype='float64', na_value=np.nan)
+                    summary.update(zip(batch.columns, self.summarize_numeric_array(values)))
+            self._numeric_summary = (self.data, summary)
+        return self._numeric_summary[1]
+        
+    def get_histograms(self):
+        """
+        Distribution of every column, computed once per dataset
+        
+        Numeric and datetime columns get a fixed-bin Histogram, merged from
+        the profile snapshot when one is loaded; other columns get the
+        counts of their most frequent values.
+        
+        Returns:
+            dict: Per column 'kind', bar 'counts' and a 'label' for the bars,
+                plus the Histogram fields for numeric and datetime columns
+        """
+        return self.shared('histograms', self._build_histograms)
+        
+    def _build_histograms(self):
+        snapshot_stats = self.profile_snapshot.stats if self.profile_snapshot is not None else {}
+        histograms = {}
+        
+        for col in self.data.columns:
+            series = self.data[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                histogram = Histogram().add(self.timestamp_values(series))
+                kind = 'datetime'
+                if histogram.count:
+                    low, high = pd.Timestamp(int(histogram.min)), pd.Timestamp(int(histogram.max))
+            elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                if 'histogram' in snapshot_stats.get(col, {}):
+                    # Snapshot histograms are finer; merging coarsens them to HISTOGRAM_BINS
+                    histogram = Histogram().merge(Histogram.from_dict(snapshot_stats[col]['histogram']))
+                else:
+                    histogram = Histogram().add(series.to_numpy(dtype='float64', na_value=np.nan))
+                kind = 'numeric'
+                if histogram.count:
+                    low, high = f"{histogram.min:g}", f"{histogram.max:g}"
+            else:
+                top = self.get_frequencies().get(col).top(HISTOGRAM_BINS)
+                histograms[col] = {
+                    'kind': 'frequency',
+                    'counts': list(top.values()),
+                    'label': f"Counts of the {len(top)} most frequent values"
+                }
+                continue
+                
+            histograms[col] = {'kind': kind, **histogram.to_dict()}
+            histograms[col]['label'] = f"{histogram.count} values from {low} to {high}" if histogram.count else ''
+            
+        return histograms
+        
+    def analyze_datetime_data(self):
+        """Time-series summary of each datetime column"""
+        date_formats = self.data.attrs.get('date_formats', {})
         analysis = {}
         
-        for col in numeric_cols:
-            col_data = self.data[col].dropna()
+        for col in self.data.select_dtypes(include=['datetime64', 'datetimetz']).columns:
+            if self.profile_snapshot is not None:
+                values = self.profile_snapshot.column_array('times', col)
+                counts = self.profile_snapshot.column_array('time_counts', col)
+            else:
+                values, counts = self.timestamp_values(self.data[col]), None
+            if len(values):
+                analysis[col] = self.summarize_timestamps(values, counts)
+                if col in date_formats:
+                    analysis[col]['parsed_format'] = date_formats[col]
+                    
+        return analysis
+        
+    @staticmethod
+    def timestamp_values(series):
+        """Non-missing values of a datetime column as int64 nanoseconds"""
+        return ProfileSnapshot.timestamp_values(series)
+        
+    def summarize_timestamps(self, values, counts=None):
+        """
+        Range, gaps and per-period counts of int64 nanosecond timestamps
+        
+        A gap is a step between consecutive distinct timestamps longer than
+        twice the typical (median) step. Counts are per day for spans up to
+        three months, per month up to four years and per year beyond that.
+        
+        Args:
+            values (numpy.ndarray): Timestamps with missing values removed;
+                sorted and distinct when counts is given
+            counts (numpy.ndarray): Occurrences of each of values
             
-            analysis[col] = {
-                'count': len(col_data),
-                'mean': float(col_data.mean()),
-                'median': float(col_data.median()),
-                'std': float(col_data.std()),
-                'min': float(col_data.min()),
-                'max': float(col_data.max()),
-                'quartiles': {
-                    'q1': float(col_data.quantile(0.25)),
-                    'q3': float(col_data.quantile(0.75))
-                },
-                'outliers_count': self.count_outliers(col_data)
+        Returns:
+            dict: Time-series summary
+        """
+        day = 86400 * 10**9
+        if counts is None:
+            values, counts = np.unique(values, return_counts=True)
+        distinct = values
+        steps = np.diff(distinct)
+        typical = int(np.median(steps)) if len(steps) else 0
+        span = int(distinct[-1] - distinct[0])
+        
+        summary = {
+            'count': int(counts.sum()),
+            'distinct': int(len(distinct)),
+            'start': str(pd.Timestamp(int(distinct[0]))),
+            'end': str(pd.Timestamp(int(distinct[-1]))),
+            'span_days': round(span / day, 2),
+            'typical_interval': str(pd.Timedelta(typical)),
+            'gap_count': int(np.count_nonzero(steps > 2 * typical)) if typical else 0,
+            'largest_gap': None
+        }
+        if len(steps):
+            i = int(np.argmax(steps))
+            summary['largest_gap'] = {
+                'from': str(pd.Timestamp(int(distinct[i]))),
+                'to': str(pd.Timestamp(int(distinct[i + 1]))),
+                'days': round(int(steps[i]) / day, 2)
             }
             
-        return analysis
+        # Resample by bucketing the timestamps into calendar periods
+        if span <= 92 * day:
+            unit, period = 'D', 'day'
+        elif span <= 4 * 366 * day:
+            unit, period = 'M', 'month'
+        else:
+            unit, period = 'Y', 'year'
+        buckets = distinct.view('datetime64[ns]').astype(f'datetime64[{unit}]').astype(np.int64)
+        first = buckets.min()
+        period_counts = np.bincount(buckets - first, weights=counts).astype(np.int64)
+        labels = np.datetime_as_string(np.arange(first, first + len(period_counts)).astype(f'datetime64[{unit}]'))
+        busiest = int(np.argmax(period_counts))
+        
+        summary['period'] = period
+        summary['counts'] = dict(zip(labels.tolist(), period_counts.tolist()))
+        summary['busiest_period'] = {'period': str(labels[busiest]), 'count': int(period_counts[busiest])}
+        return summary
         
     def analyze_text_data(self):
         """Analyze text columns"""
@@ -235,13 +933,32 @@ class DataProcessor:
             return {'message': 'No text columns found'}
             
         analysis = {}
+        if self.profile_snapshot is not None:
+            for col in text_cols:
+                col_stats = self.profile_snapshot.stats[col]
+                ranked = sorted(col_stats['values'], key=lambda item: -item[1])
+                analysis[col] = {
+                    'unique_count': len(self.profile_snapshot.column_array('distinct', col)),
+                    'most_common': dict(ranked[:3]),
+                    'avg_length': col_stats['length_sum'] / col_stats['count'] if col_stats['count'] else 0.0,
+                    'contains_numbers': col_stats['with_digits'],
+                    'contains_special_chars': col_stats['with_special']
+                }
+            return analysis
+            
+        frequencies = self.get_frequencies()
         
         for col in text_cols:
+            table = frequencies.get(col)
+            if not table.truncated:
+                # Length and pattern checks run once per distinct value, weighted by count
+                analysis[col] = self._summarize_categories(table.values, table.counts)
+                continue
+                
             col_data = self.data[col].dropna().astype(str)
-            
             analysis[col] = {
-                'unique_count': self.data[col].nunique(),
-                'most_common': self.data[col].value_counts().head(3).to_dict(),
+                'unique_count': frequencies.nunique(col),
+                'most_common': frequencies.get(col).top(3),
                 'avg_length': float(col_data.str.len().mean()),
                 'contains_numbers': int(col_data.str.contains(r'\d').sum()),
                 'contains_special_chars': int(col_data.str.contains(r'[^a-zA-Z0-9\s]').sum())
@@ -252,18 +969,30 @@ class DataProcessor:
     def analyze_column(self, column):
         """Detailed analysis of a single column"""
         col_data = self.data[column]
+        null_count = self.get_missing_counts()[column]
         
         analysis = {
             'data_type': str(col_data.dtype),
             'total_count': len(col_data),
-            'non_null_count': col_data.count(),
-            'null_count': col_data.isnull().sum(),
-            'unique_count': col_data.nunique(),
-            'null_percentage': (col_data.isnull().sum() / len(col_data)) * 100
+            'non_null_count': len(col_data) - null_count,
+            'null_count': null_count,
+            'unique_count': self.get_frequencies().nunique(column),
+            'null_percentage': (null_count / len(col_data)) * 100
         }
         
         # Type-specific analysis
-        if pd.api.types.is_numeric_dtype(col_data):
+        numeric_summary = self.get_numeric_summary()
+        if column in numeric_summary:
+            stats = numeric_summary[column]
+            analysis.update({
+                'mean': stats['mean'],
+                'median': stats['median'],
+                'std': stats['std'],
+                'min': stats['min'],
+                'max': stats['max'],
+                'range': stats['max'] - stats['min']
+            })
+        elif pd.api.types.is_numeric_dtype(col_data) and not pd.api.types.is_bool_dtype(col_data):
             non_null_data = col_data.dropna()
             analysis.update({
                 'mean': float(non_null_data.mean()),
@@ -273,10 +1002,15 @@ class DataProcessor:
                 'max': float(non_null_data.max()),
                 'range': float(non_null_data.max() - non_null_data.min())
             })
-        elif pd.api.types.is_object_dtype(col_data):
+        elif pd.api.types.is_datetime64_any_dtype(col_data):
+            values = self.timestamp_values(col_data)
+            if len(values):
+                analysis['time_series'] = self.summarize_timestamps(values)
+        elif pd.api.types.is_object_dtype(col_data) or pd.api.types.is_bool_dtype(col_data):
+            # Flags kept as bool by schema inference are summarized like categories
             analysis.update({
-                'most_frequent': col_data.mode().iloc[0] if not col_data.mode().empty else None,
-                'top_values': col_data.value_counts().head(5).to_dict()
+                'most_frequent': self.get_frequencies().get(column).mode(),
+                'top_values': self.get_frequencies().get(column).top(5)
             })
             
         return analysis
@@ -320,12 +1054,13 @@ class DataProcessor:
         categories['categorical'] = []
         categories['continuous'] = []
         
+        frequencies = self.get_frequencies()
         for col in categories['text']:
-            if self.data[col].nunique() < 20:  # Likely categorical
+            if frequencies.nunique(col) < 20:  # Likely categorical
                 categories['categorical'].append(col)
                 
         for col in categories['numeric']:
-            if self.data[col].nunique() > 20:  # Likely continuous
+            if frequencies.nunique(col) > 20:  # Likely continuous
                 categories['continuous'].append(col)
                 
         return categories
@@ -342,30 +1077,101 @@ class DataProcessor:
         return len(outliers)
         
     def sort_data(self, column, ascending=True):
-        """Sort data by specified column"""
-        if column in self.data.columns:
-            return self.data.sort_values(by=column, ascending=ascending)
-        else:
-            raise ValueError(f"Column '{column}' not found in data")
+        """
+        Sort data by one or more columns
+        
+        The sort permutation is computed once per column and direction and
+        reused until the data changes.
+        
+        Args:
+            column (str or list): Column or columns to sort by
+            ascending (bool or list): Direction, per column if a list
             
+        Returns:
+            pandas.DataFrame: Sorted data
+        """
+        return self.data.take(self.get_column_indexes().sort_order(column, ascending))
+        
+    def sorted_view(self, column, ascending=True, start=0, stop=None):
+        """
+        One page of the data in sorted order, without sorting the whole frame
+        
+        Args:
+            column (str or list): Column or columns to sort by
+            ascending (bool or list): Direction, per column if a list
+            start (int): First sorted position to return
+            stop (int): Position after the last one to return
+            
+        Returns:
+            pandas.DataFrame: Rows start..stop of the sorted data
+        """
+        order = self.get_column_indexes().sort_order(column, ascending)
+        return self.data.take(order[start:stop])
+        
+    def top_n(self, column, n=10, largest=True):
+        """
+        Rows with the largest (or smallest) values in a column
+        
+        Numeric columns use argpartition, so only the selected rows are
+        sorted; other columns fall back to the cached sort permutation.
+        
+        Args:
+            column (str): Column to rank by
+            n (int): Number of rows to return
+            largest (bool): Largest values first when True
+            
+        Returns:
+            pandas.DataFrame: Top rows, best first, nulls excluded
+        """
+        indexes = self.get_column_indexes()
+        index = indexes.get(column)
+        
+        if not pd.api.types.is_numeric_dtype(self.data[column]) or pd.api.types.is_bool_dtype(self.data[column]):
+            order = index.sorted_order[::-1] if largest else index.sorted_order
+            return self.data.take(order[:n])
+            
+        values = self.data[column].to_numpy(dtype='float64', na_value=np.nan)
+        candidates = np.flatnonzero(~np.isnan(values))
+        keys = -values[candidates] if largest else values[candidates]
+        
+        if n < len(candidates):
+            selected = np.argpartition(keys, n)[:n]
+            candidates, keys = candidates[selected], keys[selected]
+            
+        return self.data.take(candidates[np.argsort(keys, kind='stable')])
+        
+    def get_column_indexes(self):
+        """Column indexes for the current data, rebuilt when the data changes"""
+        if self._column_indexes is None or self._column_indexes.data is not self.data:
+            self._column_indexes = ColumnIndexCache(self.data)
+        return self._column_indexes
+        
+    def filter_mask(self, filters):
+        """
+        Evaluate filter conditions to a boolean row mask
+        
+        Args:
+            filters (dict or Predicate): Dictionary of column: condition pairs,
+                or a predicate built from core.filter_engine
+                
+        Returns:
+            numpy.ndarray: Boolean mask of matching rows
+        """
+        predicate = filters if isinstance(filters, Predicate) else FilterSpec(filters)
+        return predicate.mask(self.get_column_indexes())
+        
     def filter_data(self, filters):
         """
         Filter data based on conditions
         
+        Repeated filters on the same data reuse lazily built per-column
+        indexes (sorted values and value-to-rows maps).
+        
         Args:
-            filters (dict): Dictionary of column: condition pairs
+            filters (dict or Predicate): Dictionary of column: condition pairs,
+                or a predicate such as And(Range('Amount', 0, 100), In('Region', ['EU']))
             
         Returns:
             pandas.DataFrame: Filtered data
         """
-        filtered_data = self.data.copy()
-        
-        for column, condition in filters.items():
-            if column in filtered_data.columns:
-                # Simple string contains filter for now
-                if isinstance(condition, str):
-                    filtered_data = filtered_data[
-                        filtered_data[column].astype(str).str.contains(condition, case=False, na=False)
-                    ]
-                    
-        return filtered_data 
\ No newline at end of file
+        return self.data[self.filter_mask(filters)]
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+# Formats tried in order; month-first wins ties with day-first
+DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y/%m/%d',
+    '%m/%d/%Y',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%d/%m/%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%m-%d-%Y',
+    '%d-%m-%Y',
+    '%d.%m.%Y',
+    '%d.%m.%Y %H:%M',
+    '%d %b %Y',
+    '%d-%b-%Y',
+    '%b %d, %Y',
+    '%d %B %Y',
+    '%B %d, %Y'
+]
+
+def is_text_column(series):
+    """Check for object or string dtype, the dtypes text dates arrive in"""
+    return pd.api.types.is_object_dtype(series) or isinstance(series.dtype, pd.StringDtype)
+
+class DateColumnParser:
+    """Detects text columns holding dates and converts them with one format"""
+    
+    def __init__(self, sample_size=200, threshold=0.95, formats=None):
+        """
+        Args:
+            sample_size (int): Values inspected per column to pick a format
+            threshold (float): Share of values a format must parse
+            formats (list): strptime formats to try, in order of preference
+        """
+        self.sample_size = sample_size
+        self.threshold = threshold
+        self.candidates = formats or DATE_FORMATS
+        self.formats = {}
+        self._checked = set()
+        
+    def detect_format(self, series):
+        """
+        Date format of a text column, inferred from a spread-out sample
+        
+        Args:
+            series (pandas.Series): Column to inspect
+            
+        Returns:
+            str: strptime format, or None when the column is not dates
+        """
+        present = np.flatnonzero(series.notna().to_numpy())
+        if len(present) == 0:
+            return None
+            
+        picks = present[np.linspace(0, len(present) - 1, min(self.sample_size, len(present))).astype(int)]
+        sample = series.iloc[picks]
+        if not all(isinstance(value, str) for value in sample):
+            return None
+            
+        sample = sample.str.strip()
+        lengths = sample.str.len()
+        if lengths.max() > 40 or lengths.min() < 6 or not sample.str.contains(r'\d').all():
+            return None
+            
+        best_format, best_share = None, self.threshold
+        for date_format in self.candidates:
+            parsed = pd.to_datetime(sample, format=date_format, errors='coerce')
+            share = parsed.notna().mean()
+            if share > best_share:
+                best_format, best_share = date_format, share
+                if share == 1.0:
+                    break
+                    
+        return best_format
+        
+    def detect(self, data):
+        """Pick formats for text columns that have not been inspected yet"""
+        for col in data.columns:
+            if col in self._checked or not is_text_column(data[col]):
+                continue
+            if data[col].isna().all():
+                # Nothing to go on yet; look again in the next chunk
+                continue
+            self._checked.add(col)
+            date_format = self.detect_format(data[col])
+            if date_format:
+                self.formats[col] = date_format
+                
+    def convert(self, data, strict=True):
+        """
+        Convert the detected columns
+        
+        Args:
+            data (pandas.DataFrame): Data with text date columns
+            strict (bool): Keep a column as text when too many of its
+                values fail to parse; chunked loads pass False so every
+                chunk gets the same column types
+                
+        Returns:
+            pandas.DataFrame: Data with datetime columns
+        """
+        converted = {}
+        for col, date_format in list(self.formats.items()):
+            if col not in data.columns or not is_text_column(data[col]):
+                continue
+            dates = pd.to_datetime(data[col].str.strip(), format=date_format, errors='coerce')
+            if strict:
+                present = int(data[col].notna().sum())
+                if present and dates.notna().sum() < self.threshold * present:
+                    del self.formats[col]
+                    continue
+            converted[col] = dates
+            
+        if not converted:
+            return data
+            
+        # Shallow copy; untouched columns keep sharing their data
+        data = data.copy(deep=False)
+        for col, dates in converted.items():
+            data[col] = dates
+        data.attrs['date_formats'] = {
+            **data.attrs.get('date_formats', {}),
+            **{col: self.formats[col] for col in converted}
+        }
+        return data
+        
+    def parse(self, data, strict=True):
+        """Detect and convert date columns in one step"""
+        self.detect(data)
+        return self.convert(data, strict=strict)
@@ -1,19 +1,51 @@
 import pandas as pd
+import numpy as np
 import os
+from collections import OrderedDict
 from pathlib import Path
 
+from core.date_detection import DateColumnParser
+from core.reader_engines import select_engine
+from core.schema_inference import SchemaInference, header_names
+from utils.helpers import file_content_hash
+
+def has_pyarrow():
+    """Check whether the optional pyarrow package is installed"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
 class ExcelHandler:
-    """Handles Excel file loading and basic processing"""
+    """Handles Excel, CSV/TSV and Parquet file loading and basic processing"""
     
-    def __init__(self):
-        self.supported_formats = ['.xlsx', '.xls']
+    def __init__(self, cache_size=4, engine="auto", parse_dates=True, infer_schema=True):
+        self.supported_formats = ['.xlsx', '.xls', '.csv', '.tsv', '.parquet']
+        self.delimiters = {'.csv': ',', '.tsv': '\t'}
+        self.csv_chunksize = 100000
+        self.engine = engine
+        self.parse_dates = parse_dates
+        self.cache_size = cache_size
+        self._data_cache = OrderedDict()
+        
+        # Header row and column types, worked out from the first rows of each file
+        self.schema_inference = SchemaInference(detect_dates=parse_dates) if infer_schema else None
+        self._schemas = {}
         
-    def load_file(self, file_path):
+    def load_file(self, file_path, columns=None, rows=None):
         """
-        Load Excel file and return pandas DataFrame
+        Load Excel, CSV/TSV or Parquet file and return pandas DataFrame
+        
+        The column and row selection is handed to the reader, so cells
+        outside it are skipped while parsing instead of dropped afterwards.
         
         Args:
-            file_path (str): Path to Excel file
+            file_path (str): Path to data file
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to read, counted from 0
+                below the header with stop excluded; None reads all rows
+                and a stop of None reads to the end
             
         Returns:
             pandas.DataFrame: Loaded data
@@ -21,23 +53,503 @@ class ExcelHandler:
         if not self.is_valid_file(file_path):
             raise ValueError(f"Unsupported file format. Supported formats: {self.supported_formats}")
             
+        file_ext = Path(file_path).suffix.lower()
+        
         try:
+            schema = self.infer_schema(file_path)
+            
             # Try to load the file
-            if file_path.endswith('.xlsx'):
-                data = pd.read_excel(file_path, engine='openpyxl')
+            if file_ext in self.delimiters:
+                data = self.read_delimited(
+                    file_path, self.delimiters[file_ext], columns=columns, rows=rows, schema=schema
+                )
+            elif file_ext == '.parquet':
+                data = self.read_parquet(file_path, columns=columns, rows=rows)
             else:
-                data = pd.read_excel(file_path, engine='xlrd')
+                data = self.read_workbook(file_path, columns=columns, rows=rows, schema=schema)
                 
             # Basic data cleaning
             data = self.clean_data(data)
             
+            # Numeric and date columns that stray cells turned into text
+            if schema is not None:
+                coercions = {}
+                data = schema.apply(data, coercions)
+                data.attrs['schema'] = schema.report(coercions)
+                
+            # Text columns that hold dates become datetime columns
+            if self.parse_dates:
+                data = DateColumnParser().parse(data)
+                
+            return data
+            
+        except Exception as e:
+            raise Exception(f"Error loading {file_ext} file: {str(e)}")
+            
+    def get_reader_engine(self, file_path):
+        """Reader engine for a workbook: the configured one, or the fastest installed"""
+        return select_engine(file_path, self.engine)
+        
+    def reader_options(self, file_path):
+        """
+        Settings that change how a file is loaded, for report cache keys
+        
+        Returns:
+            dict: Type inference and date parsing flags, and the name of
+                the reader engine for workbooks
+        """
+        file_ext = Path(file_path).suffix.lower()
+        workbook = file_ext not in self.delimiters and file_ext != '.parquet'
+        return {
+            'infer_schema': self.schema_inference is not None,
+            'parse_dates': self.parse_dates,
+            'engine': self.get_reader_engine(file_path).name if workbook else None
+        }
+        
+    def infer_schema(self, file_path):
+        """
+        Header row and column types of a file, from a fast pass over its first rows
+        
+        Returns:
+            Schema: Inferred schema, reused until the file changes; None
+                when inference is off or the format stores its own types
+        """
+        if self.schema_inference is None or Path(file_path).suffix.lower() == '.parquet':
+            return None
+            
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        if key not in self._schemas:
+            try:
+                self._schemas[key] = self.schema_inference.infer_file(file_path, self)
+            except Exception:
+                # The full read reports anything that is really wrong with the file
+                self._schemas[key] = None
+        return self._schemas[key]
+        
+    @staticmethod
+    def row_range(rows):
+        """
+        Validated (start, stop) of a row selection
+        
+        Args:
+            rows (tuple): (start, stop) data rows, counted from 0 below the
+                header with stop excluded, or None for all rows
+                
+        Returns:
+            tuple: (start, stop); stop is None when reading to the end
+        """
+        if rows is None:
+            return 0, None
+        start, stop = rows
+        start = start or 0
+        if start < 0 or (stop is not None and stop < start):
+            raise ValueError(f"Invalid row range: {rows}")
+        return start, stop
+        
+    def row_options(self, rows, header_row=0):
+        """skiprows/nrows arguments of the pandas readers for a row selection and header row"""
+        start, stop = self.row_range(rows)
+        options = {}
+        if header_row:
+            # Skip the title rows above the header and the rows before the selection
+            options['skiprows'] = lambda line: line < header_row or header_row < line <= header_row + start
+        elif start:
+            # Keep line 0, the header
+            options['skiprows'] = range(1, start + 1)
+        if stop is not None:
+            options['nrows'] = stop - start
+        return options
+        
+    def read_delimited(self, file_path, sep, columns=None, rows=None, schema=None):
+        """
+        Read a CSV/TSV file with the fastest available parser
+        
+        Args:
+            file_path (str): Path to delimited text file
+            sep (str): Field delimiter
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to read, or None for all
+            schema (Schema): Inferred header row and dtype hints
+            
+        Returns:
+            pandas.DataFrame: Raw data
+        """
+        header_row = schema.header_row if schema is not None else 0
+        dtypes = schema.read_dtypes() if schema is not None else {}
+        if has_pyarrow() and rows is None and not header_row and not dtypes:
+            # Multithreaded Arrow parser; it reads the whole file in one go
+            return pd.read_csv(file_path, sep=sep, engine='pyarrow', usecols=columns)
+            
+        # One call to the C parser: it already tokenizes in internal blocks
+        # (low_memory), and skipped lines are never split into fields. Files
+        # too large for one frame are streamed by iter_chunks instead.
+        return pd.read_csv(
+            file_path, sep=sep, engine='c', usecols=columns, dtype=dtypes or None,
+            **self.row_options(rows, header_row)
+        )
+        
+    def read_parquet(self, file_path, columns=None, rows=None):
+        """
+        Read a Parquet file, decoding only the requested columns
+        
+        A row selection decodes only the row groups that overlap it.
+        
+        Args:
+            file_path (str): Path to Parquet file
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to read, or None for all
+            
+        Returns:
+            pandas.DataFrame: Raw data
+        """
+        if not has_pyarrow():
+            raise ImportError("Reading Parquet files requires pyarrow: pip install pyarrow")
+            
+        if rows is None:
+            return pd.read_parquet(file_path, columns=columns)
+            
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(file_path)
+        groups, offset, length = self._parquet_row_groups(parquet_file, rows)
+        table = parquet_file.read_row_groups(groups, columns=columns)
+        return table.slice(offset, length).to_pandas()
+        
+    def _parquet_row_groups(self, parquet_file, rows):
+        """
+        Row groups overlapping a row selection
+        
+        Returns:
+            tuple: (row group indices, rows to skip in the first group,
+                number of selected rows)
+        """
+        start, stop = self.row_range(rows)
+        metadata = parquet_file.metadata
+        stop = metadata.num_rows if stop is None else min(stop, metadata.num_rows)
+        
+        groups = []
+        offset = 0
+        first_row = 0
+        for index in range(metadata.num_row_groups):
+            group_rows = metadata.row_group(index).num_rows
+            if first_row + group_rows > start and first_row < stop:
+                if not groups:
+                    offset = start - first_row
+                groups.append(index)
+            first_row += group_rows
+        return groups, offset, max(stop - start, 0)
+        
+    def read_workbook(self, file_path, columns=None, rows=None, schema=None):
+        """
+        Read the first sheet of a workbook
+        
+        pandas' openpyxl reader builds a value for every cell it passes, so
+        with a selection .xlsx files go through the read-only streaming
+        reader, which stops at the end of the row range and builds values
+        only for the selected columns. The other engines take
+        usecols/skiprows/nrows.
+        
+        Args:
+            file_path (str): Path to the workbook
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to read, or None for all
+            schema (Schema): Inferred header row
+            
+        Returns:
+            pandas.DataFrame: Raw sheet data
+        """
+        header_row = schema.header_row if schema is not None else 0
+        dtypes = schema.read_dtypes(by_name=True) if schema is not None else {}
+        engine = self.get_reader_engine(file_path)
+        selected = columns is not None or rows is not None
+        if selected and engine.name == 'openpyxl':
+            chunks = list(self._iter_xlsx_chunks(file_path, self.csv_chunksize, columns, rows, header_row))
+            if chunks:
+                return pd.concat(chunks, ignore_index=True)
+                
+        return engine.read(
+            file_path, usecols=columns, dtype=dtypes or None, **self.row_options(rows, header_row)
+        )
+        
+    def iter_chunks(self, file_path, chunksize=50000, columns=None, rows=None, coercions=None):
+        """
+        Stream a file as DataFrame chunks without loading it whole
+        
+        Excel workbooks are read row by row through openpyxl's read-only
+        mode; CSV/TSV and Parquet use their readers' native batching.
+        Completely empty rows are dropped and column names are cleaned as
+        in clean_data; empty columns can only be known after the last chunk
+        and are left to the caller. The inferred schema sets the header row
+        and types every chunk alike; other date formats are detected on the
+        first chunk holding values and applied to every later chunk.
+        
+        Args:
+            file_path (str): Path to data file
+            chunksize (int): Rows per chunk
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to read, or None for all
+            coercions (dict): Collects the schema's per-column coercions
+            
+        Yields:
+            pandas.DataFrame: Consecutive chunks of the data
+        """
+        if not self.is_valid_file(file_path):
+            raise ValueError(f"Unsupported file format. Supported formats: {self.supported_formats}")
+            
+        file_ext = Path(file_path).suffix.lower()
+        schema = self.infer_schema(file_path)
+        header_row = schema.header_row if schema is not None else 0
+        
+        if file_ext in self.delimiters:
+            chunks = pd.read_csv(
+                file_path, sep=self.delimiters[file_ext], engine='c',
+                usecols=columns, chunksize=chunksize,
+                dtype=(schema.read_dtypes() or None) if schema is not None else None,
+                **self.row_options(rows, header_row)
+            )
+        elif file_ext == '.parquet':
+            chunks = self._iter_parquet_chunks(file_path, chunksize, columns, rows)
+        elif file_ext == '.xlsx':
+            chunks = self._iter_xlsx_chunks(file_path, chunksize, columns, rows, header_row)
+        else:
+            # Legacy .xls has no streaming reader; slice the parsed sheet
+            data = self.get_reader_engine(file_path).read(
+                file_path, usecols=columns,
+                dtype=(schema.read_dtypes(by_name=True) or None) if schema is not None else None,
+                **self.row_options(rows, header_row)
+            )
+            chunks = (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+            
+        date_parser = DateColumnParser() if self.parse_dates else None
+        for chunk in chunks:
+            chunk = chunk.dropna(how='all')
+            if len(chunk):
+                chunk = chunk.set_axis([str(col).strip() for col in chunk.columns], axis=1)
+                if schema is not None:
+                    chunk = schema.apply(chunk, coercions)
+                yield date_parser.parse(chunk, strict=False) if date_parser else chunk
+                
+    def _iter_parquet_chunks(self, file_path, chunksize, columns, rows=None):
+        """Yield Parquet record batches as DataFrames"""
+        if not has_pyarrow():
+            raise ImportError("Reading Parquet files requires pyarrow: pip install pyarrow")
+            
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(file_path)
+        if rows is None:
+            for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+            return
+            
+        # Decode only the overlapping row groups, then trim them to the selection
+        groups, skip, remaining = self._parquet_row_groups(parquet_file, rows)
+        if not groups:
+            return
+        batches = parquet_file.iter_batches(batch_size=chunksize, row_groups=groups, columns=columns)
+        for batch in batches:
+            if skip >= batch.num_rows:
+                skip -= batch.num_rows
+                continue
+            batch = batch.slice(skip, remaining)
+            skip = 0
+            remaining -= batch.num_rows
+            yield batch.to_pandas()
+            if remaining <= 0:
+                break
+            
+    def _iter_xlsx_chunks(self, file_path, chunksize, columns, rows=None, header_row=0):
+        """
+        Yield the first sheet of an xlsx workbook in row chunks via openpyxl read-only mode
+        
+        Rows before the selection are dropped by the sheet parser, reading
+        stops after its last row, and only the span of the selected columns
+        is turned into row values.
+        """
+        from openpyxl import load_workbook
+        
+        start, stop = self.row_range(rows)
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            header = next(sheet.iter_rows(
+                min_row=header_row + 1, max_row=header_row + 1, values_only=True
+            ), None)
+            if header is None:
+                return
+                
+            names = header_names(header)
+            if columns is not None:
+                missing = [column for column in columns if column not in names]
+                if missing:
+                    raise ValueError(f"Columns not found: {missing}")
+            keep = [i for i, name in enumerate(names) if columns is None or name in columns]
+            names = [names[i] for i in keep]
+            if not keep or stop == start:
+                return
+                
+            # Sheet rows and columns are 1-based; data starts below the header
+            first, last = keep[0], keep[-1]
+            keep = [i - first for i in keep]
+            sheet_rows = sheet.iter_rows(
+                min_row=header_row + start + 2,
+                max_row=header_row + stop + 1 if stop is not None else None,
+                min_col=first + 1,
+                max_col=last + 1,
+                values_only=True
+            )
+            
+            buffer = []
+            for row in sheet_rows:
+                buffer.append([row[i] if i < len(row) else None for i in keep])
+                if len(buffer) >= chunksize:
+                    yield pd.DataFrame(buffer, columns=names).infer_objects()
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=names).infer_objects()
+        finally:
+            workbook.close()
+            
+    def load_chunked(self, file_path, chunksize=50000, columns=None, rows=None):
+        """
+        Load a file through the streaming readers instead of the eager parser
+        
+        Avoids the parser's peak memory (e.g. openpyxl's full workbook
+        model); only the DataFrame and one chunk are held at a time.
+        
+        Args:
+            file_path (str): Path to data file
+            chunksize (int): Rows read per chunk
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to read, or None for all
+            
+        Returns:
+            pandas.DataFrame: Loaded data
+        """
+        try:
+            coercions = {}
+            chunks = list(self.iter_chunks(
+                file_path, chunksize=chunksize, columns=columns, rows=rows, coercions=coercions
+            ))
+            if not chunks:
+                return self.load_file(file_path, columns=columns, rows=rows)
+                
+            data = self.clean_data(pd.concat(chunks, ignore_index=True))
+            schema = self.infer_schema(file_path)
+            if schema is not None:
+                data.attrs['schema'] = schema.report(coercions)
             return data
+        except Exception as e:
+            raise Exception(f"Error loading file in chunks: {str(e)}")
             
+    def load_out_of_core(self, file_path, scratch_dir=None, chunksize=50000, columns=None, rows=None):
+        """
+        Stream a file into memory-mapped column files instead of a DataFrame
+        
+        Args:
+            file_path (str): Path to data file
+            scratch_dir (str): Parent directory for the spill files
+            chunksize (int): Rows held in memory while spilling
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to read, or None for all
+            
+        Returns:
+            ColumnStore: Spilled columns; call cleanup() when done
+        """
+        from core.column_store import ColumnStore
+        
+        try:
+            coercions = {}
+            store = ColumnStore.from_chunks(
+                self.iter_chunks(file_path, chunksize=chunksize, columns=columns, rows=rows, coercions=coercions),
+                scratch_dir=scratch_dir
+            )
+            schema = self.infer_schema(file_path)
+            if schema is not None:
+                store.schema = schema.report(coercions)
+            return store
         except Exception as e:
-            raise Exception(f"Error loading Excel file: {str(e)}")
+            raise Exception(f"Error loading file out-of-core: {str(e)}")
+            
+    def load_sample(self, file_path, sample_size=10000, seed=None, chunksize=50000,
+                    columns=None, rows=None):
+        """
+        Reservoir-sample rows while streaming through a file
+        
+        Args:
+            file_path (str): Path to data file
+            sample_size (int): Number of rows to keep
+            seed (int): Random seed for reproducible samples
+            chunksize (int): Rows read per chunk
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to sample from, or None for all
             
+        Returns:
+            tuple: (cleaned sample DataFrame, total number of rows in the file
+                or selection)
+        """
+        from core.sampling import ReservoirSampler
+        
+        try:
+            sampler = ReservoirSampler(sample_size, seed=seed)
+            for chunk in self.iter_chunks(file_path, chunksize=chunksize, columns=columns, rows=rows):
+                sampler.add(chunk)
+                
+            return self.clean_data(sampler.sample()), sampler.rows_seen
+        except Exception as e:
+            raise Exception(f"Error sampling file: {str(e)}")
+            
+    def load_cached(self, file_path, content_hash=None, chunked=False, columns=None, rows=None):
+        """
+        Load a file, reusing the parsed DataFrame while its content is unchanged
+        
+        Args:
+            file_path (str): Path to Excel file
+            content_hash (str): Precomputed content hash of the file
+            chunked (bool): Parse through the streaming readers on a miss
+            columns (list): Columns to read, or None for all
+            rows (tuple): (start, stop) data rows to read, or None for all
+            
+        Returns:
+            pandas.DataFrame: Loaded data, shared with the cache
+        """
+        if content_hash is None:
+            content_hash = file_content_hash(file_path)
+            
+        # Selections are cached apart from the whole file
+        cache_key = content_hash
+        if columns is not None or rows is not None:
+            cache_key = (content_hash, tuple(columns) if columns is not None else None, self.row_range(rows))
+            
+        data = self.cached_data(cache_key)
+        if data is not None:
+            return data
+            
+        if chunked:
+            data = self.load_chunked(file_path, columns=columns, rows=rows)
+        else:
+            data = self.load_file(file_path, columns=columns, rows=rows)
+        self.add_cached(cache_key, data)
+        
+        return data
+        
+    def cached_data(self, content_hash):
+        """Parsed DataFrame for a content hash, or None when it is not cached"""
+        if content_hash in self._data_cache:
+            self._data_cache.move_to_end(content_hash)
+            return self._data_cache[content_hash]
+        return None
+        
+    def add_cached(self, content_hash, data):
+        """Cache a DataFrame parsed elsewhere, such as one handed over by another process"""
+        self._data_cache[content_hash] = data
+        self._data_cache.move_to_end(content_hash)
+        while len(self._data_cache) > self.cache_size:
+            self._data_cache.popitem(last=False)
+        
     def is_valid_file(self, file_path):
-        """Check if file is a valid Excel file"""
+        """Check if file exists and has a supported format"""
         if not os.path.exists(file_path):
             return False
             
@@ -48,23 +560,33 @@ class ExcelHandler:
         """
         Perform basic data cleaning
         
+        Rows and columns are selected with a single take, and the frame is
+        returned as-is when nothing needs dropping, so cleaning never holds
+        more than one extra copy of the data.
+        
         Args:
             data (pandas.DataFrame): Raw data
             
         Returns:
             pandas.DataFrame: Cleaned data
         """
-        # Remove completely empty rows and columns
-        data = data.dropna(how='all')
-        data = data.dropna(axis=1, how='all')
-        
-        # Reset index
-        data = data.reset_index(drop=True)
-        
+        # Find completely empty rows and columns one column at a time
+        row_has_values = np.zeros(len(data), dtype=bool)
+        keep_columns = np.zeros(len(data.columns), dtype=bool)
+        for i in range(len(data.columns)):
+            not_null = data.iloc[:, i].notna().to_numpy()
+            keep_columns[i] = not_null.any()
+            row_has_values |= not_null
+            
+        if not row_has_values.all() or not keep_columns.all():
+            data = data.iloc[np.flatnonzero(row_has_values), np.flatnonzero(keep_columns)]
+            
+        # Reset index without copying column data
+        if not isinstance(data.index, pd.RangeIndex) or data.index.start != 0 or data.index.step != 1:
+            data = data.reset_index(drop=True)
+            
         # Clean column names
-        data.columns = [str(col).strip() for col in data.columns]
-        
-        return data
+        return data.set_axis([str(col).strip() for col in data.columns], axis=1)
         
     def get_sheet_names(self, file_path):
         """
@@ -77,8 +599,7 @@ class ExcelHandler:
             list: List of sheet names
         """
         try:
-            excel_file = pd.ExcelFile(file_path)
-            return excel_file.sheet_names
+            return self.get_reader_engine(file_path).sheet_names(file_path)
         except Exception as e:
             raise Exception(f"Error reading sheet names: {str(e)}")
             
@@ -94,8 +615,9 @@ class ExcelHandler:
             pandas.DataFrame: Loaded data from specific sheet
         """
         try:
-            data = pd.read_excel(file_path, sheet_name=sheet_name)
-            return self.clean_data(data)
+            data = self.get_reader_engine(file_path).read(file_path, sheet_name=sheet_name)
+            data = self.clean_data(data)
+            return DateColumnParser().parse(data) if self.parse_dates else data
         except Exception as e:
             raise Exception(f"Error loading sheet '{sheet_name}': {str(e)}")
             
@@ -0,0 +1,355 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+REGEX_CHARS = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+class ColumnIndex:
+    """Lazily built lookup structures for one column of a DataFrame"""
+    
+    def __init__(self, series):
+        self.series = series
+        self._null_mask = None
+        self._sorted_order = None
+        self._sorted_values = None
+        self._value_codes = None
+        self._group_rows = None
+        self._group_offsets = None
+        self._lower_strings = None
+        self._prefix_order = None
+        self._prefix_values = None
+        self._ranks = None
+        
+    @property
+    def null_mask(self):
+        """Boolean array marking missing values"""
+        if self._null_mask is None:
+            self._null_mask = self.series.isna().to_numpy()
+        return self._null_mask
+        
+    @property
+    def is_datetime(self):
+        return pd.api.types.is_datetime64_any_dtype(self.series)
+        
+    def _build_sorted(self):
+        """Stable argsort of the non-null values; nulls are left out"""
+        positions = np.flatnonzero(~self.null_mask)
+        values = self.series.to_numpy()[positions]
+        
+        if self.is_datetime:
+            values = values.astype('datetime64[ns]').view('int64')
+            
+        try:
+            order = np.argsort(values, kind='stable')
+        except TypeError:
+            # Mixed object column; order by text representation instead
+            values = values.astype(str)
+            order = np.argsort(values, kind='stable')
+            
+        self._sorted_order = positions[order]
+        self._sorted_values = values[order]
+        
+    @property
+    def sorted_order(self):
+        """Row positions of the non-null values in ascending value order"""
+        if self._sorted_order is None:
+            self._build_sorted()
+        return self._sorted_order
+        
+    @property
+    def sorted_values(self):
+        """Non-null values in ascending order (int64 for datetimes)"""
+        if self._sorted_values is None:
+            self._build_sorted()
+        return self._sorted_values
+        
+    @property
+    def ranks(self):
+        """Dense rank of every row's value (ties share a rank); -1 for nulls"""
+        if self._ranks is None:
+            values = self.sorted_values
+            dense = np.zeros(len(values), dtype=np.int64)
+            if len(values) > 1:
+                dense[1:] = np.cumsum(values[1:] != values[:-1])
+            self._ranks = np.full(len(self.series), -1, dtype=np.int64)
+            self._ranks[self.sorted_order] = dense
+        return self._ranks
+        
+    def sort_key(self, ascending=True):
+        """Integer key that sorts rows by this column with nulls last"""
+        ranks = self.ranks
+        key = ranks if ascending else -ranks
+        null_key = ranks.max(initial=-1) + 1 if ascending else 1
+        return np.where(self.null_mask, null_key, key)
+        
+    def _build_groups(self):
+        """Hash map from value to the rows that hold it, as CSR-style slices"""
+        codes, uniques = pd.factorize(self.series, use_na_sentinel=True)
+        valid = codes >= 0
+        
+        rows = np.flatnonzero(valid)
+        order = np.argsort(codes[valid], kind='stable')
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+        
+        self._group_rows = rows[order]
+        self._group_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._value_codes = {value: code for code, value in enumerate(uniques)}
+        
+    def rows_for_value(self, value):
+        """Row positions holding exactly this value"""
+        if self._value_codes is None:
+            self._build_groups()
+            
+        code = self._value_codes.get(self._normalize(value))
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return self._group_rows[self._group_offsets[code]:self._group_offsets[code + 1]]
+        
+    def rows_in_range(self, low=None, high=None, inclusive=True):
+        """Row positions whose value lies between low and high"""
+        values = self.sorted_values
+        start, stop = 0, len(values)
+        
+        if low is not None:
+            side = 'left' if inclusive else 'right'
+            start = np.searchsorted(values, self._comparable(low), side=side)
+        if high is not None:
+            side = 'right' if inclusive else 'left'
+            stop = np.searchsorted(values, self._comparable(high), side=side)
+            
+        return self.sorted_order[start:max(start, stop)]
+        
+    @property
+    def lower_strings(self):
+        """Lower-cased text of every value, with nulls as empty strings"""
+        if self._lower_strings is None:
+            text = self.series.astype(str).str.lower()
+            self._lower_strings = text.where(~self.null_mask, '')
+        return self._lower_strings
+        
+    def rows_with_prefix(self, prefix):
+        """Row positions whose lower-cased text starts with prefix"""
+        if self._prefix_order is None:
+            positions = np.flatnonzero(~self.null_mask)
+            values = self.lower_strings.to_numpy()[positions].astype(str)
+            order = np.argsort(values, kind='stable')
+            self._prefix_order = positions[order]
+            self._prefix_values = values[order]
+            
+        prefix = str(prefix).lower()
+        start = np.searchsorted(self._prefix_values, prefix, side='left')
+        stop = np.searchsorted(self._prefix_values, prefix + '\U0010ffff', side='left')
+        return self._prefix_order[start:stop]
+        
+    def _normalize(self, value):
+        """Match a lookup value to the representation used by factorize"""
+        if self.is_datetime:
+            return pd.Timestamp(value)
+        return value
+        
+    def _comparable(self, value):
+        """Convert a range bound to the representation of sorted_values"""
+        if self.is_datetime:
+            return np.datetime64(pd.Timestamp(value), 'ns').astype('int64')
+        if self.sorted_values.dtype.kind == 'U':
+            return str(value)
+        return value
+
+class ColumnIndexCache:
+    """Per-column indexes for one DataFrame, created on first use"""
+    
+    def __init__(self, data):
+        self.data = data
+        self._indexes = {}
+        self._orders = {}
+        
+    def get(self, column):
+        if column not in self.data.columns:
+            raise ValueError(f"Column '{column}' not found in data")
+        if column not in self._indexes:
+            self._indexes[column] = ColumnIndex(self.data[column])
+        return self._indexes[column]
+        
+    def sort_order(self, columns, ascending=True):
+        """
+        Stable row permutation that sorts the data, cached per sort spec
+        
+        Args:
+            columns (str or list): Column or columns to sort by
+            ascending (bool or list): Direction, per column if a list
+            
+        Returns:
+            numpy.ndarray: Row positions in sorted order, nulls last
+        """
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(columns)
+        if len(ascending) != len(columns):
+            raise ValueError("ascending must have one entry per sort column")
+            
+        key = (tuple(columns), tuple(ascending))
+        if key not in self._orders:
+            if len(columns) == 1 and ascending[0]:
+                index = self.get(columns[0])
+                self._orders[key] = np.concatenate((index.sorted_order, np.flatnonzero(index.null_mask)))
+            else:
+                # lexsort is stable and treats its last key as the primary one
+                sort_keys = [self.get(col).sort_key(asc) for col, asc in zip(columns, ascending)]
+                self._orders[key] = np.lexsort(sort_keys[::-1])
+        return self._orders[key]
+        
+    def row_mask(self, rows):
+        """Boolean mask with the given row positions set"""
+        mask = np.zeros(len(self.data), dtype=bool)
+        mask[rows] = True
+        return mask
+
+class Predicate:
+    """Base class for filter conditions; combine with & and |"""
+    
+    def mask(self, indexes):
+        """
+        Evaluate the condition
+        
+        Args:
+            indexes (ColumnIndexCache): Indexes of the data being filtered
+            
+        Returns:
+            numpy.ndarray: Boolean mask of matching rows
+        """
+        raise NotImplementedError
+        
+    def __and__(self, other):
+        return And(self, other)
+        
+    def __or__(self, other):
+        return Or(self, other)
+
+class Equals(Predicate):
+    """Value equals the given value"""
+    
+    def __init__(self, column, value):
+        self.column = column
+        self.value = value
+        
+    def mask(self, indexes):
+        return indexes.row_mask(indexes.get(self.column).rows_for_value(self.value))
+
+class In(Predicate):
+    """Value is one of the given values"""
+    
+    def __init__(self, column, values):
+        self.column = column
+        self.values = list(values)
+        
+    def mask(self, indexes):
+        index = indexes.get(self.column)
+        rows = [index.rows_for_value(value) for value in self.values]
+        return indexes.row_mask(np.concatenate(rows) if rows else np.empty(0, dtype=np.intp))
+
+class Range(Predicate):
+    """Value lies between low and high; either bound may be None"""
+    
+    def __init__(self, column, low=None, high=None, inclusive=True):
+        self.column = column
+        self.low = low
+        self.high = high
+        self.inclusive = inclusive
+        
+    def mask(self, indexes):
+        rows = indexes.get(self.column).rows_in_range(self.low, self.high, self.inclusive)
+        return indexes.row_mask(rows)
+
+class Prefix(Predicate):
+    """Text starts with the given prefix (case-insensitive)"""
+    
+    def __init__(self, column, prefix):
+        self.column = column
+        self.prefix = prefix
+        
+    def mask(self, indexes):
+        return indexes.row_mask(indexes.get(self.column).rows_with_prefix(self.prefix))
+
+class Contains(Predicate):
+    """Text contains the given substring or pattern (case-insensitive)"""
+    
+    def __init__(self, column, text, regex=False):
+        self.column = column
+        self.text = text
+        self.regex = regex
+        
+    def mask(self, indexes):
+        index = indexes.get(self.column)
+        pattern = self.text if self.regex else str(self.text).lower()
+        matches = index.lower_strings.str.contains(pattern, case=False, regex=self.regex, na=False)
+        return matches.to_numpy() & ~index.null_mask
+
+class IsNull(Predicate):
+    """Value is missing, or present when null=False"""
+    
+    def __init__(self, column, null=True):
+        self.column = column
+        self.null = null
+        
+    def mask(self, indexes):
+        null_mask = indexes.get(self.column).null_mask
+        return null_mask.copy() if self.null else ~null_mask
+
+class And(Predicate):
+    """All conditions hold"""
+    
+    def __init__(self, *predicates):
+        self.predicates = predicates
+        
+    def mask(self, indexes):
+        result = np.ones(len(indexes.data), dtype=bool)
+        for predicate in self.predicates:
+            result &= predicate.mask(indexes)
+        return result
+
+class Or(Predicate):
+    """At least one condition holds"""
+    
+    def __init__(self, *predicates):
+        self.predicates = predicates
+        
+    def mask(self, indexes):
+        result = np.zeros(len(indexes.data), dtype=bool)
+        for predicate in self.predicates:
+            result |= predicate.mask(indexes)
+        return result
+
+class FilterSpec(Predicate):
+    """
+    Conjunction of dictionary-style column: condition pairs
+    
+    Strings keep the original case-insensitive pattern match, None matches
+    missing values, lists/sets/tuples match any of their values,
+    {'min': ..., 'max': ...} dicts give ranges and anything else is an
+    equality test. Unknown columns are ignored, as before.
+    """
+    
+    def __init__(self, filters):
+        self.filters = filters
+        
+    def mask(self, indexes):
+        predicates = []
+        for column, condition in self.filters.items():
+            if column not in indexes.data.columns:
+                continue
+            if isinstance(condition, Predicate):
+                predicates.append(condition)
+            elif isinstance(condition, str):
+                # Plain text skips the regex engine; patterns keep working
+                regex = REGEX_CHARS.search(condition) is not None
+                predicates.append(Contains(column, condition, regex=regex))
+            elif condition is None:
+                predicates.append(IsNull(column))
+            elif isinstance(condition, (list, set, tuple)):
+                predicates.append(In(column, condition))
+            elif isinstance(condition, dict):
+                predicates.append(Range(column, condition.get('min'), condition.get('max')))
+            else:
+                predicates.append(Equals(column, condition))
+        return And(*predicates).mask(indexes)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+class FrequencyTable:
+    """Value counts of one column, most frequent first"""
+    
+    def __init__(self, series, max_distinct=10000, top_k=1000):
+        """
+        Args:
+            series (pandas.Series): Column to count
+            max_distinct (int): Above this many distinct values only the
+                top_k heavy hitters are kept
+            top_k (int): Values kept for high-cardinality columns
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        present = codes[codes >= 0]
+        counts = np.bincount(present, minlength=len(uniques))
+        
+        self.n_unique = len(uniques)
+        self.missing = len(codes) - len(present)
+        self.truncated = self.n_unique > max_distinct
+        self._mode = self._smallest(pd.Index(uniques)[counts == counts.max()]) if self.n_unique else None
+        
+        if self.truncated:
+            # Keep the heavy hitters only, so memory stays bounded by top_k
+            keep = np.argpartition(-counts, min(top_k, self.n_unique) - 1)[:top_k]
+            keep = np.sort(keep)
+        else:
+            keep = np.arange(self.n_unique)
+            
+        # Most frequent first; ties keep their order of first appearance
+        order = keep[np.argsort(-counts[keep], kind='stable')]
+        self.values = pd.Index(uniques).take(order).tolist()
+        self.counts = counts[order]
+        
+    def top(self, n=5):
+        """The n most frequent values and their counts"""
+        return {value: int(count) for value, count in zip(self.values[:n], self.counts[:n])}
+        
+    def mode(self):
+        """Most frequent value; the smallest one on ties, as Series.mode does"""
+        return self._mode
+        
+    @staticmethod
+    def _smallest(values):
+        """Smallest of the tied values, or the first when they do not compare"""
+        try:
+            return values.min()
+        except TypeError:
+            return values[0]
+
+class FrequencyCache:
+    """Frequency tables for one DataFrame, built on first use per column"""
+    
+    def __init__(self, data, max_distinct=10000, top_k=1000):
+        self.data = data
+        self.max_distinct = max_distinct
+        self.top_k = top_k
+        self._tables = {}
+        
+    def get(self, column):
+        if column not in self.data.columns:
+            raise ValueError(f"Column '{column}' not found in data")
+        if column not in self._tables:
+            self._tables[column] = FrequencyTable(self.data[column], self.max_distinct, self.top_k)
+        return self._tables[column]
+        
+    def nunique(self, column):
+        """Distinct non-missing values, exact even for truncated tables"""
+        return self.get(column).n_unique
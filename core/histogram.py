@@ -0,0 +1,233 @@
+import math
+
+import numpy as np
+from markupsafe import Markup
+
+# Bins per histogram; also the number of bars in a sparkline
+HISTOGRAM_BINS = 32
+
+class Histogram:
+    """
+    Fixed-bin histogram that can be built chunk by chunk and merged
+    
+    Bins are aligned to multiples of a power-of-two width, so the bins of
+    two histograms either line up or one width is a multiple of the other.
+    When values fall outside the current bins, neighbouring bins are
+    merged pairwise and the width doubles; counts are never re-estimated,
+    so merging chunk histograms gives exactly the histogram of all values
+    at the final width.
+    """
+    
+    def __init__(self, bins=HISTOGRAM_BINS):
+        """
+        Args:
+            bins (int): Maximum number of bins
+        """
+        self.bins = bins
+        self.width = None
+        self.start = 0
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.min = None
+        self.max = None
+        
+    @property
+    def count(self):
+        return int(self.counts.sum())
+        
+    def add(self, values):
+        """
+        Count a chunk of values; NaN and infinite values are skipped
+        
+        Args:
+            values (numpy.ndarray): Numbers, or int64 timestamps
+            
+        Returns:
+            Histogram: self, to allow chaining
+        """
+        values = np.asarray(values, dtype='float64')
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return self
+            
+        low, high = float(values.min()), float(values.max())
+        chunk = Histogram(self.bins)
+        chunk.width = self.initial_width(low, high, self.bins)
+        chunk.start = math.floor(low / chunk.width)
+        chunk.min, chunk.max = low, high
+        chunk._fit(math.floor(high / chunk.width))
+        
+        positions = np.floor(values / chunk.width) - chunk.start
+        positions = np.clip(positions, 0, self.bins - 1).astype(np.int64)
+        chunk.counts = np.bincount(positions, minlength=self.bins)
+        return self.merge(chunk)
+        
+    def merge(self, other):
+        """
+        Add the counts of another histogram
+        
+        Args:
+            other (Histogram): Histogram of any number of bins; with more
+                bins than this one, it is coarsened to fit
+                
+        Returns:
+            Histogram: self, to allow chaining
+        """
+        if other.width is None or not other.count:
+            return self
+        if (self.width is None or not self.count) and other.bins == self.bins:
+            self.width, self.start = other.width, other.start
+            self.counts = other.counts.copy()
+            self.min, self.max = other.min, other.max
+            return self
+            
+        width = max(self.width or other.width, other.width)
+        first, last = other._occupied(width)
+        if self.count:
+            own_first, own_last = self._occupied(width)
+            first, last = min(first, own_first), max(last, own_last)
+        
+        # Double the width until both ranges fit in the bins
+        while last - first >= self.bins:
+            width *= 2
+            first, last = first // 2, last // 2
+            
+        counts = other._rebinned(width, first, self.bins)
+        if self.count:
+            counts += self._rebinned(width, first, self.bins)
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        else:
+            self.min, self.max = other.min, other.max
+        self.counts = counts
+        self.width, self.start = width, first
+        return self
+        
+    def quantile(self, q):
+        """
+        Estimate of the q-th quantile, interpolated within its bin
+        
+        Args:
+            q (float): Quantile between 0 and 1
+            
+        Returns:
+            float: Estimate, within one bin width of the exact quantile;
+                NaN for an empty histogram
+        """
+        total = self.count
+        if not total:
+            return float('nan')
+            
+        cumulative = np.cumsum(self.counts)
+        rank = q * total
+        i = min(int(np.searchsorted(cumulative, rank)), self.bins - 1)
+        before = cumulative[i - 1] if i else 0
+        fraction = (rank - before) / self.counts[i] if self.counts[i] else 0.0
+        value = (self.start + i + fraction) * self.width
+        return float(min(max(value, self.min), self.max))
+        
+    def count_outside(self, low, high):
+        """
+        Estimate of the values below low or above high
+        
+        Values are taken as spread evenly within each bin.
+        """
+        if not self.count:
+            return 0
+        edges = (self.start + np.arange(self.bins)) * self.width
+        below = np.clip((low - edges) / self.width, 0.0, 1.0)
+        above = np.clip((edges + self.width - high) / self.width, 0.0, 1.0)
+        return int(round(float((self.counts * (below + above)).sum())))
+        
+    @staticmethod
+    def initial_width(low, high, bins):
+        """Power-of-two bin width that spreads one chunk over the bins"""
+        span = high - low
+        if span > 0:
+            return 2.0 ** math.ceil(math.log2(span / bins))
+        if low:
+            # A single value; bins sized to its magnitude keep later chunks readable
+            return 2.0 ** math.floor(math.log2(abs(low))) / bins
+        return 1.0
+        
+    def _fit(self, last):
+        """Double the width until bin index last falls inside the bins"""
+        while last - self.start >= self.bins:
+            self.width *= 2
+            self.start, last = self.start // 2, last // 2
+            
+    def _occupied(self, width):
+        """First and last non-empty bin index at a coarser power-of-two width"""
+        filled = np.flatnonzero(self.counts)
+        factor = round(width / self.width)
+        return (self.start + int(filled[0])) // factor, (self.start + int(filled[-1])) // factor
+        
+    def _rebinned(self, width, start, bins):
+        """Counts moved onto bins of a coarser width beginning at index start"""
+        factor = round(width / self.width)
+        filled = np.flatnonzero(self.counts)
+        positions = (self.start + filled) // factor - start
+        return np.bincount(positions, weights=self.counts[filled], minlength=bins).astype(np.int64)
+        
+    def trimmed_range(self):
+        """Positions of the first and last non-empty bins"""
+        filled = np.flatnonzero(self.counts)
+        if not len(filled):
+            return 0, -1
+        return int(filled[0]), int(filled[-1])
+        
+    def to_dict(self):
+        """
+        Serializable form; only the bins between the first and last
+        non-empty one are kept
+        """
+        first, last = self.trimmed_range()
+        return {
+            'bins': self.bins,
+            'width': self.width,
+            'start': self.start + first if self.width is not None else 0,
+            'counts': self.counts[first:last + 1].tolist(),
+            'min': self.min,
+            'max': self.max
+        }
+        
+    @classmethod
+    def from_dict(cls, payload):
+        histogram = cls(payload['bins'])
+        if payload['width'] is not None and payload['counts']:
+            histogram.width = payload['width']
+            histogram.start = payload['start']
+            histogram.counts[:len(payload['counts'])] = payload['counts']
+            histogram.min, histogram.max = payload['min'], payload['max']
+        return histogram
+
+def sparkline_svg(counts, title=None, width=120, height=24):
+    """
+    Bar sparkline as an inline SVG element
+    
+    Args:
+        counts (list): Bar heights, e.g. histogram counts
+        title (str): Tooltip text
+        width (int): Width in pixels
+        height (int): Height in pixels
+        
+    Returns:
+        markupsafe.Markup: SVG markup, safe to insert in an autoescaped template
+    """
+    if not counts:
+        return Markup('')
+        
+    peak = max(counts) or 1
+    bar = width / len(counts)
+    path = []
+    for i, count in enumerate(counts):
+        if count:
+            # At least one pixel, so rare values stay visible
+            top = height - max(1.0, count / peak * height)
+            path.append(f"M{i * bar:.1f} {height}V{top:.1f}h{max(bar - 1, 1):.1f}V{height}z")
+            
+    return Markup(
+        '<svg class="sparkline" xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" '
+        'viewBox="0 0 {w} {h}">{title}<path d="{path}"/></svg>'
+    ).format(
+        w=width, h=height, path=''.join(path),
+        title=Markup('<title>{}</title>').format(title) if title else ''
+    )
@@ -0,0 +1,197 @@
+import os
+from pathlib import Path
+
+from utils.helpers import format_file_size
+
+# Analysis holds about two temporary copies of the data next to the frame
+PROCESSING_OVERHEAD = 3.0
+
+# Peak memory of the eager parsers relative to the file size on disk
+PARSER_EXPANSION = {
+    '.xlsx': 10.0,
+    '.xls': 4.0,
+    '.csv': 1.0,
+    '.tsv': 1.0,
+    '.parquet': 2.0
+}
+
+# Upper bound of the in-memory frame size relative to the file size on
+# disk; files this far below the budget are loaded without an estimate
+SMALL_FILE_EXPANSION = 50.0
+
+# Formats with a streaming reader in ExcelHandler.iter_chunks
+STREAMABLE_FORMATS = ('.xlsx', '.csv', '.tsv', '.parquet')
+
+def default_memory_budget(fraction=0.5, fallback=2 * 1024 ** 3):
+    """
+    Memory the report generator may use
+    
+    Args:
+        fraction (float): Share of the available memory to use; without
+            psutil, half that share of the physical memory
+        fallback (int): Budget in bytes when memory cannot be queried
+        
+    Returns:
+        int: Budget in bytes
+    """
+    try:
+        import psutil
+        return int(psutil.virtual_memory().available * fraction)
+    except ImportError:
+        pass
+        
+    try:
+        return int(os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') * fraction / 2)
+    except (AttributeError, ValueError, OSError):
+        return fallback
+
+class LoadPlan:
+    """Chosen load strategy with the estimates behind it"""
+    
+    def __init__(self, strategy, reason, rows, columns, frame_bytes, peak_bytes, memory_budget):
+        self.strategy = strategy
+        self.reason = reason
+        self.rows = rows
+        self.columns = columns
+        self.frame_bytes = frame_bytes
+        self.peak_bytes = peak_bytes
+        self.memory_budget = memory_budget
+        
+    def to_dict(self):
+        """Plan as report metadata"""
+        return {
+            'strategy': self.strategy,
+            'reason': self.reason,
+            'estimated_rows': self.rows,
+            'estimated_columns': self.columns,
+            'estimated_frame_size': format_file_size(self.frame_bytes),
+            'estimated_peak': format_file_size(self.peak_bytes),
+            'memory_budget': format_file_size(self.memory_budget)
+        }
+
+class LoadPlanner:
+    """Picks eager, chunked, out-of-core or sampled loading to fit a memory budget"""
+    
+    def __init__(self, excel_handler, memory_budget=None, sample_rows=1000, sample_size=10000):
+        """
+        Args:
+            excel_handler (ExcelHandler): Handler used to read the dtype sample
+            memory_budget (int): Bytes available; defaults to half the free memory
+            sample_rows (int): Rows read to estimate the size of a row
+            sample_size (int): Rows kept when the plan falls back to sampling
+        """
+        self.excel_handler = excel_handler
+        self.memory_budget = memory_budget or default_memory_budget()
+        self.sample_rows = sample_rows
+        self.sample_size = sample_size
+        
+    def estimate_dimensions(self, file_path):
+        """
+        Rows and columns of the first sheet, read from file metadata
+        
+        Returns:
+            tuple: (rows, columns); either may be None when unknown
+        """
+        file_ext = Path(file_path).suffix.lower()
+        
+        if file_ext == '.xlsx':
+            from openpyxl import load_workbook
+            
+            workbook = load_workbook(file_path, read_only=True)
+            try:
+                sheet = workbook.worksheets[0]
+                rows = sheet.max_row - 1 if sheet.max_row else None
+                return rows, sheet.max_column
+            finally:
+                workbook.close()
+                
+        if file_ext == '.parquet':
+            import pyarrow.parquet as pq
+            
+            metadata = pq.ParquetFile(file_path).metadata
+            return metadata.num_rows, metadata.num_columns
+            
+        if file_ext in self.excel_handler.delimiters:
+            # Extrapolate the line count from the first block of the file
+            with open(file_path, 'rb') as f:
+                head = f.read(1024 * 1024)
+            lines = head.count(b'\n')
+            if not lines:
+                return 0, None
+            if len(head) < 1024 * 1024:
+                return lines - 1, None
+            return int(os.path.getsize(file_path) / (len(head) / lines)) - 1, None
+            
+        return None, None
+        
+    def estimate_row_bytes(self, file_path, columns=None):
+        """In-memory bytes per row, measured on the first rows of the file"""
+        chunks = self.excel_handler.iter_chunks(file_path, chunksize=self.sample_rows, columns=columns)
+        try:
+            sample = next(chunks, None)
+        finally:
+            chunks.close()
+        if sample is None or not len(sample):
+            return 0, 0
+        return sample.memory_usage(deep=True, index=False).sum() / len(sample), len(sample.columns)
+        
+    def plan(self, file_path, report_type="summary", columns=None, rows=None):
+        """
+        Choose how to load and analyze a file
+        
+        Args:
+            file_path (str): Path to data file
+            report_type (str): Requested report type; only summary reports
+                can be built out-of-core
+            columns (list): Columns that will be read, or None for all
+            rows (tuple): (start, stop) data rows that will be read, or None
+                
+        Returns:
+            LoadPlan: Chosen strategy and its reasoning
+        """
+        file_ext = Path(file_path).suffix.lower()
+        file_size = os.path.getsize(file_path)
+        budget = self.memory_budget
+        
+        if file_ext not in STREAMABLE_FORMATS:
+            # Legacy .xls sheets are capped at 65,536 rows and have no streaming reader
+            peak = file_size * PARSER_EXPANSION.get(file_ext, 4.0) * PROCESSING_OVERHEAD
+            return LoadPlan('eager', f"{file_ext} files are always read whole",
+                            None, None, file_size, peak, budget)
+                            
+        # Skip opening the file for the estimate when even a generous
+        # worst case fits
+        frame_bytes = int(file_size * SMALL_FILE_EXPANSION)
+        peak = int(frame_bytes * PROCESSING_OVERHEAD + file_size * PARSER_EXPANSION[file_ext])
+        if peak <= budget:
+            return LoadPlan('eager', f"{format_file_size(file_size)} file; fits the budget even at {SMALL_FILE_EXPANSION:g}x its size in memory",
+                            None, None, frame_bytes, peak, budget)
+                            
+        selected_columns, selected_rows = columns, rows
+        rows, columns = self.estimate_dimensions(file_path)
+        row_bytes, sampled_columns = self.estimate_row_bytes(file_path, selected_columns)
+        columns = sampled_columns if selected_columns is not None else columns or sampled_columns
+        if rows is None:
+            rows = self.sample_rows
+        if selected_rows is not None:
+            start, stop = self.excel_handler.row_range(selected_rows)
+            rows = max(0, (rows if stop is None else min(rows, stop)) - start)
+            
+        frame_bytes = int(rows * row_bytes)
+        eager_peak = int(frame_bytes * PROCESSING_OVERHEAD + file_size * PARSER_EXPANSION[file_ext])
+        chunked_peak = int(frame_bytes * PROCESSING_OVERHEAD)
+        column_peak = int(rows * 8 * PROCESSING_OVERHEAD)
+        sample_peak = int(min(rows, self.sample_size) * row_bytes * PROCESSING_OVERHEAD)
+        size = f"about {rows:,} rows x {columns} columns ({format_file_size(frame_bytes)} in memory)"
+        
+        if eager_peak <= budget:
+            return LoadPlan('eager', f"{size}; the whole file fits the budget",
+                            rows, columns, frame_bytes, eager_peak, budget)
+        if chunked_peak <= budget:
+            return LoadPlan('chunked', f"{size}; the data fits but the eager parser would not, so it is streamed in chunks",
+                            rows, columns, frame_bytes, chunked_peak, budget)
+        if report_type == "summary" and column_peak <= budget:
+            return LoadPlan('out_of_core', f"{size}; too large for memory, so columns are spilled to disk and profiled one at a time",
+                            rows, columns, frame_bytes, column_peak, budget)
+        return LoadPlan('sampled', f"{size}; too large for a {report_type} report in memory, so it is estimated from a {self.sample_size:,}-row sample",
+                        rows, columns, frame_bytes, sample_peak, budget)
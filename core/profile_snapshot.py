@@ -0,0 +1,452 @@
+import json
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.histogram import Histogram
+
+SNAPSHOT_VERSION = 3
+
+# Bins of the stored histograms; medians and quartiles are read from them
+SNAPSHOT_BINS = 1024
+
+# Value counts kept per column: text columns keep up to TEXT_VALUES counts,
+# then only their TOP_VALUES most frequent; other columns keep counts only
+# while they have few enough distinct values to be listed as categories
+TEXT_VALUES = 10000
+TOP_VALUES = 1000
+CATEGORY_VALUES = 20
+
+NAT = np.iinfo(np.int64).min
+
+def _plain(value):
+    """JSON-safe form of a cell value; other types are kept as text"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+def _merge_sorted(left, right):
+    """Union of two sorted arrays of distinct values, in linear time"""
+    # Stable sort is a merge sort, which merges two sorted runs in one pass
+    merged = np.sort(np.concatenate([left, right]), kind='stable')
+    if len(merged):
+        merged = merged[np.r_[True, merged[1:] != merged[:-1]]]
+    return merged
+
+def _merge_weighted(left_values, left_counts, right_values, right_counts):
+    """Sum the counts of two sorted distinct-value arrays"""
+    values = np.concatenate([left_values, right_values])
+    counts = np.concatenate([left_counts, right_counts])
+    order = np.argsort(values, kind='stable')
+    values, counts = values[order], counts[order]
+    if not len(values):
+        return values, counts
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    return values[starts], np.add.reduceat(counts, starts)
+
+class ProfileSnapshot:
+    """
+    Mergeable column statistics plus a fingerprint of the rows they cover
+
+    Everything the summary report shows is kept in a mergeable form:
+    moments and a histogram per numeric column, value counts, text length
+    and pattern counts, distinct timestamps with their counts, and the set
+    of row hashes for duplicate detection. Appended rows are profiled on
+    their own and merged in, so the rows already covered are never read
+    again.
+    """
+
+    def __init__(self, row_count=0, fingerprint=None, dtypes=None, stats=None,
+                 arrays=None, duplicate_rows=0):
+        self.row_count = row_count
+        self.fingerprint = fingerprint
+        self.dtypes = dtypes or {}
+        self.stats = stats or {}
+        # Sorted arrays: 'rows' holds the distinct row hashes; per column
+        # position, 'distinct_<i>' the hashes of distinct text values and
+        # 'times_<i>'/'time_counts_<i>' the distinct timestamps
+        self.arrays = arrays or {}
+        self.duplicate_rows = duplicate_rows
+        # Digest of the covered rows, left by matches_prefix() for extend()
+        self._prefix_digest = None
+
+    @staticmethod
+    def snapshot_path(file_path):
+        """Path of the snapshot file stored next to a workbook"""
+        path = Path(file_path)
+        return path.with_name(path.name + '.profile.npz')
+
+    @staticmethod
+    def hash_rows(data):
+        """Hash every row of a DataFrame into a uint64 array"""
+        return pd.util.hash_pandas_object(data, index=False).to_numpy()
+
+    @staticmethod
+    def row_digest(dtypes, hashes):
+        """
+        Running SHA-256 over the column types and the row hashes in order
+
+        Args:
+            dtypes (dict): Column name to dtype
+            hashes (numpy.ndarray): hash_rows of the covered rows
+
+        Returns:
+            hashlib object: Digest that appended row hashes can update
+        """
+        digest = hashlib.sha256(json.dumps(
+            [[str(col), str(dtype)] for col, dtype in dtypes.items()]
+        ).encode('utf-8'))
+        digest.update(np.ascontiguousarray(hashes).tobytes())
+        return digest
+
+    @classmethod
+    def fingerprint_rows(cls, data, row_count):
+        """
+        Digest of every cell in the first row_count rows of data
+
+        Every covered row is hashed (one vectorized pass, no statistics),
+        so an edit anywhere in the saved rows changes the fingerprint.
+        """
+        return cls.row_digest(data.dtypes, cls.hash_rows(data.iloc[:row_count])).hexdigest()
+
+    @staticmethod
+    def timestamp_values(series):
+        """Non-missing values of a datetime column as int64 nanoseconds"""
+        if getattr(series.dt, 'tz', None) is not None:
+            series = series.dt.tz_convert(None)
+        values = series.to_numpy(dtype='datetime64[ns]').view('int64')
+        return values[values != NAT]
+
+    @staticmethod
+    def is_text(dtype):
+        """Columns profiled as text, as select_dtypes(include=['object']) picks them"""
+        return pd.api.types.is_object_dtype(dtype) or isinstance(dtype, pd.StringDtype)
+
+    @classmethod
+    def from_data(cls, data):
+        """
+        Build a snapshot covering every row of a DataFrame
+
+        Args:
+            data (pandas.DataFrame): Data to profile
+
+        Returns:
+            ProfileSnapshot: Snapshot of the data
+        """
+        snapshot = cls(
+            dtypes={col: str(dtype) for col, dtype in data.dtypes.items()},
+            arrays={'rows': np.array([], dtype=np.uint64)}
+        )
+        hashes = cls.hash_rows(data)
+        snapshot.add_rows(data, first=True, hashes=hashes)
+        snapshot.row_count = len(data)
+        snapshot.fingerprint = cls.row_digest(data.dtypes, hashes).hexdigest()
+        return snapshot
+
+    @classmethod
+    def compute_stats(cls, data):
+        """
+        Compute mergeable statistics for every column
+
+        Args:
+            data (pandas.DataFrame): Data to profile
+
+        Returns:
+            tuple: (per-column stats, arrays keyed as in ProfileSnapshot.arrays)
+        """
+        stats = {}
+        arrays = {}
+        missing = data.isnull().sum()
+        memory = data.memory_usage(deep=True, index=False)
+
+        for i, col in enumerate(data.columns):
+            series = data[col]
+            col_stats = {
+                'count': int(len(data) - missing[col]),
+                'missing': int(missing[col]),
+                'memory': int(memory[col])
+            }
+
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            text = cls.is_text(series.dtype)
+            col_stats['values'] = cls.count_values(uniques, counts, text)
+            col_stats['values_truncated'] = text and len(uniques) > TEXT_VALUES
+
+            if text:
+                labels = pd.Series([str(value) for value in uniques], dtype=object)
+                col_stats.update({
+                    'length_sum': int((labels.str.len().to_numpy() * counts).sum()),
+                    'with_digits': int(counts[labels.str.contains(r'\d').to_numpy(dtype=bool)].sum()),
+                    'with_special': int(counts[labels.str.contains(r'[^a-zA-Z0-9\s]').to_numpy(dtype=bool)].sum())
+                })
+                arrays[f'distinct_{i}'] = np.unique(pd.util.hash_array(np.asarray(uniques, dtype=object)))
+            elif pd.api.types.is_datetime64_any_dtype(series):
+                times, time_counts = np.unique(cls.timestamp_values(series), return_counts=True)
+                arrays[f'times_{i}'] = times
+                arrays[f'time_counts_{i}'] = time_counts.astype(np.int64)
+
+            stats[col] = col_stats
+
+        numeric_data = data.select_dtypes(include=[np.number])
+        if len(numeric_data.columns):
+            values = numeric_data.to_numpy(dtype='float64', na_value=np.nan)
+            counts = np.count_nonzero(~np.isnan(values), axis=0)
+
+            with np.errstate(invalid='ignore'):
+                means = np.nansum(values, axis=0) / np.where(counts > 0, counts, 1)
+                m2 = np.nansum((values - means) ** 2, axis=0)
+
+            for i, col in enumerate(numeric_data.columns):
+                has_values = counts[i] > 0
+                stats[col].update({
+                    'mean': float(means[i]) if has_values else None,
+                    'm2': float(m2[i]) if has_values else 0.0,
+                    'min': float(np.nanmin(values[:, i])) if has_values else None,
+                    'max': float(np.nanmax(values[:, i])) if has_values else None,
+                    'histogram': Histogram(SNAPSHOT_BINS).add(values[:, i]).to_dict()
+                })
+
+        return stats, arrays
+
+    @staticmethod
+    def count_values(values, counts, text):
+        """
+        [value, count] pairs in first-appearance order, bounded as
+        described at TEXT_VALUES; None once a non-text column has too many
+        values
+        """
+        limit = TEXT_VALUES if text else CATEGORY_VALUES
+        if len(values) > limit:
+            if not text:
+                return None
+            keep = np.sort(np.argpartition(-counts, TOP_VALUES - 1)[:TOP_VALUES])
+            values, counts = [values[i] for i in keep], counts[keep]
+        return [[_plain(value), int(count)] for value, count in zip(values, counts)]
+
+    @staticmethod
+    def merge_values(left, right, text):
+        """
+        Add two value-count tables, bounded like count_values
+
+        Returns:
+            tuple: (merged counts or None, whether text values were dropped)
+        """
+        if left is None or right is None:
+            return None, False
+        merged = dict(left)
+        for value, count in right:
+            merged[value] = merged.get(value, 0) + count
+        if len(merged) > (TEXT_VALUES if text else CATEGORY_VALUES):
+            if not text:
+                return None, False
+            # Heavy hitters only; counts of values dropped earlier are lost
+            top = sorted(merged.items(), key=lambda item: -item[1])[:TOP_VALUES]
+            keep = {value for value, _ in top}
+            return [[value, count] for value, count in merged.items() if value in keep], True
+        return [[value, count] for value, count in merged.items()], False
+
+    @staticmethod
+    def merge_stats(left, right):
+        """
+        Merge two sets of column statistics (Chan et al. parallel update)
+
+        Args:
+            left (dict): Statistics of the earlier rows
+            right (dict): Statistics of the appended rows
+
+        Returns:
+            dict: Statistics of all rows
+        """
+        merged = {}
+
+        for col, a in left.items():
+            b = right.get(col, {'count': 0, 'missing': 0})
+            count = a['count'] + b['count']
+            result = {'count': count, 'missing': a['missing'] + b['missing']}
+            result['memory'] = a.get('memory', 0) + b.get('memory', 0)
+
+            if 'mean' in a or 'mean' in b:
+                if not a.get('count') or a.get('mean') is None:
+                    result.update({key: b.get(key) for key in ('mean', 'm2', 'min', 'max')})
+                elif not b.get('count') or b.get('mean') is None:
+                    result.update({key: a.get(key) for key in ('mean', 'm2', 'min', 'max')})
+                else:
+                    delta = b['mean'] - a['mean']
+                    result.update({
+                        'mean': a['mean'] + delta * b['count'] / count,
+                        'm2': a['m2'] + b['m2'] + delta ** 2 * a['count'] * b['count'] / count,
+                        'min': min(a['min'], b['min']),
+                        'max': max(a['max'], b['max'])
+                    })
+
+            histograms = [side['histogram'] for side in (a, b) if side.get('histogram')]
+            if histograms:
+                histogram = Histogram(histograms[0]['bins'])
+                for payload in histograms:
+                    histogram.merge(Histogram.from_dict(payload))
+                result['histogram'] = histogram.to_dict()
+
+            if 'values' in a:
+                text = 'length_sum' in a
+                result['values'], dropped = ProfileSnapshot.merge_values(
+                    a['values'], b.get('values', []), text
+                )
+                result['values_truncated'] = (
+                    a['values_truncated'] or b.get('values_truncated', False) or dropped
+                )
+            for key in ('length_sum', 'with_digits', 'with_special'):
+                if key in a:
+                    result[key] = a[key] + b.get(key, 0)
+
+            merged[col] = result
+
+        return merged
+
+    def add_rows(self, rows, first=False, hashes=None):
+        """
+        Fold rows into the statistics, the row hashes and the arrays
+
+        Args:
+            rows (pandas.DataFrame): Rows not covered yet
+            first (bool): The snapshot is empty; take the statistics as they are
+            hashes (numpy.ndarray): hash_rows(rows), when already computed
+        """
+        stats, arrays = self.compute_stats(rows)
+
+        # Duplicates: repeats among the new rows, plus new rows seen before
+        if hashes is None:
+            hashes = self.hash_rows(rows)
+        hashes, repeats = np.unique(hashes, return_counts=True)
+        known = self.arrays['rows']
+        positions = np.searchsorted(known, hashes).clip(max=max(len(known) - 1, 0))
+        seen = known[positions] == hashes if len(known) else np.zeros(len(hashes), dtype=bool)
+        self.duplicate_rows += int(repeats.sum() - len(hashes) + seen.sum())
+        self.arrays['rows'] = _merge_sorted(known, hashes[~seen])
+
+        if first:
+            self.stats = stats
+            self.arrays.update(arrays)
+            return
+
+        self.stats = self.merge_stats(self.stats, stats)
+        for name, values in arrays.items():
+            if name.startswith('distinct_'):
+                self.arrays[name] = _merge_sorted(self.arrays[name], values)
+            elif name.startswith('times_'):
+                position = name[len('times_'):]
+                self.arrays[name], self.arrays[f'time_counts_{position}'] = _merge_weighted(
+                    self.arrays[name], self.arrays[f'time_counts_{position}'],
+                    values, arrays[f'time_counts_{position}']
+                )
+
+    def matches_prefix(self, data):
+        """
+        Check whether the snapshot's rows are an unchanged prefix of data
+
+        Every covered row is hashed and compared through the fingerprint;
+        on a match the digest is kept for extend().
+        """
+        self._prefix_digest = None
+        if self.fingerprint is None or len(data) < self.row_count:
+            return False
+
+        dtypes = {col: str(dtype) for col, dtype in data.dtypes.items()}
+        if dtypes != self.dtypes:
+            return False
+
+        digest = self.row_digest(data.dtypes, self.hash_rows(data.iloc[:self.row_count]))
+        if digest.hexdigest() != self.fingerprint:
+            return False
+        self._prefix_digest = digest
+        return True
+
+    def extend(self, data):
+        """
+        Fold the rows appended after the snapshot into its statistics
+
+        Only data.iloc[row_count:] is profiled. The fingerprint digest left
+        by matches_prefix() is carried forward with the new row hashes, so
+        the covered rows are not hashed a second time.
+
+        Args:
+            data (pandas.DataFrame): Full data whose prefix matches the snapshot
+        """
+        digest = self._prefix_digest
+        if digest is None:
+            digest = self.row_digest(data.dtypes, self.hash_rows(data.iloc[:self.row_count]))
+        new_rows = data.iloc[self.row_count:]
+        hashes = self.hash_rows(new_rows)
+        if len(new_rows):
+            self.add_rows(new_rows, hashes=hashes)
+        digest.update(np.ascontiguousarray(hashes).tobytes())
+
+        self.row_count = len(data)
+        self.fingerprint = digest.hexdigest()
+        self._prefix_digest = None
+
+    def column_array(self, prefix, col):
+        """Stored array of a column, by the column's position"""
+        return self.arrays.get(f'{prefix}_{list(self.dtypes).index(col)}')
+
+    def to_dict(self):
+        """Serializable form of the snapshot, without its arrays"""
+        return {
+            'version': SNAPSHOT_VERSION,
+            'row_count': self.row_count,
+            'fingerprint': self.fingerprint,
+            'dtypes': self.dtypes,
+            'duplicate_rows': self.duplicate_rows,
+            'stats': self.stats
+        }
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load the snapshot stored next to a workbook
+
+        Args:
+            file_path (str): Path to the workbook
+
+        Returns:
+            ProfileSnapshot: Loaded snapshot, or None if missing or unreadable
+        """
+        path = cls.snapshot_path(file_path)
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                payload = json.loads(str(archive['meta']))
+                arrays = {name: archive[name] for name in archive.files if name != 'meta'}
+        except (OSError, ValueError, KeyError):
+            return None
+
+        if payload.get('version') != SNAPSHOT_VERSION:
+            return None
+
+        return cls(
+            row_count=payload['row_count'],
+            fingerprint=payload['fingerprint'],
+            dtypes=payload['dtypes'],
+            stats=payload['stats'],
+            arrays=arrays,
+            duplicate_rows=payload['duplicate_rows']
+        )
+
+    def save(self, file_path):
+        """Write the snapshot next to a workbook, replacing any previous one"""
+        path = self.snapshot_path(file_path)
+        temp_path = path.with_name(path.name + '.tmp')
+
+        try:
+            with open(temp_path, 'wb') as f:
+                np.savez(f, meta=np.array(json.dumps(self.to_dict())), **self.arrays)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error saving profile snapshot: {e}")
@@ -0,0 +1,132 @@
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+class ReaderEngine:
+    """Spreadsheet reader backend used by ExcelHandler"""
+    
+    name = None
+    module = None
+    extensions = ()
+    # What to install when the engine is missing
+    requirement = None
+    
+    def is_available(self):
+        """Check whether the backing package is installed"""
+        return importlib.util.find_spec(self.module) is not None
+        
+    def supports(self, file_path):
+        """Check whether the engine can read a file"""
+        return Path(file_path).suffix.lower() in self.extensions
+        
+    def read(self, file_path, **kwargs):
+        """
+        Read a sheet into a DataFrame
+        
+        Args:
+            file_path (str): Path to the workbook
+            **kwargs: Extra pandas.read_excel arguments (sheet_name, usecols, ...)
+            
+        Returns:
+            pandas.DataFrame: Raw sheet data
+        """
+        return pd.read_excel(file_path, engine=self.name, **kwargs)
+        
+    def sheet_names(self, file_path):
+        """List the sheets in a workbook"""
+        with pd.ExcelFile(file_path, engine=self.name) as excel_file:
+            return excel_file.sheet_names
+
+class CalamineEngine(ReaderEngine):
+    """Rust-based calamine reader, several times faster than openpyxl"""
+    
+    name = 'calamine'
+    module = 'python_calamine'
+    extensions = ('.xlsx', '.xlsm', '.xls', '.xlsb', '.ods')
+    requirement = 'python-calamine (with pandas 2.2 or later)'
+    
+    def is_available(self):
+        # pandas gained engine='calamine' in 2.2
+        major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+        return (major, minor) >= (2, 2) and super().is_available()
+
+class OpenpyxlEngine(ReaderEngine):
+    """Pure-Python openpyxl reader"""
+    
+    name = 'openpyxl'
+    module = 'openpyxl'
+    extensions = ('.xlsx', '.xlsm')
+    requirement = 'openpyxl'
+
+class XlrdEngine(ReaderEngine):
+    """xlrd reader for legacy .xls workbooks"""
+    
+    name = 'xlrd'
+    module = 'xlrd'
+    extensions = ('.xls',)
+    requirement = 'xlrd'
+
+# Engines in order of preference when choosing automatically
+READER_ENGINES = [CalamineEngine(), OpenpyxlEngine(), XlrdEngine()]
+
+def register_engine(engine, preferred=False):
+    """
+    Add a reader engine
+    
+    Args:
+        engine (ReaderEngine): Engine to register
+        preferred (bool): Try it before the built-in engines
+    """
+    if preferred:
+        READER_ENGINES.insert(0, engine)
+    else:
+        READER_ENGINES.append(engine)
+
+def get_engine(name):
+    """Look up a registered engine by name"""
+    for engine in READER_ENGINES:
+        if engine.name == name:
+            return engine
+    raise ValueError(f"Unknown reader engine '{name}'. Available: {[e.name for e in READER_ENGINES]}")
+
+def available_engines(file_path=None):
+    """Names of the installed engines, optionally limited to those that can read a file"""
+    return [
+        engine.name for engine in READER_ENGINES
+        if engine.is_available() and (file_path is None or engine.supports(file_path))
+    ]
+
+def select_engine(file_path, preferred="auto"):
+    """
+    Pick the engine used to read a workbook
+    
+    Args:
+        file_path (str): Path to the workbook
+        preferred (str): Engine name, or "auto" for the fastest installed one.
+            A named engine that cannot read the file's format is skipped
+            with a message; one that is not installed is an error.
+            
+    Returns:
+        ReaderEngine: Engine to use
+        
+    Raises:
+        ImportError: The preferred engine, or every engine for the format,
+            is not installed
+    """
+    if preferred and preferred != "auto":
+        engine = get_engine(preferred)
+        if not engine.is_available():
+            raise ImportError(
+                f"Reader engine '{engine.name}' is not installed; install {engine.requirement or engine.module} "
+                f"or choose another engine. Installed: {available_engines()}"
+            )
+        if engine.supports(file_path):
+            return engine
+        print(f"Reader engine '{engine.name}' cannot read '{Path(file_path).suffix}' files; choosing another")
+        
+    for engine in READER_ENGINES:
+        if engine.supports(file_path) and engine.is_available():
+            return engine
+            
+    raise ImportError(f"No installed reader engine supports '{Path(file_path).suffix}' files")
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from pathlib import Path
+
+# Bump when processing or rendering changes so stale reports stop matching
+GENERATOR_VERSION = 1
+
+# Files in the output directory that pruning manages
+REPORT_PATTERNS = ('*.html', '*.json', '*.msgpack')
+
+class ReportCache:
+    """Reports in the output directory, addressed by their inputs"""
+    
+    def __init__(self, output_dir, template_dir, max_bytes=500 * 1024 * 1024, max_age_days=30):
+        """
+        Args:
+            output_dir (Path): Directory the reports are written to
+            template_dir (Path): Templates whose content is part of every key
+            max_bytes (int): Total size of the reports kept in output_dir
+            max_age_days (float): Reports unused for longer are deleted
+        """
+        self.output_dir = Path(output_dir)
+        self.template_dir = Path(template_dir)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self._template_signature = None
+        
+    def template_signature(self):
+        """Hash of the template files, so template edits invalidate reports"""
+        if self._template_signature is None:
+            digest = hashlib.sha256()
+            for path in sorted(self.template_dir.glob('*.html')):
+                digest.update(path.name.encode('utf-8'))
+                digest.update(path.read_bytes())
+            self._template_signature = digest.hexdigest()
+        return self._template_signature
+        
+    def key(self, content_hash, report_type, include_charts, **options):
+        """
+        Cache key of a report
+        
+        Args:
+            content_hash (str): Content hash of the workbook
+            report_type (str): Type of report
+            include_charts (bool): Whether charts are included
+            **options: Any other setting that changes the output
+            
+        Returns:
+            str: Hex digest identifying the report
+        """
+        inputs = {
+            'content': content_hash,
+            'report_type': report_type,
+            'include_charts': bool(include_charts),
+            'options': options,
+            'version': GENERATOR_VERSION,
+            'templates': self.template_signature()
+        }
+        encoded = json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+        
+    @staticmethod
+    def report_name(key, report_type, extension='.html'):
+        """File name of the cached report for a key"""
+        return f"report_{report_type}_{key[:16]}{extension}"
+        
+    def get(self, key, report_type, output_name=None, extension='.html'):
+        """
+        Existing report for a key
+        
+        Args:
+            key (str): Cache key from key()
+            report_type (str): Type of report
+            output_name (str): Also expose the report under this file name
+            extension (str): File extension of the report
+            
+        Returns:
+            str: Path to the report, or None when it has not been generated
+        """
+        path = self.output_dir / self.report_name(key, report_type, extension)
+        if not path.exists():
+            return None
+            
+        # Mark as recently used so pruning keeps it
+        os.utime(path)
+        return self.link(path, output_name) if output_name else str(path)
+        
+    def put(self, report_path, output_name=None):
+        """
+        Register a freshly rendered report and enforce the directory limits
+        
+        Args:
+            report_path (str): Report written under report_name()
+            output_name (str): Also expose the report under this file name
+            
+        Returns:
+            str: Path the caller should open
+        """
+        output_path = self.link(report_path, output_name) if output_name else report_path
+        self.prune(keep=[report_path, output_path])
+        return str(output_path)
+        
+    def link(self, source, output_name):
+        """Point output_name at an existing report, as a hard link when possible"""
+        target = self.output_dir / output_name
+        if Path(source).resolve() == target.resolve():
+            return str(target)
+            
+        temp_path = target.with_name(target.name + '.tmp')
+        if temp_path.exists():
+            temp_path.unlink()
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            shutil.copy2(source, temp_path)
+        os.replace(temp_path, target)
+        
+        return str(target)
+        
+    def prune(self, keep=()):
+        """
+        Delete reports older than max_age_days, then the least recently used
+        ones until the directory fits in max_bytes
+        
+        Args:
+            keep (list): Report paths that must not be deleted
+            
+        Returns:
+            int: Number of files deleted
+        """
+        keep = {Path(path).resolve() for path in keep}
+        cutoff = time.time() - self.max_age_days * 24 * 3600
+        
+        reports = []
+        links = {}
+        for pattern in REPORT_PATTERNS:
+            for path in self.output_dir.glob(pattern):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                inode = (stat.st_dev, stat.st_ino)
+                links[inode] = links.get(inode, 0) + 1
+                reports.append((stat.st_mtime, stat.st_size, inode, path))
+        reports.sort(key=lambda report: report[:2])
+        
+        # Output names are hard links to cached reports; count each file once
+        sizes = {inode: size for _, size, inode, _ in reports}
+        total = sum(sizes.values())
+        deleted = 0
+        for mtime, size, inode, path in reports:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            if path.resolve() in keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            deleted += 1
+            # Space is only freed with the last link to the file
+            links[inode] -= 1
+            if not links[inode]:
+                total -= size
+            
+        return deleted
@@ -0,0 +1,265 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    source_file TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    content_hash TEXT,
+    report_type TEXT NOT NULL,
+    output_format TEXT NOT NULL,
+    include_charts INTEGER NOT NULL,
+    options TEXT NOT NULL,
+    total_rows INTEGER,
+    total_columns INTEGER,
+    missing_cells INTEGER,
+    completeness REAL,
+    duplicate_rows INTEGER,
+    quality_score REAL,
+    memory_usage INTEGER,
+    load_seconds REAL,
+    analysis_seconds REAL,
+    render_seconds REAL,
+    report_path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_source ON reports (source_file, report_type, created_at);
+CREATE INDEX IF NOT EXISTS reports_hash ON reports (content_hash);
+"""
+
+# Catalog file inside a report output directory
+CATALOG_NAME = "catalog.db"
+
+# Headline metrics stored per report, in display order
+METRICS = (
+    'total_rows', 'total_columns', 'missing_cells', 'completeness',
+    'duplicate_rows', 'quality_score', 'memory_usage'
+)
+
+def _find_data_quality(processed_data):
+    """The data quality block of a summary profile, if it has one"""
+    for section in processed_data.get('sections', []):
+        content = section.get('content')
+        if isinstance(content, dict) and isinstance(content.get('data_quality'), dict):
+            return content['data_quality']
+    return {}
+
+def headline_metrics(processed_data):
+    """
+    Headline statistics of a profile
+    
+    Args:
+        processed_data (dict): Profile, as built by DataProcessor
+        
+    Returns:
+        dict: Value per name in METRICS; None when the profile lacks it
+    """
+    rows = processed_data.get('total_rows')
+    columns = processed_data.get('total_columns')
+    missing_values = processed_data.get('missing_values')
+    missing_cells = int(sum(missing_values.values())) if isinstance(missing_values, dict) else None
+    
+    completeness = None
+    if missing_cells is not None and rows and columns:
+        completeness = round((1 - missing_cells / (rows * columns)) * 100, 2)
+        
+    quality = _find_data_quality(processed_data)
+    memory_usage = processed_data.get('memory_usage')
+    return {
+        'total_rows': int(rows) if rows is not None else None,
+        'total_columns': int(columns) if columns is not None else None,
+        'missing_cells': missing_cells,
+        'completeness': completeness,
+        'duplicate_rows': quality.get('duplicate_rows'),
+        'quality_score': quality.get('quality_score'),
+        'memory_usage': int(memory_usage) if memory_usage is not None else None
+    }
+
+class ReportCatalog:
+    """
+    Index of generated reports in a local SQLite database
+    
+    One row per report with its source, content hash, options, headline
+    statistics and timings, so earlier reports can be listed and their
+    metrics compared without reading any workbook or HTML file.
+    """
+    
+    def __init__(self, db_path, timeout=10.0):
+        """
+        Args:
+            db_path (str): Catalog database; created when missing
+            timeout (float): Seconds to wait while another process writes
+        """
+        self.db_path = str(db_path)
+        self._connection = sqlite3.connect(self.db_path, timeout=timeout, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        # The GUI reads the catalog while report threads write to it
+        self._lock = threading.Lock()
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+            
+    def close(self):
+        self._connection.close()
+        
+    def record(self, report_path, processed_data, report_type, output_format="html",
+               include_charts=True, source_file="", content_hash=None, options=None,
+               timings=None):
+        """
+        Add a generated report
+        
+        Args:
+            report_path (str): Path of the written report
+            processed_data (dict): Profile the report was rendered from
+            report_type (str): Type of report
+            output_format (str): 'html', 'json' or 'msgpack'
+            include_charts (bool): Whether charts were included
+            source_file (str): Path or name of the workbook
+            content_hash (str): Content hash of the workbook
+            options (dict): Other settings the report was built with
+            timings (dict): Seconds spent per stage: 'load', 'analysis', 'render'
+            
+        Returns:
+            int: Catalog id of the report
+        """
+        metrics = headline_metrics(processed_data)
+        timings = timings or {}
+        source_file = str(source_file)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                f"""INSERT INTO reports (created_at, source_file, source_name, content_hash,
+                    report_type, output_format, include_charts, options, {', '.join(METRICS)},
+                    load_seconds, analysis_seconds, render_seconds, report_path)
+                    VALUES ({', '.join('?' * (len(METRICS) + 12))})""",
+                (time.time(), source_file, os.path.basename(source_file), content_hash,
+                 report_type, output_format, int(include_charts),
+                 json.dumps(options or {}, sort_keys=True, default=str),
+                 *(metrics[name] for name in METRICS),
+                 timings.get('load'), timings.get('analysis'), timings.get('render'),
+                 str(Path(report_path).resolve()))
+            )
+        return cursor.lastrowid
+        
+    def record_reuse(self, report_path, report_type, output_format="html", include_charts=True,
+                     source_file="", content_hash=None, options=None):
+        """
+        Add a report that was served again from the report cache
+        
+        Headline metrics come from the latest entry of the same report
+        file; timings are zero as nothing was loaded or rendered. Without
+        an earlier entry the metrics are left empty.
+        
+        Args:
+            report_path (str): Path of the reused report
+            report_type (str): Type of report
+            output_format (str): 'html', 'json' or 'msgpack'
+            include_charts (bool): Whether charts were included
+            source_file (str): Path or name of the workbook
+            content_hash (str): Content hash of the workbook
+            options (dict): Other settings the report was requested with
+            
+        Returns:
+            int: Catalog id of the entry
+        """
+        report_path = str(Path(report_path).resolve())
+        source_file = str(source_file)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                f"""INSERT INTO reports (created_at, source_file, source_name, content_hash,
+                    report_type, output_format, include_charts, options, {', '.join(METRICS)},
+                    load_seconds, analysis_seconds, render_seconds, report_path)
+                    SELECT ?, ?, ?, ?, ?, ?, ?, ?, {', '.join(METRICS)}, 0, 0, 0, report_path
+                    FROM reports WHERE report_path = ? ORDER BY id DESC LIMIT 1""",
+                (time.time(), source_file, os.path.basename(source_file), content_hash,
+                 report_type, output_format, int(include_charts),
+                 json.dumps(options or {}, sort_keys=True, default=str), report_path)
+            )
+        if cursor.rowcount:
+            return cursor.lastrowid
+        return self.record(
+            report_path, {}, report_type, output_format=output_format, include_charts=include_charts,
+            source_file=source_file, content_hash=content_hash, options=options,
+            timings={'load': 0.0, 'analysis': 0.0, 'render': 0.0}
+        )
+        
+    def get(self, report_id):
+        """One catalogued report, or None"""
+        rows = self._query("SELECT * FROM reports WHERE id = ?", (report_id,))
+        return rows[0] if rows else None
+        
+    def find(self, source=None, report_type=None, content_hash=None, limit=50):
+        """
+        Catalogued reports, newest first
+        
+        Args:
+            source (str): Workbook path, or a part of its file name
+            report_type (str): Only reports of this type
+            content_hash (str): Only reports of exactly this workbook content
+            limit (int): Maximum number of reports
+            
+        Returns:
+            list: Reports as dicts; 'exists' tells whether the file is still there
+        """
+        conditions, params = [], []
+        if source:
+            conditions.append("(source_file = ? OR source_name LIKE ?)")
+            params += [str(Path(source).resolve()) if os.path.exists(source) else source, f"%{source}%"]
+        if report_type:
+            conditions.append("report_type = ?")
+            params.append(report_type)
+        if content_hash:
+            conditions.append("content_hash = ?")
+            params.append(content_hash)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        return self._query(
+            f"SELECT * FROM reports {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit)
+        )
+        
+    def previous(self, report_id):
+        """The report of the same workbook and type generated just before another one"""
+        rows = self._query(
+            """SELECT earlier.* FROM reports AS earlier JOIN reports AS later
+               ON earlier.source_file = later.source_file AND earlier.report_type = later.report_type
+               WHERE later.id = ? AND earlier.id < later.id
+               ORDER BY earlier.id DESC LIMIT 1""",
+            (report_id,)
+        )
+        return rows[0] if rows else None
+        
+    def compare(self, old_id, new_id):
+        """
+        Headline metrics of two catalogued reports side by side
+        
+        Returns:
+            dict: {'old': report, 'new': report, 'metrics': {name: {'old', 'new', 'delta'}}}
+        """
+        old, new = self.get(old_id), self.get(new_id)
+        if old is None or new is None:
+            raise ValueError(f"No catalogued report with id {old_id if old is None else new_id}")
+            
+        metrics = {}
+        for name in METRICS:
+            delta = None
+            if old[name] is not None and new[name] is not None:
+                delta = new[name] - old[name]
+            metrics[name] = {'old': old[name], 'new': new[name], 'delta': delta}
+        return {'old': old, 'new': new, 'metrics': metrics}
+        
+    def _query(self, sql, params):
+        """Reports matching a query, as dicts"""
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+            
+        reports = []
+        for row in rows:
+            report = dict(row)
+            report['options'] = json.loads(report['options'])
+            report['exists'] = os.path.exists(report['report_path'])
+            reports.append(report)
+        return reports
@@ -1,5 +1,10 @@
 import os
 import json
+import time
+import uuid
+import sqlite3
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 import base64
@@ -10,29 +15,65 @@ import seaborn as sns
 import pandas as pd
 from jinja2 import Environment, FileSystemLoader, Template
 
+from core.histogram import sparkline_svg
+from core.report_cache import ReportCache
+from core.report_catalog import ReportCatalog, CATALOG_NAME
+from core.stats_export import EXPORT_FORMATS, EXPORT_VERSION, serialize
+
 class ReportGenerator:
     """Generates HTML reports from processed data"""
     
-    def __init__(self):
+    def __init__(self, output_dir="reports"):
+        """
+        Args:
+            output_dir (str): Directory reports are written to
+        """
         self.template_dir = Path(__file__).parent.parent / "templates"
-        self.output_dir = Path("reports")
-        self.output_dir.mkdir(exist_ok=True)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Rendered charts keyed by their inputs, reused across regenerations
+        self.chart_cache_size = 32
+        self._chart_cache = OrderedDict()
         
         # Create template if it doesn't exist
         if not (self.template_dir / "report_template.html").exists():
             self.create_simple_template()
+            
+        # Finished reports keyed by their inputs; also limits the folder size
+        self.report_cache = ReportCache(self.output_dir, self.template_dir)
         
+        # History of every generated report, searchable without opening any
+        try:
+            self.catalog = ReportCatalog(self.output_dir / CATALOG_NAME)
+        except sqlite3.Error as e:
+            print(f"Report catalog unavailable: {e}")
+            self.catalog = None
+            
         # Set up Jinja2 environment
         self.env = Environment(
             loader=FileSystemLoader(str(self.template_dir)),
             autoescape=True
         )
+        # Distributions as inline SVG; no matplotlib figure per column
+        self.env.filters['sparkline'] = sparkline_svg
         
         # Configure matplotlib for better charts
         plt.style.use('default')
         
+    def warm_up(self):
+        """Compile the templates and load matplotlib's fonts before the first report"""
+        for name in ('report_template.html', 'diff_template.html'):
+            self.env.get_template(name)
+            
+        fig, ax = plt.subplots(figsize=(2, 1))
+        ax.bar(['a', 'b'], [1, 2])
+        ax.set_title('Warm-up', fontweight='bold')
+        self.fig_to_base64(fig)
+        
     def generate_html_report(self, processed_data, report_type="summary", 
-                           include_charts=True, source_file=""):
+                           include_charts=True, source_file="", output_name=None,
+                           auto_refresh=None, run_info=None):
         """
         Generate HTML report from processed data
         
@@ -41,10 +82,17 @@ class ReportGenerator:
             report_type (str): Type of report
             include_charts (bool): Whether to include charts
             source_file (str): Name of source Excel file
+            output_name (str): Fixed file name to overwrite instead of a
+                timestamped one
+            auto_refresh (int): Seconds after which the opened report reloads
+            run_info (dict): Source path, content hash, options and load and
+                analysis timings to record in the report catalog
             
         Returns:
             str: Path to generated HTML file
         """
+        started = time.perf_counter()
+        
         # Generate charts if requested
         charts = {}
         if include_charts:
@@ -58,7 +106,8 @@ class ReportGenerator:
             'source_file': source_file,
             'data': processed_data,
             'charts': charts,
-            'include_charts': include_charts
+            'include_charts': include_charts,
+            'auto_refresh': auto_refresh
         }
         
         # Load and render template
@@ -66,12 +115,145 @@ class ReportGenerator:
         html_content = template.render(context)
         
         # Save to file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"report_{report_type}_{timestamp}.html"
+        if output_name:
+            filename = output_name
+        else:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"report_{report_type}_{timestamp}.html"
+            
+        report_path = self.write_report(html_content, filename)
+        self.catalog_report(report_path, processed_data, report_type, "html", include_charts,
+                            source_file, run_info, time.perf_counter() - started)
+        return report_path
+        
+    def generate_stats_export(self, processed_data, export_format="json", report_type="summary",
+                              source_file="", output_name=None, run_info=None):
+        """
+        Write the full profile for monitoring and BI tools instead of HTML
+        
+        Args:
+            processed_data (dict): Processed data from DataProcessor
+            export_format (str): 'json' or 'msgpack'
+            report_type (str): Type of report the profile was built for
+            source_file (str): Name of source Excel file
+            output_name (str): Fixed file name instead of a timestamped one
+            run_info (dict): Details to record in the report catalog, as for
+                generate_html_report
+            
+        Returns:
+            str: Path to the exported file
+        """
+        started = time.perf_counter()
+        document = {
+            'export_version': EXPORT_VERSION,
+            'report_type': report_type,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'source_file': source_file,
+            'profile': processed_data
+        }
+        content = serialize(document, export_format)
+        
+        if output_name:
+            filename = output_name
+        else:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"stats_{report_type}_{timestamp}{EXPORT_FORMATS[export_format]}"
+            
+        report_path = self.write_report(content, filename)
+        self.catalog_report(report_path, processed_data, report_type, export_format, False,
+                            source_file, run_info, time.perf_counter() - started)
+        return report_path
+        
+    def catalog_report(self, report_path, processed_data, report_type, output_format,
+                       include_charts, source_file, run_info, render_seconds):
+        """Record a written report in the catalog; a failure never loses the report"""
+        if self.catalog is None:
+            return
+            
+        run_info = run_info or {}
+        timings = dict(run_info.get('timings', {}), render=render_seconds)
+        try:
+            self.catalog.record(
+                report_path,
+                processed_data,
+                report_type,
+                output_format=output_format,
+                include_charts=include_charts,
+                source_file=run_info.get('source_path') or source_file,
+                content_hash=run_info.get('content_hash'),
+                options=run_info.get('options'),
+                timings=timings
+            )
+        except sqlite3.Error as e:
+            print(f"Could not record report in catalog: {e}")
+        
+    def catalog_cached_report(self, report_name, report_type, output_format, include_charts,
+                              source_file, content_hash, options=None):
+        """
+        Record a report served from the report cache
+        
+        The headline metrics are copied from the catalog entry of the run
+        that rendered the report; nothing is loaded or rendered again.
+        """
+        if self.catalog is None:
+            return
+            
+        try:
+            self.catalog.record_reuse(
+                self.output_dir / report_name,
+                report_type,
+                output_format=output_format,
+                include_charts=include_charts,
+                source_file=os.path.abspath(source_file),
+                content_hash=content_hash,
+                options=dict(options or {}, cache_hit=True)
+            )
+        except sqlite3.Error as e:
+            print(f"Could not record report in catalog: {e}")
+            
+    def generate_diff_report(self, diff, old_file="", new_file="", output_name=None):
+        """
+        Generate HTML report comparing two workbook versions
+        
+        Args:
+            diff (dict): Result of WorkbookDiff.compare
+            old_file (str): Name of the earlier workbook
+            new_file (str): Name of the later workbook
+            output_name (str): Fixed file name instead of a timestamped one
+            
+        Returns:
+            str: Path to generated HTML file
+        """
+        context = {
+            'title': diff.get('title', 'Workbook Comparison Report'),
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'old_file': old_file,
+            'new_file': new_file,
+            'diff': diff
+        }
+        
+        template = self.env.get_template('diff_template.html')
+        html_content = template.render(context)
+        
+        if not output_name:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_name = f"report_diff_{timestamp}.html"
+            
+        return self.write_report(html_content, output_name)
+        
+    def write_report(self, content, filename):
+        """Save rendered HTML or an encoded export in the output directory and return its path"""
         output_path = self.output_dir / filename
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Write through a temp file so an open browser never sees a partial report;
+        # the name is unique so queue workers repeating a job never share one
+        temp_path = output_path.with_name(f"{output_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        if isinstance(content, bytes):
+            temp_path.write_bytes(content)
+        else:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        os.replace(temp_path, output_path)
             
         return str(output_path)
         
@@ -82,21 +264,38 @@ class ReportGenerator:
         try:
             # Chart 1: Data completeness
             if 'missing_values' in processed_data:
-                charts['completeness'] = self.create_completeness_chart(processed_data)
+                charts['completeness'] = self.cached_chart(
+                    'completeness',
+                    (processed_data['missing_values'], processed_data.get('total_rows')),
+                    lambda: self.create_completeness_chart(processed_data)
+                )
                 
             # Chart 2: Data types distribution
             if 'data_types' in processed_data:
-                charts['data_types'] = self.create_data_types_chart(processed_data)
+                charts['data_types'] = self.cached_chart(
+                    'data_types',
+                    processed_data['data_types'],
+                    lambda: self.create_data_types_chart(processed_data)
+                )
                 
             # Chart 3: Numeric distributions
             if 'numeric_stats' in processed_data and processed_data['numeric_stats']:
-                charts['numeric_distributions'] = self.create_numeric_charts(processed_data)
+                charts['numeric_distributions'] = self.cached_chart(
+                    'numeric_distributions',
+                    processed_data['numeric_stats'],
+                    lambda: self.create_numeric_charts(processed_data)
+                )
                 
             # Chart 4: Top values for categorical columns
             if 'sections' in processed_data:
                 for section in processed_data['sections']:
                     if section['title'] == 'Data Overview' and 'top_values' in section['content']:
-                        charts['top_values'] = self.create_top_values_chart(section['content']['top_values'])
+                        top_values = section['content']['top_values']
+                        charts['top_values'] = self.cached_chart(
+                            'top_values',
+                            top_values,
+                            lambda: self.create_top_values_chart(top_values)
+                        )
                         break
                         
         except Exception as e:
@@ -104,6 +303,32 @@ class ReportGenerator:
             
         return charts
         
+    def cached_chart(self, name, inputs, build):
+        """
+        Return a chart from the cache, building it only when its inputs changed
+        
+        Args:
+            name (str): Chart name
+            inputs: Data the chart is drawn from
+            build (callable): Builds the chart image
+            
+        Returns:
+            str: Base64 chart image
+        """
+        key = (name, hashlib.sha1(repr(inputs).encode('utf-8')).hexdigest())
+        
+        if key in self._chart_cache:
+            self._chart_cache.move_to_end(key)
+            return self._chart_cache[key]
+            
+        chart = build()
+        if chart is not None:
+            self._chart_cache[key] = chart
+            while len(self._chart_cache) > self.chart_cache_size:
+                self._chart_cache.popitem(last=False)
+                
+        return chart
+        
     def create_completeness_chart(self, data):
         """Create data completeness chart"""
         try:
@@ -0,0 +1,484 @@
+import os
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from core.excel_handler import ExcelHandler
+from core.data_processor import DataProcessor, REPORT_TYPES
+from core.report_generator import ReportGenerator
+from core.load_planner import LoadPlanner
+from core.stats_export import EXPORT_FORMATS
+from utils.helpers import safe_filename, file_content_hash
+
+class ReportPipeline:
+    """Runs loading, analysis and rendering of one workbook into a report"""
+    
+    def __init__(self, excel_handler=None, data_processor=None, report_generator=None,
+                 load_planner=None):
+        self.excel_handler = excel_handler or ExcelHandler()
+        self.data_processor = data_processor or DataProcessor()
+        self.report_generator = report_generator or ReportGenerator()
+        self.load_planner = load_planner or LoadPlanner(self.excel_handler)
+        
+    def run(self, file_path, report_type="summary", include_charts=True,
+            content_hash=None, incremental=False, output_name=None, auto_refresh=None,
+            out_of_core=False, sample_size=None, use_cache=True, auto_plan=True,
+            progress=None, output_format="html", columns=None, rows=None, cache_only=False):
+        """
+        Generate a report for a workbook
+        
+        Args:
+            file_path (str): Path to the workbook
+            report_type (str): Type of report to generate
+            include_charts (bool): Whether to include charts
+            content_hash (str): Known content hash, used to reuse parsed data
+            incremental (bool): Whether to use the workbook's profile snapshot
+            output_name (str): Fixed report file name
+            auto_refresh (int): Seconds after which the opened report reloads
+            out_of_core (bool): Profile memory-mapped columns instead of a
+                DataFrame; always produces a summary report
+            sample_size (int): Build a fast report from a reservoir sample
+                of this many rows
+            use_cache (bool): Return the existing report when the workbook
+                and options are unchanged
+            auto_plan (bool): Unless out_of_core or sample_size is given, let
+                the load planner pick the strategy that fits the memory budget
+            progress (callable): Called with the fraction of the work done
+            output_format (str): 'html' for a report, or 'json' / 'msgpack'
+                to export the statistics for other tools
+            columns (list): Only read and report these columns
+            rows (tuple): Only read data rows start to stop, counted from 0
+                with stop excluded (see ExcelHandler.load_file)
+            cache_only (bool): Only look the report up in the cache
+                
+        Returns:
+            str: Path to generated HTML or export file; None when
+                cache_only is set and the report is not cached
+        """
+        extension = self.output_extension(output_format)
+        if output_format != "html":
+            include_charts = False
+        selection = self.selection(columns, rows)
+        if selection:
+            # Profile snapshots describe the whole workbook
+            incremental = False
+            
+        report_cache = self.report_generator.report_cache
+        content_hash = content_hash or file_content_hash(file_path)
+        
+        # The planned strategy is part of the cache key, so plan first
+        started = time.perf_counter()
+        plan = None
+        if auto_plan and not out_of_core and not sample_size:
+            plan = self.load_planner.plan(file_path, report_type, columns=columns, rows=rows)
+            
+        cache_key = None
+        if use_cache:
+            cache_key = self.cache_key(
+                file_path, content_hash, report_type, include_charts, output_format,
+                incremental=incremental, out_of_core=out_of_core,
+                sample_size=sample_size, auto_refresh=auto_refresh,
+                load_strategy=plan.strategy if plan else None, selection=selection
+            )
+            cached_path = report_cache.get(cache_key, report_type, output_name, extension)
+            if cached_path:
+                self.report_generator.catalog_cached_report(
+                    report_cache.report_name(cache_key, report_type, extension), report_type,
+                    output_format, include_charts, file_path, content_hash,
+                    options=dict(
+                        incremental=incremental, out_of_core=out_of_core, sample_size=sample_size,
+                        auto_refresh=auto_refresh, selection=selection
+                    )
+                )
+                return cached_path
+        if cache_only:
+            return None
+            
+        if plan is not None and plan.strategy == 'sampled':
+            sample_size = self.load_planner.sample_size
+        elif plan is not None and plan.strategy == 'out_of_core':
+            out_of_core = True
+        if progress:
+            progress(0.2)
+                
+        if sample_size:
+            sample, total_rows = self.excel_handler.load_sample(
+                file_path, sample_size, columns=columns, rows=rows
+            )
+            loaded = time.perf_counter()
+            processed_data = self.data_processor.process_sample(
+                sample, total_rows, report_type=report_type
+            )
+        elif out_of_core:
+            store = self.excel_handler.load_out_of_core(file_path, columns=columns, rows=rows)
+            loaded = time.perf_counter()
+            try:
+                processed_data = self.data_processor.process_column_store(store)
+            finally:
+                store.cleanup()
+            report_type = processed_data['report_type']
+        else:
+            data = self.excel_handler.load_cached(
+                file_path, content_hash, chunked=plan is not None and plan.strategy == 'chunked',
+                columns=columns, rows=rows
+            )
+            loaded = time.perf_counter()
+            processed_data = self.data_processor.process_data(
+                data,
+                report_type=report_type,
+                source_file=file_path if incremental else None
+            )
+            
+        if plan is not None:
+            processed_data['load_plan'] = plan.to_dict()
+        if selection:
+            processed_data['selection'] = selection
+        if progress:
+            progress(0.6)
+            
+        run_info = self.run_info(
+            file_path, content_hash, started, loaded,
+            incremental=incremental, out_of_core=out_of_core, sample_size=sample_size,
+            auto_refresh=auto_refresh, load_strategy=plan.strategy if plan else None,
+            selection=selection
+        )
+        
+        if cache_key:
+            report_name = report_cache.report_name(cache_key, report_type, extension)
+        else:
+            report_name = output_name
+            
+        report_path = self.write_output(
+            processed_data, report_type, file_path, include_charts,
+            output_format, report_name, auto_refresh, run_info
+        )
+        
+        if progress:
+            progress(0.9)
+            
+        if cache_key:
+            return report_cache.put(report_path, output_name)
+        return report_path
+        
+    def run_all(self, file_path, report_types=REPORT_TYPES, include_charts=True,
+                content_hash=None, incremental=False, output_names=None, auto_refresh=None,
+                use_cache=True, progress=None, output_format="html", columns=None, rows=None,
+                cache_only=False):
+        """
+        Generate several report types from one load and one profile
+        
+        The workbook is parsed once, DataProcessor.process_all shares its
+        statistics between the types, and charts drawn from the same
+        statistics come from the generator's chart cache after the first
+        report. Reports match the ones run() builds and share its cache.
+        
+        Args:
+            file_path (str): Path to the workbook
+            report_types (list): Types of report to generate
+            include_charts (bool): Whether to include charts
+            content_hash (str): Known content hash, used to reuse parsed data
+            incremental (bool): Whether to use the workbook's profile snapshot
+            output_names (dict): Fixed report file name per report type
+            auto_refresh (int): Seconds after which the opened reports reload
+            use_cache (bool): Reuse existing reports for unchanged workbooks
+            progress (callable): Called with the fraction of the work done
+            output_format (str): 'html', 'json' or 'msgpack'
+            columns (list): Only read and report these columns
+            rows (tuple): Only read data rows start to stop, as in run()
+            cache_only (bool): Only look the reports up in the cache
+            
+        Returns:
+            dict: Path to the generated file per report type; with
+                cache_only, only the types that are cached
+        """
+        report_types = list(dict.fromkeys(report_types))
+        output_names = output_names or {}
+        extension = self.output_extension(output_format)
+        if output_format != "html":
+            include_charts = False
+        selection = self.selection(columns, rows)
+        if selection:
+            incremental = False
+            
+        report_cache = self.report_generator.report_cache
+        content_hash = content_hash or file_content_hash(file_path)
+        started = time.perf_counter()
+        plan = self.load_planner.plan(file_path, "detailed", columns=columns, rows=rows)
+        report_paths = {}
+        cache_keys = {}
+        if use_cache:
+            for report_type in report_types:
+                # Only a too-large summary report plans differently from a detailed one
+                strategy = plan.strategy
+                if report_type == "summary" and strategy == 'sampled':
+                    strategy = self.load_planner.plan(
+                        file_path, report_type, columns=columns, rows=rows
+                    ).strategy
+                cache_keys[report_type] = self.cache_key(
+                    file_path, content_hash, report_type, include_charts, output_format,
+                    incremental=incremental, auto_refresh=auto_refresh,
+                    load_strategy=strategy, selection=selection
+                )
+                cached_path = report_cache.get(
+                    cache_keys[report_type], report_type, output_names.get(report_type), extension
+                )
+                if cached_path:
+                    self.report_generator.catalog_cached_report(
+                        report_cache.report_name(cache_keys[report_type], report_type, extension),
+                        report_type, output_format, include_charts, file_path, content_hash,
+                        options=dict(incremental=incremental, auto_refresh=auto_refresh, selection=selection)
+                    )
+                    report_paths[report_type] = cached_path
+                    
+        if cache_only:
+            return report_paths
+            
+        pending = [report_type for report_type in report_types if report_type not in report_paths]
+        if len(pending) <= 1 or plan.strategy in ('out_of_core', 'sampled'):
+            # Nothing to share, or too large for one in-memory profile:
+            # each type gets its own run and load strategy
+            for report_type in pending:
+                report_paths[report_type] = self.run(
+                    file_path, report_type, include_charts,
+                    content_hash=content_hash, incremental=incremental,
+                    output_name=output_names.get(report_type), auto_refresh=auto_refresh,
+                    use_cache=use_cache, output_format=output_format,
+                    columns=columns, rows=rows
+                )
+            if progress:
+                progress(0.9)
+            return report_paths
+            
+        if progress:
+            progress(0.2)
+        data = self.excel_handler.load_cached(
+            file_path, content_hash, chunked=plan.strategy == 'chunked', columns=columns, rows=rows
+        )
+        loaded = time.perf_counter()
+        profiles = self.data_processor.process_all(
+            data, pending, source_file=file_path if incremental else None
+        )
+        if progress:
+            progress(0.6)
+            
+        # Load and analysis are shared, so every report records the same timings
+        run_info = self.run_info(
+            file_path, content_hash, started, loaded,
+            incremental=incremental, auto_refresh=auto_refresh,
+            load_strategy=plan.strategy, shared_with=pending, selection=selection
+        )
+        for done, report_type in enumerate(pending, 1):
+            processed_data = profiles[report_type]
+            processed_data['load_plan'] = plan.to_dict()
+            if selection:
+                processed_data['selection'] = selection
+            output_name = output_names.get(report_type)
+            
+            if use_cache:
+                report_name = report_cache.report_name(cache_keys[report_type], report_type, extension)
+            else:
+                report_name = output_name
+            report_path = self.write_output(
+                processed_data, report_type, file_path, include_charts,
+                output_format, report_name, auto_refresh, run_info
+            )
+            report_paths[report_type] = report_cache.put(report_path, output_name) if use_cache else report_path
+            
+            if progress:
+                progress(0.6 + 0.3 * done / len(pending))
+                
+        return report_paths
+        
+    @staticmethod
+    def output_extension(output_format):
+        """File extension of an output format"""
+        if output_format == "html":
+            return '.html'
+        if output_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        return EXPORT_FORMATS[output_format]
+        
+    def cache_key(self, file_path, content_hash, report_type, include_charts, output_format="html",
+                  incremental=False, out_of_core=False, sample_size=None, auto_refresh=None,
+                  load_strategy=None, selection=None):
+        """
+        Report cache key of one report, shared by run and run_all
+        
+        The workbook's file name is part of the key because the report
+        shows it; copies with the same content get their own reports. The
+        planner's chosen strategy is keyed rather than its memory budget,
+        which follows the free memory and would change on every run. The
+        handler's reader options are keyed too, since they change the
+        loaded types.
+        """
+        return self.report_generator.report_cache.key(
+            content_hash, report_type, include_charts, output_format=output_format,
+            source_name=os.path.basename(file_path),
+            incremental=incremental, out_of_core=out_of_core,
+            sample_size=sample_size, auto_refresh=auto_refresh,
+            load_strategy=load_strategy,
+            reader=self.excel_handler.reader_options(file_path),
+            selection=selection
+        )
+        
+    def selection(self, columns=None, rows=None):
+        """
+        Column and row selection as report metadata
+        
+        Returns:
+            dict: {'columns': list or None, 'rows': [start, stop] or None},
+                or None when the whole sheet is read
+        """
+        if columns is None and rows is None:
+            return None
+        start, stop = self.excel_handler.row_range(rows)
+        return {
+            'columns': list(columns) if columns is not None else None,
+            'rows': [start, stop] if start or stop is not None else None
+        }
+        
+    @staticmethod
+    def run_info(file_path, content_hash, started, loaded, **options):
+        """
+        Catalog details of a report whose data was loaded and analyzed
+        
+        Args:
+            file_path (str): Path to the workbook
+            content_hash (str): Content hash of the workbook
+            started (float): perf_counter() before loading
+            loaded (float): perf_counter() after loading; analysis ends now
+            **options: Settings the report was built with
+        """
+        return {
+            'source_path': os.path.abspath(file_path),
+            'content_hash': content_hash,
+            'options': options,
+            'timings': {'load': loaded - started, 'analysis': time.perf_counter() - loaded}
+        }
+        
+    def write_output(self, processed_data, report_type, file_path, include_charts=True,
+                     output_format="html", output_name=None, auto_refresh=None, run_info=None):
+        """Render processed data as an HTML report or a statistics export"""
+        if output_format == "html":
+            return self.report_generator.generate_html_report(
+                processed_data,
+                report_type=report_type,
+                include_charts=include_charts,
+                source_file=os.path.basename(file_path),
+                output_name=output_name,
+                auto_refresh=auto_refresh,
+                run_info=run_info
+            )
+        return self.report_generator.generate_stats_export(
+            processed_data,
+            export_format=output_format,
+            report_type=report_type,
+            source_file=os.path.basename(file_path),
+            output_name=output_name,
+            run_info=run_info
+        )
+        
+    def compare(self, old_file, new_file, key_columns=None, output_name=None, progress=None):
+        """
+        Generate a report of what changed between two versions of a workbook
+        
+        Args:
+            old_file (str): Path to the earlier workbook
+            new_file (str): Path to the later workbook
+            key_columns (list): Columns identifying a row; rows are matched
+                on their full content when omitted
+            output_name (str): Fixed report file name
+            progress (callable): Called with the fraction of the work done
+            
+        Returns:
+            str: Path to generated HTML file
+        """
+        from core.workbook_diff import WorkbookDiff
+        
+        report_cache = self.report_generator.report_cache
+        old_hash = file_content_hash(old_file)
+        new_hash = file_content_hash(new_file)
+        cache_key = report_cache.key(
+            new_hash, 'diff', False, old_content=old_hash, key_columns=key_columns or [],
+            old_name=os.path.basename(old_file), new_name=os.path.basename(new_file)
+        )
+        cached_path = report_cache.get(cache_key, 'diff', output_name)
+        if cached_path:
+            return cached_path
+            
+        old_data = self.excel_handler.load_cached(old_file, old_hash)
+        new_data = self.excel_handler.load_cached(new_file, new_hash)
+        if progress:
+            progress(0.5)
+        diff = WorkbookDiff(old_data, new_data, key_columns, self.data_processor).compare()
+        if progress:
+            progress(0.8)
+        
+        report_path = self.report_generator.generate_diff_report(
+            diff,
+            old_file=os.path.basename(old_file),
+            new_file=os.path.basename(new_file),
+            output_name=report_cache.report_name(cache_key, 'diff')
+        )
+        return report_cache.put(report_path, output_name)
+        
+    @staticmethod
+    def live_report_name(file_path, report_type, extension='.html'):
+        """Stable report file name that watch mode overwrites on every refresh"""
+        stem = safe_filename(Path(file_path).stem)
+        return f"report_{report_type}_{stem}_live{extension}"
+        
+    def watch(self, paths, report_type="summary", include_charts=True,
+              poll_interval=1.0, debounce=2.0, auto_refresh=5, on_report=None,
+              output_format="html", lock=None):
+        """
+        Create a watcher that regenerates live reports when workbooks change
+        
+        Args:
+            paths (list): Workbook files or directories to watch
+            report_type (str): Type of report to generate, or "all" for
+                every type from one load
+            include_charts (bool): Whether to include charts
+            poll_interval (float): Seconds between polls
+            debounce (float): Seconds a file must stay unchanged before it is read
+            auto_refresh (int): Seconds after which the opened report reloads
+            on_report (callable): Called as on_report(file_path, report_path)
+            output_format (str): 'html', or 'json' / 'msgpack' to keep a live
+                statistics export up to date instead
+            lock (threading.Lock): Held while a report is regenerated, when
+                the loader and generator are shared with other threads
+            
+        Returns:
+            WorkbookWatcher: Watcher, not yet started
+        """
+        from core.workbook_watcher import WorkbookWatcher
+        
+        report_types = REPORT_TYPES if report_type == "all" else [report_type]
+        extension = self.output_extension(output_format)
+        
+        def regenerate(file_path, content_hash=None):
+            with lock or nullcontext():
+                report_paths = self.run_all(
+                    file_path,
+                    report_types,
+                    include_charts=include_charts,
+                    content_hash=content_hash,
+                    output_names={
+                        live_type: self.live_report_name(file_path, live_type, extension)
+                        for live_type in report_types
+                    },
+                    auto_refresh=auto_refresh if output_format == "html" else None,
+                    output_format=output_format
+                )
+            if on_report:
+                for report_path in report_paths.values():
+                    on_report(file_path, report_path)
+                
+        watcher = WorkbookWatcher(
+            paths,
+            regenerate,
+            supported_formats=self.excel_handler.supported_formats,
+            poll_interval=poll_interval,
+            debounce=debounce
+        )
+        return watcher
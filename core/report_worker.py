@@ -0,0 +1,195 @@
+import queue
+import itertools
+import threading
+import multiprocessing
+
+def _serve(jobs, results, memory_budget):
+    """
+    Worker process loop: import the analysis stack once, then run jobs
+    
+    Args:
+        jobs (multiprocessing.Queue): (job_id, method, args, kwargs) tuples
+            naming a ReportPipeline method, or 'adopt_frame'; None stops
+            the worker
+        results (multiprocessing.Queue): (job_id, kind, value) messages
+        memory_budget (int): Budget handed to the load planner
+    """
+    # No windows in the worker; charts only ever go to PNG
+    import matplotlib
+    matplotlib.use('Agg')
+    
+    from core.excel_handler import ExcelHandler
+    from core.load_planner import LoadPlanner
+    from core.report_pipeline import ReportPipeline
+    from core.shared_frame import attach_frame
+    
+    excel_handler = ExcelHandler()
+    pipeline = ReportPipeline(
+        excel_handler=excel_handler,
+        load_planner=LoadPlanner(excel_handler, memory_budget=memory_budget)
+    )
+    try:
+        pipeline.report_generator.warm_up()
+    except Exception:
+        # A failed warm-up only costs time; the first job will report errors
+        pass
+    results.put((None, 'ready', None))
+    
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+            
+        job_id, method, args, kwargs = job
+        try:
+            if method == 'adopt_frame':
+                # Views of the GUI's parsed frame; no parsing and no copy
+                content_hash, handle = args
+                excel_handler.add_cached(content_hash, attach_frame(handle))
+                result = None
+            else:
+                kwargs['progress'] = lambda fraction: results.put((job_id, 'progress', fraction))
+                result = getattr(pipeline, method)(*args, **kwargs)
+            results.put((job_id, 'done', result))
+        except Exception as e:
+            results.put((job_id, 'error', str(e)))
+
+class ReportWorker:
+    """Background process that keeps pandas, matplotlib and the templates loaded"""
+    
+    def __init__(self, memory_budget=None):
+        """
+        Args:
+            memory_budget (int): Budget handed to the worker's load planner
+        """
+        # Spawn on every platform; forking a process that runs Tk is unsafe
+        context = multiprocessing.get_context('spawn')
+        self._jobs = context.Queue()
+        self._results = context.Queue()
+        self._process = context.Process(
+            target=_serve, args=(self._jobs, self._results, memory_budget), daemon=True
+        )
+        self._ids = itertools.count(1)
+        self._shared_hash = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.ready = threading.Event()
+        
+        self._process.start()
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+        
+    def is_alive(self):
+        return self._process.is_alive()
+        
+    def run(self, file_path, progress=None, **options):
+        """
+        Generate a report in the worker; blocks until it is written
+        
+        Args:
+            file_path (str): Path to the workbook
+            progress (callable): Called with the fraction of the work done,
+                from the listener thread
+            **options: Keyword arguments of ReportPipeline.run
+            
+        Returns:
+            str: Path to generated HTML file
+        """
+        return self.call('run', (file_path,), options, progress)
+        
+    def run_all(self, file_path, report_types, progress=None, **options):
+        """Generate several report types in the worker, as ReportPipeline.run_all"""
+        return self.call('run_all', (file_path, report_types), options, progress)
+        
+    def share(self, content_hash, data):
+        """
+        Hand a parsed DataFrame to the worker through shared memory
+        
+        The worker maps the column buffers instead of parsing the file
+        again. The segment is removed as soon as the worker has mapped it;
+        the worker's views stay valid until it drops the frame.
+        
+        Args:
+            content_hash (str): Content hash the frame was loaded for
+            data (pandas.DataFrame): Parsed data
+        """
+        if content_hash == self._shared_hash:
+            return
+            
+        from core.shared_frame import SharedFrame
+        
+        with SharedFrame(data) as shared:
+            self.call('adopt_frame', (content_hash, shared.handle), {})
+        self._shared_hash = content_hash
+        
+    def compare(self, old_file, new_file, progress=None, **options):
+        """Generate a comparison report in the worker, as ReportPipeline.compare"""
+        return self.call('compare', (old_file, new_file), options, progress)
+        
+    def call(self, method, args, kwargs, progress=None):
+        """
+        Send one ReportPipeline call to the worker and wait for its result
+        
+        Raises:
+            Exception: When the job fails or the worker has stopped
+        """
+        if not self.is_alive():
+            raise Exception("Report worker is not running")
+            
+        job_id = next(self._ids)
+        done = threading.Event()
+        with self._lock:
+            self._pending[job_id] = {'done': done, 'progress': progress, 'kind': None, 'value': None}
+        self._jobs.put((job_id, method, args, kwargs))
+        
+        done.wait()
+        with self._lock:
+            job = self._pending.pop(job_id)
+        if job['kind'] == 'error':
+            raise Exception(job['value'])
+        return job['value']
+        
+    def _listen(self):
+        """Route worker messages to the waiting callers"""
+        while True:
+            try:
+                job_id, kind, value = self._results.get(timeout=1.0)
+            except queue.Empty:
+                if not self.is_alive():
+                    self._fail_pending("Report worker stopped unexpectedly")
+                    return
+                continue
+            except (EOFError, OSError):
+                self._fail_pending("Report worker stopped unexpectedly")
+                return
+                
+            if kind == 'ready':
+                self.ready.set()
+                continue
+                
+            with self._lock:
+                job = self._pending.get(job_id)
+            if job is None:
+                continue
+            if kind == 'progress':
+                if job['progress']:
+                    job['progress'](value)
+                continue
+                
+            job['kind'], job['value'] = kind, value
+            job['done'].set()
+            
+    def _fail_pending(self, message):
+        with self._lock:
+            for job in self._pending.values():
+                if not job['done'].is_set():
+                    job['kind'], job['value'] = 'error', message
+                    job['done'].set()
+                    
+    def stop(self, timeout=2.0):
+        """Ask the worker to exit after its current job, then make sure it does"""
+        if self._process.is_alive():
+            self._jobs.put(None)
+            self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
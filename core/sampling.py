@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+class ReservoirSampler:
+    """Uniform fixed-size row sample from a stream of DataFrame chunks"""
+    
+    def __init__(self, sample_size, seed=None):
+        """
+        Args:
+            sample_size (int): Number of rows to keep
+            seed (int): Random seed for reproducible samples
+        """
+        self.sample_size = sample_size
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._parts = []
+        self._slot_part = np.zeros(sample_size, dtype=np.int64)
+        self._slot_row = np.zeros(sample_size, dtype=np.int64)
+        
+    def add(self, chunk):
+        """
+        Offer the rows of a chunk to the reservoir (vectorized Algorithm R)
+        
+        Args:
+            chunk (pandas.DataFrame): Next rows of the stream
+        """
+        n = len(chunk)
+        if n == 0:
+            return
+            
+        k = self.sample_size
+        fill = min(max(k - self.rows_seen, 0), n)
+        
+        # Row t of the stream replaces a random slot with probability k / (t + 1)
+        positions = np.arange(self.rows_seen + fill, self.rows_seen + n)
+        slots = self._rng.integers(0, positions + 1) if len(positions) else positions
+        accepted = slots < k
+        
+        keep = np.concatenate((np.arange(fill), positions[accepted] - self.rows_seen))
+        part_index = len(self._parts)
+        self._parts.append(chunk.iloc[keep])
+        
+        self._slot_part[self.rows_seen:self.rows_seen + fill] = part_index
+        self._slot_row[self.rows_seen:self.rows_seen + fill] = np.arange(fill)
+        
+        # Later rows overwrite earlier ones in the same slot, as in the sequential algorithm
+        self._slot_part[slots[accepted]] = part_index
+        self._slot_row[slots[accepted]] = np.arange(fill, len(keep))
+        
+        self.rows_seen += n
+        
+        # Drop rows that have since been evicted once they pile up
+        if sum(len(part) for part in self._parts) > 4 * k:
+            compacted = self.sample()
+            self._parts = [compacted]
+            self._slot_part[:len(compacted)] = 0
+            self._slot_row[:len(compacted)] = np.arange(len(compacted))
+            
+    def sample(self):
+        """
+        Current sample
+        
+        Returns:
+            pandas.DataFrame: Up to sample_size rows
+        """
+        filled = min(self.sample_size, self.rows_seen)
+        if filled == 0:
+            return self._parts[0].iloc[:0] if self._parts else pd.DataFrame()
+            
+        offsets = np.concatenate(([0], np.cumsum([len(part) for part in self._parts])))
+        rows = offsets[self._slot_part[:filled]] + self._slot_row[:filled]
+        combined = pd.concat(self._parts, ignore_index=True)
+        return combined.take(rows).reset_index(drop=True)
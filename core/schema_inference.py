@@ -0,0 +1,343 @@
+import csv
+import datetime
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.date_detection import DATE_FORMATS
+
+# Column kinds
+NUMERIC = 'numeric'
+DATETIME = 'datetime'
+BOOLEAN = 'boolean'
+TEXT = 'text'
+
+# Numbers written with thousands separators, e.g. 1,234,567.89
+THOUSANDS_PATTERN = r'[-+]?\d{1,3}(?:,\d{3})+(?:\.\d+)?'
+
+# Distinct failing values kept per column for the report
+EXAMPLE_COUNT = 5
+
+def header_names(header):
+    """Column names from a header row, labelled and de-duplicated like pandas"""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or pd.isna(value) else str(value).strip()
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def to_number(values):
+    """
+    Coerce a column to numbers
+    
+    Text with a currency sign or thousands separators is read as the
+    number it shows; anything else that is not a number becomes NaN.
+    
+    Args:
+        values (pandas.Series): Column of mixed values
+        
+    Returns:
+        pandas.Series: int64 or float64 values
+    """
+    numbers = pd.to_numeric(values, errors='coerce')
+    failed = numbers.isna().to_numpy() & values.notna().to_numpy()
+    if not failed.any():
+        return numbers
+        
+    text = values[failed].astype(str).str.strip()
+    text = text.str.replace(r'^([-+]?)[$€£]\s*', r'\1', regex=True)
+    grouped = text.str.fullmatch(THOUSANDS_PATTERN)
+    text = text.where(~grouped, text.str.replace(',', '', regex=False))
+    numbers = numbers.astype('float64')
+    numbers[failed] = pd.to_numeric(text, errors='coerce').to_numpy(dtype='float64')
+    return numbers
+
+def to_datetime(values, date_format=None):
+    """
+    Coerce a column to datetimes
+    
+    Date cells pass through; text is parsed with date_format, or treated
+    as not a date when there is no format.
+    
+    Args:
+        values (pandas.Series): Column of mixed values
+        date_format (str): strptime format of the text dates
+        
+    Returns:
+        pandas.Series: datetime64 values
+    """
+    is_text = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    if date_format is None:
+        return pd.to_datetime(values.where(~is_text), errors='coerce')
+    values = values.astype(object)
+    values[is_text] = values[is_text].str.strip()
+    return pd.to_datetime(values, format=date_format, errors='coerce')
+
+class ColumnSchema:
+    """Inferred type of one column"""
+    
+    def __init__(self, name, position, kind, date_format=None, zero_padded=False):
+        self.name = name
+        self.position = position
+        self.kind = kind
+        self.date_format = date_format
+        # Numeric-looking codes such as 00123 that must stay text
+        self.zero_padded = zero_padded
+
+class Schema:
+    """Header row and column types of a sheet, inferred from a sample"""
+    
+    def __init__(self, header_row, columns):
+        """
+        Args:
+            header_row (int): 0-based sheet row holding the column names
+            columns (list): ColumnSchema per column, in sheet order
+        """
+        self.header_row = header_row
+        self.columns = {column.name: column for column in columns}
+        
+    def read_dtypes(self, by_name=False):
+        """
+        dtype hints for the pandas readers
+        
+        Zero-padded codes are read as strings so identifiers such as 00123
+        keep their leading zeros. Numeric and date columns are left to the
+        parser's native conversion and coerced by apply() only if a stray
+        cell made them text.
+        
+        Args:
+            by_name (bool): Key by column name (pandas.read_excel) instead
+                of sheet position (pandas.read_csv)
+        """
+        return {
+            column.name if by_name else column.position: str
+            for column in self.columns.values() if column.zero_padded
+        }
+        
+    def apply(self, data, coercions=None):
+        """
+        Convert numeric and date columns that loaded as text
+        
+        Text and boolean columns are kept as the reader loaded them.
+        
+        Args:
+            data (pandas.DataFrame): Cleaned data
+            coercions (dict): Collects what was converted per column, added
+                up over the chunks of one load
+                
+        Returns:
+            pandas.DataFrame: Data with native numeric and datetime columns
+        """
+        converted = {}
+        for col in data.columns:
+            column = self.columns.get(col)
+            if column is None or column.kind in (TEXT, BOOLEAN):
+                continue
+            values = data[col]
+            if column.kind == NUMERIC:
+                if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                    continue
+                typed = to_number(values)
+            else:
+                if pd.api.types.is_datetime64_any_dtype(values):
+                    continue
+                typed = to_datetime(values, column.date_format)
+                
+            failed = values.notna().to_numpy() & typed.isna().to_numpy()
+            if coercions is not None:
+                self.record(coercions, col, column, typed, values[failed])
+            converted[col] = typed
+            
+        if not converted:
+            return data
+            
+        # Shallow copy; untouched columns keep sharing their data
+        attrs = dict(data.attrs)
+        data = data.copy(deep=False)
+        for col, typed in converted.items():
+            data[col] = typed
+        date_formats = {
+            col: self.columns[col].date_format for col in converted
+            if self.columns[col].kind == DATETIME and self.columns[col].date_format
+        }
+        if date_formats:
+            attrs['date_formats'] = {**attrs.get('date_formats', {}), **date_formats}
+        data.attrs = attrs
+        return data
+        
+    @staticmethod
+    def record(coercions, col, column, typed, failures):
+        """Add one conversion to the per-column coercion log"""
+        entry = coercions.setdefault(col, {
+            'kind': column.kind,
+            'dtype': str(typed.dtype),
+            'date_format': column.date_format,
+            'values_converted': 0,
+            'values_coerced_to_missing': 0,
+            'examples': []
+        })
+        entry['dtype'] = str(typed.dtype)
+        entry['values_converted'] += int(typed.notna().sum())
+        entry['values_coerced_to_missing'] += len(failures)
+        for value in failures.astype(str).unique()[:EXAMPLE_COUNT]:
+            if len(entry['examples']) < EXAMPLE_COUNT and value not in entry['examples']:
+                entry['examples'].append(value)
+                
+    def report(self, coercions):
+        """Schema and coercions as report metadata"""
+        return {
+            'header_row': self.header_row,
+            'column_kinds': {name: column.kind for name, column in self.columns.items()},
+            'coercions': coercions
+        }
+
+class SchemaInference:
+    """Works out the header row and column types from the first rows of a file"""
+    
+    def __init__(self, sample_rows=1000, threshold=0.9, header_scan=20, detect_dates=True):
+        """
+        Args:
+            sample_rows (int): Rows read for the inference pass
+            threshold (float): Share of a column's values that must be
+                numbers (or dates) for it to become numeric (or datetime)
+            header_scan (int): Leading rows searched for the header
+            detect_dates (bool): Whether text columns may become datetime
+        """
+        self.sample_rows = sample_rows
+        self.threshold = threshold
+        self.header_scan = header_scan
+        self.detect_dates = detect_dates
+        
+    def read_sample(self, file_path, excel_handler):
+        """
+        First rows of a file as raw cells, without any header
+        
+        Returns:
+            pandas.DataFrame: Cells with None for empty ones, or None for
+                formats that store their own schema (Parquet)
+        """
+        file_ext = Path(file_path).suffix.lower()
+        limit = self.sample_rows + self.header_scan
+        
+        if file_ext in excel_handler.delimiters:
+            with open(file_path, newline='', encoding='utf-8', errors='replace') as f:
+                rows = list(islice(csv.reader(f, delimiter=excel_handler.delimiters[file_ext]), limit))
+            width = max((len(row) for row in rows), default=0)
+            cells = [[value if value.strip() else None for value in row] + [None] * (width - len(row))
+                     for row in rows]
+            return pd.DataFrame(cells, dtype=object)
+            
+        if file_ext == '.parquet':
+            return None
+            
+        engine = excel_handler.get_reader_engine(file_path)
+        sample = engine.read(file_path, header=None, nrows=limit)
+        return sample.astype(object).where(sample.notna(), None)
+        
+    def detect_header_row(self, raw):
+        """
+        Sheet row holding the column names
+        
+        Title and blank rows above the table have fewer filled cells than
+        the table is wide and are skipped. The first row at least half as
+        wide as the table is the header when every cell is text that is not
+        a number; otherwise the table has no such preamble and row 0 is
+        used, as pandas would.
+        """
+        filled = raw.notna().sum(axis=1).to_numpy()
+        if not len(filled):
+            return 0
+        width = filled.max()
+        
+        for i in range(min(self.header_scan, len(raw))):
+            if filled[i] < max(1, width / 2):
+                continue
+            values = raw.iloc[i].dropna()
+            is_label = all(isinstance(value, str) for value in values)
+            if is_label and to_number(values).isna().all() and values.is_unique:
+                return i
+            return 0
+        return 0
+        
+    def infer_column(self, values):
+        """
+        Kind and date format of one column
+        
+        Args:
+            values (pandas.Series): Sample cells below the header
+            
+        Returns:
+            tuple: (kind, date_format, zero_padded)
+        """
+        values = values.dropna()
+        if not len(values):
+            return TEXT, None, False
+        needed = self.threshold * len(values)
+        
+        # bool is a subclass of int, so check for flags before numbers
+        is_bool = values.map(lambda value: isinstance(value, (bool, np.bool_))).to_numpy(dtype=bool)
+        if is_bool.sum() >= needed:
+            return BOOLEAN, None, False
+            
+        is_text = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        text = values[is_text].str.strip()
+        
+        numbers = to_number(values[~is_bool])
+        if numbers.notna().sum() >= needed:
+            # Zero-padded codes are identifiers, not amounts
+            if text.str.match(r'0\d').any():
+                return TEXT, None, True
+            return NUMERIC, None, False
+            
+        if not self.detect_dates:
+            return TEXT, None, False
+        is_date = values.map(
+            lambda value: isinstance(value, (datetime.date, np.datetime64)) and not isinstance(value, bool)
+        ).to_numpy(dtype=bool)
+        dates = int(is_date.sum())
+        if dates >= needed:
+            return DATETIME, None, False
+            
+        candidates = text[text.str.len().between(6, 40) & text.str.contains(r'\d')]
+        if dates + len(candidates) < needed:
+            return TEXT, None, False
+        for date_format in DATE_FORMATS:
+            parsed = pd.to_datetime(candidates, format=date_format, errors='coerce').notna().sum()
+            if dates + parsed >= needed:
+                return DATETIME, date_format, False
+        return TEXT, None, False
+        
+    def infer(self, raw):
+        """
+        Schema of a sheet from its raw first rows
+        
+        Args:
+            raw (pandas.DataFrame): Cells as returned by read_sample
+            
+        Returns:
+            Schema: Header row and column types
+        """
+        header_row = self.detect_header_row(raw)
+        names = header_names(raw.iloc[header_row].tolist()) if len(raw) else []
+        body = raw.iloc[header_row + 1:]
+        
+        columns = []
+        for position, name in enumerate(names):
+            kind, date_format, zero_padded = self.infer_column(body.iloc[:, position])
+            columns.append(ColumnSchema(name, position, kind, date_format, zero_padded))
+        return Schema(header_row, columns)
+        
+    def infer_file(self, file_path, excel_handler):
+        """Schema of a file, or None for formats that store their own (Parquet)"""
+        raw = self.read_sample(file_path, excel_handler)
+        if raw is None:
+            return None
+        return self.infer(raw)
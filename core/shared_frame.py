@@ -0,0 +1,232 @@
+import os
+import mmap
+import pickle
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Arrow IPC carries text and extension columns when installed; pickle otherwise
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Column buffers start on cache-line boundaries
+ALIGNMENT = 64
+
+# Where POSIX shared memory segments appear as files
+SHM_DIR = '/dev/shm'
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _is_plain_numpy(dtype):
+    """Columns whose values are one fixed-width numpy buffer"""
+    return isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM'
+
+def _encode(frame, preserve_index):
+    """Encode the columns that are not plain numpy buffers"""
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=preserve_index)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue(), 'arrow'
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError):
+            # Mixed-type object columns; fall back to pickle
+            pass
+    return pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL), 'pickle'
+
+def _decode(buffer, codec):
+    if codec == 'arrow':
+        if pa is None:
+            raise Exception("Shared frame was encoded with pyarrow, which is not installed")
+        # Arrow arrays keep referencing the shared buffer instead of copying it
+        return pa.ipc.open_stream(pa.py_buffer(buffer)).read_all().to_pandas()
+    return pickle.loads(buffer)
+
+def _release_segment(segment):
+    """Close and remove a segment; safe to call more than once"""
+    try:
+        segment.close()
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+def _attach(name, size):
+    """
+    Map a published segment read-only for as long as views of it exist
+    
+    The segment is mapped directly rather than through SharedMemory,
+    whose close() refuses to run while arrays still point into its
+    buffer. The rebuilt arrays hold the mapping, and it is unmapped when
+    the last of them is garbage collected. Where segments cannot be
+    mapped by name (POSIX without /dev/shm), the bytes are copied.
+    """
+    if os.name == 'nt':
+        return memoryview(mmap.mmap(-1, size, tagname=name, access=mmap.ACCESS_READ))
+        
+    path = os.path.join(SHM_DIR, name.lstrip('/'))
+    if os.path.exists(path):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return memoryview(mmap.mmap(fd, size, access=mmap.ACCESS_READ))
+        finally:
+            os.close(fd)
+            
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        return memoryview(bytes(segment.buf[:size]))
+    finally:
+        segment.close()
+
+class SharedFrameHandle:
+    """Picklable description of a published frame; cheap to send to workers"""
+    
+    def __init__(self, name, size, columns, n_rows, buffers, rest, index, attrs):
+        self.name = name
+        self.size = size
+        self.columns = columns
+        self.n_rows = n_rows
+        self.buffers = buffers
+        self.rest = rest
+        self.index = index
+        self.attrs = attrs
+
+class SharedFrame:
+    """
+    A DataFrame whose column buffers are published once in shared memory
+    
+    Fixed-width numpy columns are copied into one segment at aligned
+    offsets; text, categorical and nullable columns follow as one Arrow
+    IPC stream (or a pickle without pyarrow). Other processes rebuild the
+    frame with attach_frame() from the small handle, without copying.
+    
+    The publisher owns the segment. release() removes it; readers that
+    already attached keep their mapping until they drop the frame. If the
+    publisher never calls release(), the segment is removed when the
+    SharedFrame is garbage collected or the interpreter exits, and
+    multiprocessing's resource tracker removes it if the publisher dies.
+    Readers hold no ownership, so a crashing worker leaks nothing.
+    """
+    
+    def __init__(self, data):
+        """
+        Args:
+            data (pandas.DataFrame): Frame to publish
+        """
+        numpy_columns = []
+        rest_positions = []
+        rest_dtypes = []
+        for position in range(data.shape[1]):
+            column = data.iloc[:, position]
+            if _is_plain_numpy(column.dtype):
+                numpy_columns.append((position, column.to_numpy()))
+            else:
+                rest_positions.append(position)
+                rest_dtypes.append(column.dtype)
+                
+        range_index = isinstance(data.index, pd.RangeIndex)
+        rest, codec = b'', None
+        if rest_positions or not range_index:
+            frame = data.iloc[:, rest_positions]
+            frame = frame.set_axis([str(position) for position in rest_positions], axis=1)
+            if range_index:
+                frame = frame.reset_index(drop=True)
+            rest, codec = _encode(frame, preserve_index=not range_index)
+            
+        buffers = []
+        offset = 0
+        for position, values in numpy_columns:
+            offset = _aligned(offset)
+            buffers.append((position, values.dtype.str, offset))
+            offset += values.nbytes
+        rest_offset = _aligned(offset)
+        size = max(rest_offset + len(rest), 1)
+        
+        self._segment = shared_memory.SharedMemory(create=True, size=size)
+        self._finalizer = weakref.finalize(self, _release_segment, self._segment)
+        
+        buffer = self._segment.buf
+        for (position, values), (_, dtype, start) in zip(numpy_columns, buffers):
+            target = np.ndarray(values.shape, dtype=values.dtype, buffer=buffer, offset=start)
+            target[...] = values
+            del target
+        buffer[rest_offset:rest_offset + len(rest)] = memoryview(rest).cast('B')
+        del buffer
+        
+        if range_index:
+            index = (data.index.start, data.index.stop, data.index.step, data.index.name)
+        else:
+            index = None
+        self.handle = SharedFrameHandle(
+            name=self._segment.name,
+            size=size,
+            columns=data.columns,
+            n_rows=len(data),
+            buffers=buffers,
+            rest=(rest_offset, len(rest), codec, rest_positions, rest_dtypes),
+            index=index,
+            attrs=dict(data.attrs)
+        )
+        
+    @property
+    def nbytes(self):
+        return self._segment.size
+        
+    def release(self):
+        """Remove the segment; frames already attached elsewhere stay valid"""
+        self._finalizer()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+def attach_frame(handle):
+    """
+    Rebuild a published frame as read-only views of the shared segment
+    
+    Args:
+        handle (SharedFrameHandle): Handle of a SharedFrame
+        
+    Returns:
+        pandas.DataFrame: Frame sharing the publisher's buffers; pandas
+            copies a column on write, so the publisher's data is never changed
+    """
+    view = _attach(handle.name, handle.size)
+    
+    arrays = {}
+    for position, dtype, offset in handle.buffers:
+        values = np.frombuffer(view, dtype=np.dtype(dtype), count=handle.n_rows, offset=offset)
+        values.flags.writeable = False
+        arrays[position] = values
+        
+    rest_offset, rest_size, codec, rest_positions, rest_dtypes = handle.rest
+    index = None
+    if codec is not None:
+        rest = _decode(view[rest_offset:rest_offset + rest_size], codec)
+        for position, dtype in zip(rest_positions, rest_dtypes):
+            column = rest[str(position)]
+            if column.dtype != dtype:
+                # Arrow infers types from the values, e.g. int64 for an
+                # object column that only holds ints
+                column = column.astype(dtype)
+            arrays[position] = column.array
+        index = rest.index
+    if handle.index is not None:
+        start, stop, step, name = handle.index
+        index = pd.RangeIndex(start, stop, step, name=name)
+        
+    data = pd.DataFrame(
+        {position: arrays[position] for position in range(len(handle.columns))},
+        index=index,
+        copy=False
+    )
+    data.columns = handle.columns
+    data.attrs = dict(handle.attrs)
+    return data
@@ -0,0 +1,109 @@
+import json
+import math
+import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+# orjson and msgpack are optional; JSON falls back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Bump when the layout of the exported document changes
+EXPORT_VERSION = 1
+
+# Export formats and their file extensions
+EXPORT_FORMATS = {
+    'json': '.json',
+    'msgpack': '.msgpack'
+}
+
+def _default(value):
+    """
+    Convert the values the serializers do not know natively
+
+    Called only for the few unknown objects, so the common ints, floats,
+    strings and (with orjson) numpy arrays never pass through Python code.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        value = value.item()
+        return None if isinstance(value, float) and math.isnan(value) else value
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (pd.Timedelta, datetime.timedelta)):
+        return value.total_seconds()
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.tolist()
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient='list')
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (np.dtype, pd.api.extensions.ExtensionDtype, pd.Period, pd.Interval)):
+        return str(value)
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
+
+def _plain(value):
+    """
+    Recursively turn a profile into plain JSON types with string keys
+
+    The slow path, used by the standard library fallback and for mappings
+    whose keys orjson rejects.
+    """
+    if isinstance(value, dict):
+        return {_key(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    return _plain(_default(value))
+
+def _key(key):
+    if isinstance(key, str):
+        return key
+    if isinstance(key, (int, float, bool)) or key is None:
+        return json.dumps(_plain(key))
+    return str(_plain(key))
+
+def serialize(data, export_format='json'):
+    """
+    Encode a profile for machine consumption
+
+    Args:
+        data (dict): Profile, as built by DataProcessor
+        export_format (str): 'json' or 'msgpack'
+
+    Returns:
+        bytes: Encoded document
+    """
+    if export_format == 'json':
+        if orjson is not None:
+            options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            try:
+                return orjson.dumps(data, default=_default, option=options)
+            except TypeError:
+                # Keys of a type orjson cannot write, such as numpy scalars
+                return orjson.dumps(_plain(data), option=options)
+        return json.dumps(_plain(data), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    if export_format == 'msgpack':
+        if msgpack is None:
+            raise ValueError("MessagePack export requires the msgpack package (pip install msgpack)")
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+    raise ValueError(f"Unsupported export format: {export_format}")
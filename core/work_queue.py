@@ -0,0 +1,385 @@
+import os
+import time
+import socket
+import sqlite3
+import hashlib
+import threading
+import multiprocessing
+from pathlib import Path
+
+from utils.helpers import safe_filename
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    report_type TEXT NOT NULL,
+    output_format TEXT NOT NULL,
+    include_charts INTEGER NOT NULL,
+    output_name TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    report_path TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (state, available_at);
+"""
+
+# Job states
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+def default_worker_id():
+    """Host name and process id; unique across the machines sharing a queue"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class WorkQueue:
+    """
+    Report jobs in a SQLite database that workers on any host can share
+    
+    Workers lease one job at a time. A lease that is not renewed or
+    completed in time expires and the job goes back to the queue, so a
+    crashed or disconnected worker only delays its job. Failed jobs are
+    retried with a growing delay until max_attempts is reached.
+    
+    Every job writes to a fixed file name derived from its workbook,
+    report type and format, and reports are replaced atomically. Running a
+    job twice, for example after a lease expired on a slow worker, writes
+    the same file again instead of producing a second report.
+    
+    The database may live on a network share. It keeps SQLite's default
+    rollback journal, because WAL mode does not work across machines.
+    """
+    
+    def __init__(self, db_path, output_dir=None, timeout=30.0):
+        """
+        Args:
+            db_path (str): Queue database; created when missing
+            output_dir (str): Directory reports are written to; stored in
+                the database when it is created, so every worker agrees
+            timeout (float): Seconds to wait for another worker's lock
+        """
+        self.db_path = str(db_path)
+        self._connection = sqlite3.connect(self.db_path, timeout=timeout, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(SCHEMA)
+        
+        self._connection.execute(
+            "INSERT OR IGNORE INTO settings (name, value) VALUES ('output_dir', ?)",
+            (str(Path(output_dir or Path(self.db_path).parent / "reports").resolve()),)
+        )
+        self.output_dir = self._connection.execute(
+            "SELECT value FROM settings WHERE name = 'output_dir'"
+        ).fetchone()['value']
+        
+    def close(self):
+        self._connection.close()
+        
+    def _transaction(self):
+        """Exclusive write transaction; SQLite serializes claims across hosts"""
+        return _Transaction(self._connection)
+        
+    @staticmethod
+    def output_name(file_path, report_type, extension):
+        """Idempotent report file name of a job"""
+        digest = hashlib.sha1(str(file_path).encode('utf-8')).hexdigest()[:8]
+        stem = safe_filename(Path(file_path).stem)
+        return f"report_{report_type}_{stem}_{digest}{extension}"
+        
+    def enqueue(self, file_paths, report_type="summary", output_format="html",
+                include_charts=True, max_attempts=3, force=False):
+        """
+        Add report jobs
+        
+        Args:
+            file_paths (list): Workbooks to report on
+            report_type (str): Type of report to generate
+            output_format (str): 'html', 'json' or 'msgpack'
+            include_charts (bool): Whether to include charts
+            max_attempts (int): Tries before a job is marked failed
+            force (bool): Queue jobs again that are already done or failed
+            
+        Returns:
+            int: Number of jobs added or requeued
+        """
+        from core.report_pipeline import ReportPipeline
+        
+        extension = ReportPipeline.output_extension(output_format)
+        now = time.time()
+        added = 0
+        with self._transaction() as connection:
+            for file_path in file_paths:
+                file_path = str(Path(file_path).resolve())
+                output_name = self.output_name(file_path, report_type, extension)
+                cursor = connection.execute(
+                    """INSERT OR IGNORE INTO jobs (file_path, report_type, output_format,
+                       include_charts, output_name, max_attempts, available_at, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (file_path, report_type, output_format, int(include_charts),
+                     output_name, max_attempts, now, now)
+                )
+                if not cursor.rowcount and force:
+                    cursor = connection.execute(
+                        """UPDATE jobs SET state = ?, attempts = 0, max_attempts = ?,
+                           available_at = ?, lease_owner = NULL, lease_expires = NULL,
+                           last_error = NULL, finished_at = NULL
+                           WHERE output_name = ? AND state IN (?, ?)""",
+                        (QUEUED, max_attempts, now, output_name, DONE, FAILED)
+                    )
+                added += cursor.rowcount
+        return added
+        
+    def claim(self, worker_id, lease_seconds=300):
+        """
+        Lease the next available job
+        
+        Args:
+            worker_id (str): Identifies the worker holding the lease
+            lease_seconds (float): Seconds until the lease expires unless renewed
+            
+        Returns:
+            sqlite3.Row: The leased job, or None when nothing is available
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            # Expired leases on their last attempt will not be retried
+            connection.execute(
+                """UPDATE jobs SET state = ?, finished_at = ?,
+                   last_error = COALESCE(last_error, 'Lease expired on ' || lease_owner)
+                   WHERE state = ? AND lease_expires < ? AND attempts >= max_attempts""",
+                (FAILED, now, LEASED, now)
+            )
+            job = connection.execute(
+                """SELECT id FROM jobs
+                   WHERE (state = ? AND available_at <= ?) OR (state = ? AND lease_expires < ?)
+                   ORDER BY id LIMIT 1""",
+                (QUEUED, now, LEASED, now)
+            ).fetchone()
+            if job is None:
+                return None
+            connection.execute(
+                """UPDATE jobs SET state = ?, lease_owner = ?, lease_expires = ?,
+                   attempts = attempts + 1 WHERE id = ?""",
+                (LEASED, worker_id, now + lease_seconds, job['id'])
+            )
+            return connection.execute("SELECT * FROM jobs WHERE id = ?", (job['id'],)).fetchone()
+            
+    def renew(self, job_id, worker_id, lease_seconds=300):
+        """Extend a lease; returns False when the lease was lost to another worker"""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND state = ? AND lease_owner = ?",
+                (time.time() + lease_seconds, job_id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+            
+    def complete(self, job_id, worker_id, report_path):
+        """Mark a leased job done; ignored when another worker has taken it over"""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                """UPDATE jobs SET state = ?, report_path = ?, finished_at = ?,
+                   lease_expires = NULL, last_error = NULL
+                   WHERE id = ? AND state = ? AND lease_owner = ?""",
+                (DONE, str(report_path), time.time(), job_id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+            
+    def fail(self, job_id, worker_id, error, retry_delay=30.0):
+        """
+        Record a failed attempt
+        
+        The job is queued again after attempts * retry_delay seconds, or
+        marked failed once it has used max_attempts.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                """UPDATE jobs SET
+                   state = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END,
+                   available_at = ? + attempts * ?,
+                   finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END,
+                   lease_owner = NULL, lease_expires = NULL, last_error = ?
+                   WHERE id = ? AND state = ? AND lease_owner = ?""",
+                (FAILED, QUEUED, now, retry_delay, now, str(error), job_id, LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+            
+    def retry_failed(self):
+        """Queue failed jobs again with fresh attempts"""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                """UPDATE jobs SET state = ?, attempts = 0, available_at = ?,
+                   finished_at = NULL WHERE state = ?""",
+                (QUEUED, time.time(), FAILED)
+            )
+            return cursor.rowcount
+            
+    def counts(self):
+        """Number of jobs per state"""
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for row in self._connection.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+            counts[row['state']] = row['n']
+        return counts
+        
+    def failures(self, limit=20):
+        """Failed jobs with their last error"""
+        return self._connection.execute(
+            "SELECT file_path, report_type, attempts, last_error FROM jobs WHERE state = ? ORDER BY id LIMIT ?",
+            (FAILED, limit)
+        ).fetchall()
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on errors"""
+    
+    def __init__(self, connection):
+        self.connection = connection
+        
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+
+class QueueWorker:
+    """Pulls jobs from a WorkQueue and renders them until the queue is drained"""
+    
+    def __init__(self, work_queue, pipeline=None, worker_id=None, lease_seconds=300,
+                 poll_interval=2.0, retry_delay=30.0):
+        """
+        Args:
+            work_queue (WorkQueue): Queue to pull jobs from
+            pipeline (ReportPipeline): Pipeline writing to the queue's output directory
+            worker_id (str): Lease owner name; defaults to host and process id
+            lease_seconds (float): Lease length; renewed in the background
+                at a third of it while a job runs
+            poll_interval (float): Seconds to wait when no job is available
+            retry_delay (float): Base delay before a failed job is retried
+        """
+        if pipeline is None:
+            from core.report_generator import ReportGenerator
+            from core.report_pipeline import ReportPipeline
+            pipeline = ReportPipeline(report_generator=ReportGenerator(work_queue.output_dir))
+            
+        self.queue = work_queue
+        self.pipeline = pipeline
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        
+    def run(self, stop_when_empty=True, max_jobs=None, on_job=None):
+        """
+        Process jobs
+        
+        Args:
+            stop_when_empty (bool): Return once no job is queued or leased;
+                otherwise keep polling for new jobs
+            max_jobs (int): Return after this many jobs
+            on_job (callable): Called as on_job(job, report_path, error)
+            
+        Returns:
+            int: Number of jobs processed by this worker
+        """
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            job = self.queue.claim(self.worker_id, self.lease_seconds)
+            if job is None:
+                counts = self.queue.counts()
+                if stop_when_empty and not counts[QUEUED] and not counts[LEASED]:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+                
+            report_path, error = self.process(job)
+            processed += 1
+            if on_job:
+                on_job(job, report_path, error)
+                
+        return processed
+        
+    def process(self, job):
+        """
+        Render one leased job, renewing its lease while it runs
+        
+        Returns:
+            tuple: (report_path, error); one of them is None
+        """
+        stop_renewing = threading.Event()
+        renewer = threading.Thread(target=self._renew, args=(job['id'], stop_renewing), daemon=True)
+        renewer.start()
+        try:
+            report_path = self.pipeline.run(
+                job['file_path'],
+                report_type=job['report_type'],
+                include_charts=bool(job['include_charts']),
+                output_name=job['output_name'],
+                use_cache=False,
+                output_format=job['output_format']
+            )
+        except Exception as e:
+            stop_renewing.set()
+            renewer.join()
+            self.queue.fail(job['id'], self.worker_id, str(e), self.retry_delay)
+            return None, str(e)
+            
+        stop_renewing.set()
+        renewer.join()
+        self.queue.complete(job['id'], self.worker_id, os.path.abspath(report_path))
+        return report_path, None
+        
+    def _renew(self, job_id, stop_event):
+        # SQLite connections belong to one thread; the renewer opens its own
+        work_queue = WorkQueue(self.queue.db_path)
+        try:
+            while not stop_event.wait(self.lease_seconds / 3):
+                if not work_queue.renew(job_id, self.worker_id, self.lease_seconds):
+                    break
+        finally:
+            work_queue.close()
+
+def _work(db_path, lease_seconds, poll_interval, retry_delay):
+    """Entry point of a local worker process"""
+    work_queue = WorkQueue(db_path)
+    try:
+        QueueWorker(work_queue, lease_seconds=lease_seconds, poll_interval=poll_interval,
+                    retry_delay=retry_delay).run()
+    finally:
+        work_queue.close()
+
+def run_local_workers(db_path, count, lease_seconds=300, poll_interval=2.0, retry_delay=30.0):
+    """
+    Drain a queue with several local processes, each acting as one node
+    
+    Args:
+        db_path (str): Queue database
+        count (int): Number of worker processes
+        lease_seconds (float): Lease length per job
+        poll_interval (float): Seconds a worker waits when no job is available
+        retry_delay (float): Base delay before a failed job is retried
+        
+    Returns:
+        list: Exit codes of the worker processes
+    """
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=_work, args=(db_path, lease_seconds, poll_interval, retry_delay))
+        for _ in range(count)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return [process.exitcode for process in processes]
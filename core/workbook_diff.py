@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+from core.data_processor import DataProcessor
+
+# Multiplier used to fold per-column value hashes into one row hash
+HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+class WorkbookDiff:
+    """Row and statistic differences between two versions of a table"""
+    
+    def __init__(self, old_data, new_data, key_columns=None, data_processor=None):
+        """
+        Args:
+            old_data (pandas.DataFrame): Earlier version
+            new_data (pandas.DataFrame): Later version
+            key_columns (list): Columns identifying a row; without them rows
+                are matched on their full content
+            data_processor (DataProcessor): Used for the statistic deltas
+        """
+        self.old_data = old_data
+        self.new_data = new_data
+        self.key_columns = list(key_columns) if key_columns else []
+        self.data_processor = data_processor or DataProcessor()
+        
+        missing = [
+            col for col in self.key_columns
+            if col not in old_data.columns or col not in new_data.columns
+        ]
+        if missing:
+            raise ValueError(f"Key columns not found in both workbooks: {missing}")
+            
+        self.common_columns = [col for col in old_data.columns if col in new_data.columns]
+        self.added_columns = [col for col in new_data.columns if col not in old_data.columns]
+        self.removed_columns = [col for col in old_data.columns if col not in new_data.columns]
+        
+    @staticmethod
+    def column_hashes(series):
+        """
+        64-bit hash of every value in a column
+        
+        Numbers are hashed as floats so a column that turned from int to
+        float (e.g. because a blank cell appeared) still matches by value.
+        """
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            series = series.astype('float64')
+        return pd.util.hash_pandas_object(series, index=False).to_numpy()
+        
+    def row_hashes(self, data, columns):
+        """Combined hash of the given columns for every row"""
+        hashes = np.zeros(len(data), dtype=np.uint64)
+        for col in columns:
+            hashes = hashes * HASH_MULTIPLIER ^ self.column_hashes(data[col])
+        return hashes
+        
+    @staticmethod
+    def match_rows(old_keys, new_keys):
+        """
+        Pair rows with equal key hashes using a hash join
+        
+        Repeated keys are paired in order of appearance, so the second
+        occurrence in the old table matches the second in the new one.
+        
+        Returns:
+            tuple: (old positions, new positions) of the matched pairs, then
+                the unmatched old positions and unmatched new positions
+        """
+        old = pd.DataFrame({'key': old_keys, 'old_row': np.arange(len(old_keys))})
+        new = pd.DataFrame({'key': new_keys, 'new_row': np.arange(len(new_keys))})
+        old['occurrence'] = old.groupby('key', sort=False).cumcount()
+        new['occurrence'] = new.groupby('key', sort=False).cumcount()
+        
+        merged = old.merge(new, on=['key', 'occurrence'], how='outer', sort=False)
+        old_rows = merged['old_row'].to_numpy(dtype='float64')
+        new_rows = merged['new_row'].to_numpy(dtype='float64')
+        
+        matched = ~np.isnan(old_rows) & ~np.isnan(new_rows)
+        removed = np.sort(old_rows[np.isnan(new_rows)].astype(np.int64))
+        added = np.sort(new_rows[np.isnan(old_rows)].astype(np.int64))
+        order = np.argsort(old_rows[matched], kind='stable')
+        
+        return (
+            old_rows[matched][order].astype(np.int64),
+            new_rows[matched][order].astype(np.int64),
+            removed,
+            added
+        )
+        
+    def compare(self, sample_rows=20):
+        """
+        Compare the two versions
+        
+        Args:
+            sample_rows (int): Number of example rows listed per change type
+            
+        Returns:
+            dict: Diff ready for ReportGenerator.generate_diff_report
+        """
+        match_columns = self.key_columns or self.common_columns
+        old_rows, new_rows, removed, added = self.match_rows(
+            self.row_hashes(self.old_data, match_columns),
+            self.row_hashes(self.new_data, match_columns)
+        )
+        
+        # Compare the remaining columns of matched rows one column at a time
+        value_columns = [col for col in self.common_columns if col not in self.key_columns]
+        modified = np.zeros(len(old_rows), dtype=bool)
+        column_changes = {}
+        if self.key_columns:
+            for col in value_columns:
+                changed = (
+                    self.column_hashes(self.old_data[col])[old_rows]
+                    != self.column_hashes(self.new_data[col])[new_rows]
+                )
+                column_changes[col] = int(changed.sum())
+                modified |= changed
+                
+        return {
+            'title': 'Workbook Comparison Report',
+            'mode': 'key' if self.key_columns else 'row_hash',
+            'key_columns': self.key_columns,
+            'old_rows': len(self.old_data),
+            'new_rows': len(self.new_data),
+            'added_rows': len(added),
+            'removed_rows': len(removed),
+            'modified_rows': int(modified.sum()),
+            'unchanged_rows': int(len(old_rows) - modified.sum()),
+            'added_columns': self.added_columns,
+            'removed_columns': self.removed_columns,
+            'column_changes': {col: count for col, count in column_changes.items() if count},
+            'added_sample': self._table(self.new_data.iloc[added[:sample_rows]]),
+            'removed_sample': self._table(self.old_data.iloc[removed[:sample_rows]]),
+            'modified_sample': self._modified_sample(
+                old_rows[modified][:sample_rows], new_rows[modified][:sample_rows], value_columns
+            ),
+            'stat_deltas': self.data_processor.compare_statistics(
+                self.old_data, self.new_data, self.common_columns
+            )
+        }
+        
+    def _modified_sample(self, old_rows, new_rows, value_columns):
+        """Key and changed cells of a few modified rows"""
+        sample = []
+        for old_row, new_row in zip(old_rows, new_rows):
+            old_values = self.old_data.iloc[old_row]
+            new_values = self.new_data.iloc[new_row]
+            changes = {}
+            for col in value_columns:
+                old_value, new_value = old_values[col], new_values[col]
+                if not (old_value == new_value or (pd.isna(old_value) and pd.isna(new_value))):
+                    changes[col] = {'old': self._cell(old_value), 'new': self._cell(new_value)}
+            sample.append({
+                'key': ', '.join(str(self._cell(old_values[col])) for col in self.key_columns),
+                'changes': changes
+            })
+        return sample
+        
+    @staticmethod
+    def _cell(value):
+        """Display value of a cell; missing values become empty strings"""
+        return '' if pd.isna(value) else value
+        
+    @classmethod
+    def _table(cls, frame):
+        """Column names and row values of a small DataFrame for templating"""
+        return {
+            'columns': [str(col) for col in frame.columns],
+            'rows': [[cls._cell(value) for value in row] for row in frame.itertuples(index=False)]
+        }
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+from utils.helpers import file_content_hash
+
+# Lock and scratch files Excel and LibreOffice create next to a workbook while saving
+TEMP_FILE_PREFIXES = ('~', '.~lock')
+TEMP_FILE_SUFFIXES = ('.tmp', '.temp', '#')
+
+class WorkbookWatcher:
+    """Polls workbooks and reports content changes once saves have settled"""
+    
+    def __init__(self, paths, on_change, supported_formats=None,
+                 poll_interval=1.0, debounce=2.0):
+        """
+        Args:
+            paths (list): Workbook files or directories to watch
+            on_change (callable): Called as on_change(file_path, content_hash)
+            supported_formats (list): File extensions watched inside directories
+            poll_interval (float): Seconds between polls
+            debounce (float): Seconds a file must stay unchanged before it is read
+        """
+        self.paths = [Path(p) for p in paths]
+        self.on_change = on_change
+        self.supported_formats = supported_formats or ['.xlsx', '.xls']
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        
+        self._signatures = {}
+        self._pending = {}
+        self._hashes = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+    @staticmethod
+    def is_temp_file(path):
+        """Check whether a path is an editor lock or scratch file"""
+        name = Path(path).name
+        return name.startswith(TEMP_FILE_PREFIXES) or name.lower().endswith(TEMP_FILE_SUFFIXES)
+        
+    def watched_files(self):
+        """Expand the watched paths into the workbook files they currently cover"""
+        files = []
+        
+        for path in self.paths:
+            if path.is_dir():
+                for child in sorted(path.iterdir()):
+                    if (child.is_file() and not self.is_temp_file(child)
+                            and child.suffix.lower() in self.supported_formats):
+                        files.append(child)
+            elif not self.is_temp_file(path):
+                files.append(path)
+                
+        return files
+        
+    def prime(self):
+        """Record the current content of every file so only later edits trigger"""
+        for path in self.watched_files():
+            try:
+                self._signatures[path] = self._signature(path)
+                self._hashes[path] = file_content_hash(path)
+            except OSError:
+                continue
+                
+    def refresh_all(self):
+        """Invoke the change callback for every watched file regardless of changes"""
+        self._dispatch([(str(path), None) for path in self.watched_files()])
+        
+    def poll(self, now=None):
+        """
+        Check all watched files once
+        
+        Args:
+            now (float): Current monotonic time, for deterministic polling
+            
+        Returns:
+            list: (file_path, content_hash) pairs that changed content
+        """
+        now = time.monotonic() if now is None else now
+        changed = []
+        
+        for path in self.watched_files():
+            try:
+                signature = self._signature(path)
+            except OSError:
+                # The file is being replaced; wait for it to reappear
+                self._pending[path] = now
+                continue
+                
+            if signature != self._signatures.get(path):
+                self._signatures[path] = signature
+                self._pending[path] = now
+                continue
+                
+            if path not in self._pending or now - self._pending[path] < self.debounce:
+                continue
+                
+            del self._pending[path]
+            try:
+                content_hash = file_content_hash(path)
+            except OSError:
+                self._pending[path] = now
+                continue
+                
+            if content_hash != self._hashes.get(path):
+                self._hashes[path] = content_hash
+                changed.append((str(path), content_hash))
+                
+        return changed
+        
+    def start(self, refresh=False):
+        """
+        Start polling in a background thread
+        
+        Args:
+            refresh (bool): Invoke the change callback for every watched file
+                first, on the polling thread, so it never overlaps a change
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+            
+        self._stop_event.clear()
+        self.prime()
+        self._thread = threading.Thread(target=self._run, args=(refresh,), daemon=True)
+        self._thread.start()
+        
+    def stop(self):
+        """Stop polling and wait for the background thread to finish"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 2)
+            self._thread = None
+            
+    def run_forever(self):
+        """Poll in the current thread until interrupted"""
+        self.prime()
+        try:
+            while not self._stop_event.is_set():
+                self._dispatch(self.poll())
+                self._stop_event.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            pass
+            
+    def _run(self, refresh=False):
+        """Background polling loop"""
+        if refresh:
+            self.refresh_all()
+        while not self._stop_event.wait(self.poll_interval):
+            self._dispatch(self.poll())
+            
+    def _dispatch(self, changed):
+        """Invoke the change callback, keeping the watcher alive on errors"""
+        for file_path, content_hash in changed:
+            try:
+                self.on_change(file_path, content_hash)
+            except Exception as e:
+                print(f"Error regenerating report for {file_path}: {e}")
+                
+    @staticmethod
+    def _signature(path):
+        """Cheap change signature from file metadata"""
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
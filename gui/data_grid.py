@@ -0,0 +1,271 @@
+import tkinter as tk
+from collections import OrderedDict
+
+import customtkinter as ctk
+import numpy as np
+import pandas as pd
+
+class DataFrameSource:
+    """Grid rows served from an in-memory DataFrame"""
+    
+    def __init__(self, data):
+        self.data = data
+        
+    @property
+    def n_rows(self):
+        return len(self.data)
+        
+    @property
+    def columns(self):
+        return [str(col) for col in self.data.columns]
+        
+    def rows(self, start, stop, column_positions):
+        """Block of rows limited to the given column positions"""
+        return self.data.iloc[start:stop, column_positions]
+
+class ColumnStoreSource:
+    """Grid rows decoded on demand from an out-of-core ColumnStore"""
+    
+    def __init__(self, store):
+        self.store = store
+        
+    @property
+    def n_rows(self):
+        return self.store.n_rows
+        
+    @property
+    def columns(self):
+        return list(self.store.columns)
+        
+    def rows(self, start, stop, column_positions):
+        """Decode only the requested rows of the requested columns"""
+        names = [self.store.columns[i] for i in column_positions]
+        return pd.DataFrame({name: self.store.series(name, start, stop) for name in names})
+
+class VirtualDataGrid(ctk.CTkFrame):
+    """Scrollable table that only draws the cells currently in view"""
+    
+    def __init__(self, master, row_height=22, column_width=120, gutter_width=70,
+                 page_size=200, cache_pages=8, **kwargs):
+        super().__init__(master, **kwargs)
+        
+        self.row_height = row_height
+        self.column_width = column_width
+        self.gutter_width = gutter_width
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        
+        self.source = None
+        self.first_row = 0
+        self.first_column = 0
+        self._pages = OrderedDict()
+        self._cells = []
+        self._headers = []
+        self._row_labels = []
+        
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        
+        dark = ctk.get_appearance_mode() == "Dark"
+        self.colors = {
+            'background': '#2b2b2b' if dark else '#ffffff',
+            'header': '#3a3a3a' if dark else '#e9ecef',
+            'text': '#dce4ee' if dark else '#1a1a1a',
+            'muted': '#8a8a8a',
+            'line': '#454545' if dark else '#dee2e6'
+        }
+        
+        self.canvas = tk.Canvas(
+            self, highlightthickness=0, background=self.colors['background']
+        )
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        
+        self.v_scroll = ctk.CTkScrollbar(self, orientation="vertical", command=self._on_vertical_scroll)
+        self.v_scroll.grid(row=0, column=1, sticky="ns")
+        self.h_scroll = ctk.CTkScrollbar(self, orientation="horizontal", command=self._on_horizontal_scroll)
+        self.h_scroll.grid(row=1, column=0, sticky="ew")
+        
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Shift-MouseWheel>", self._on_shift_mouse_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_rows(3))
+        
+    def set_source(self, source):
+        """
+        Show a new data source
+        
+        Args:
+            source: DataFrameSource, ColumnStoreSource or any object with
+                n_rows, columns and rows(start, stop, column_positions)
+        """
+        self.source = source
+        self.first_row = 0
+        self.first_column = 0
+        self._pages.clear()
+        self.redraw()
+        
+    def clear(self):
+        """Remove the data source and blank the grid"""
+        self.set_source(None)
+        
+    def visible_rows(self):
+        """Number of data rows that fit below the header"""
+        height = max(self.canvas.winfo_height(), 1)
+        return max(height // self.row_height - 1, 1)
+        
+    def visible_columns(self):
+        """Number of columns that fit right of the row-number gutter"""
+        width = max(self.canvas.winfo_width() - self.gutter_width, 1)
+        return width // self.column_width + 1
+        
+    def scroll_rows(self, delta):
+        self._scroll_to(self.first_row + delta, self.first_column)
+        
+    def scroll_columns(self, delta):
+        self._scroll_to(self.first_row, self.first_column + delta)
+        
+    def _scroll_to(self, first_row, first_column):
+        if self.source is None:
+            return
+        max_row = max(self.source.n_rows - self.visible_rows(), 0)
+        max_column = max(len(self.source.columns) - self.visible_columns() + 1, 0)
+        self.first_row = int(min(max(first_row, 0), max_row))
+        self.first_column = int(min(max(first_column, 0), max_column))
+        self.redraw()
+        
+    def _on_vertical_scroll(self, action, *args):
+        if self.source is None:
+            return
+        if action == "moveto":
+            self._scroll_to(float(args[0]) * self.source.n_rows, self.first_column)
+        elif action == "scroll":
+            step = self.visible_rows() if args[1] == "pages" else 1
+            self.scroll_rows(int(args[0]) * step)
+            
+    def _on_horizontal_scroll(self, action, *args):
+        if self.source is None:
+            return
+        if action == "moveto":
+            self._scroll_to(self.first_row, float(args[0]) * len(self.source.columns))
+        elif action == "scroll":
+            step = self.visible_columns() if args[1] == "pages" else 1
+            self.scroll_columns(int(args[0]) * step)
+            
+    def _on_mouse_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+        
+    def _on_shift_mouse_wheel(self, event):
+        self.scroll_columns(-1 if event.delta > 0 else 1)
+        
+    def _fetch(self, start, stop, column_positions):
+        """Visible block of rows, served from a small LRU cache of pages"""
+        blocks = []
+        first_page = start // self.page_size
+        last_page = (stop - 1) // self.page_size
+        
+        for page in range(first_page, last_page + 1):
+            key = (page, tuple(column_positions))
+            if key in self._pages:
+                self._pages.move_to_end(key)
+            else:
+                page_start = page * self.page_size
+                self._pages[key] = self.source.rows(
+                    page_start, min(page_start + self.page_size, self.source.n_rows), column_positions
+                )
+                while len(self._pages) > self.cache_pages:
+                    self._pages.popitem(last=False)
+                    
+            page_start = page * self.page_size
+            block = self._pages[key]
+            blocks.append(block.iloc[max(start - page_start, 0):stop - page_start])
+            
+        return pd.concat(blocks) if len(blocks) > 1 else blocks[0]
+        
+    def _ensure_items(self, n_rows, n_columns):
+        """Grow the pool of canvas items; items are reused, never recreated"""
+        canvas = self.canvas
+        row_h, col_w, gutter = self.row_height, self.column_width, self.gutter_width
+        
+        while len(self._headers) < n_columns:
+            j = len(self._headers)
+            x = gutter + j * col_w
+            canvas.create_rectangle(x, 0, x + col_w, row_h, fill=self.colors['header'],
+                                    outline=self.colors['line'], tags=("header_bg", f"hcol{j}"))
+            self._headers.append(canvas.create_text(
+                x + 6, row_h // 2, anchor="w", fill=self.colors['text'],
+                font=("Segoe UI", 9, "bold")
+            ))
+            
+        while len(self._row_labels) < n_rows:
+            i = len(self._row_labels)
+            y = (i + 1) * row_h
+            self._row_labels.append(canvas.create_text(
+                gutter - 6, y + row_h // 2, anchor="e", fill=self.colors['muted'],
+                font=("Consolas", 9)
+            ))
+            canvas.create_line(0, y + row_h, gutter + 2000 * col_w, y + row_h,
+                               fill=self.colors['line'], tags=("grid_line", f"line{i}"))
+                               
+        for i in range(n_rows):
+            if len(self._cells) <= i:
+                self._cells.append([])
+            while len(self._cells[i]) < n_columns:
+                j = len(self._cells[i])
+                self._cells[i].append(canvas.create_text(
+                    gutter + j * col_w + 6, (i + 1) * row_h + row_h // 2, anchor="w",
+                    fill=self.colors['text'], font=("Consolas", 9)
+                ))
+                
+    def _format(self, value):
+        """Cell text, truncated to the column width"""
+        if value is None or (np.ndim(value) == 0 and pd.isna(value)):
+            text = ""
+        elif isinstance(value, (float, np.floating)):
+            text = f"{value:.6g}"
+        else:
+            text = str(value)
+            
+        max_chars = max(self.column_width // 7 - 1, 3)
+        return text if len(text) <= max_chars else text[:max_chars - 1] + "…"
+        
+    def redraw(self):
+        """Refresh the cells in view from the data source"""
+        canvas = self.canvas
+        n_rows = self.visible_rows()
+        n_columns = self.visible_columns()
+        self._ensure_items(n_rows, n_columns)
+        
+        if self.source is None or self.source.n_rows == 0 or not self.source.columns:
+            for item in self._headers + self._row_labels + [c for row in self._cells for c in row]:
+                canvas.itemconfigure(item, text="")
+            self.v_scroll.set(0, 1)
+            self.h_scroll.set(0, 1)
+            return
+            
+        columns = self.source.columns
+        stop_row = min(self.first_row + n_rows, self.source.n_rows)
+        column_positions = list(range(self.first_column, min(self.first_column + n_columns, len(columns))))
+        block = self._fetch(self.first_row, stop_row, column_positions)
+        values = block.to_numpy(dtype=object)
+        
+        for j, item in enumerate(self._headers):
+            in_view = j < len(column_positions)
+            canvas.itemconfigure(item, text=self._format(columns[column_positions[j]]) if in_view else "")
+            canvas.itemconfigure(f"hcol{j}", state="normal" if in_view else "hidden")
+            
+        for i, row_items in enumerate(self._cells):
+            row_in_view = i < len(values)
+            if i < len(self._row_labels):
+                canvas.itemconfigure(self._row_labels[i], text=str(self.first_row + i + 1) if row_in_view else "")
+            for j, item in enumerate(row_items):
+                if row_in_view and j < len(column_positions):
+                    canvas.itemconfigure(item, text=self._format(values[i, j]))
+                else:
+                    canvas.itemconfigure(item, text="")
+                    
+        self.v_scroll.set(self.first_row / self.source.n_rows, stop_row / self.source.n_rows)
+        self.h_scroll.set(
+            self.first_column / len(columns),
+            (self.first_column + len(column_positions)) / len(columns)
+        )
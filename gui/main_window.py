@@ -2,12 +2,19 @@ import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import os
 import threading
+from contextlib import nullcontext
 from pathlib import Path
 import webbrowser
+from datetime import datetime
 
 from core.excel_handler import ExcelHandler
-from core.data_processor import DataProcessor
+from core.data_processor import DataProcessor, REPORT_TYPES
 from core.report_generator import ReportGenerator
+from core.report_pipeline import ReportPipeline
+from core.load_planner import LoadPlanner
+from core.report_worker import ReportWorker
+from gui.data_grid import VirtualDataGrid, DataFrameSource, ColumnStoreSource
+from utils.helpers import file_content_hash
 
 class MainWindow(ctk.CTk):
     def __init__(self):
@@ -22,14 +29,46 @@ class MainWindow(ctk.CTk):
         self.excel_handler = ExcelHandler()
         self.data_processor = DataProcessor()
         self.report_generator = ReportGenerator()
+        self.load_planner = LoadPlanner(self.excel_handler)
+        self.pipeline = ReportPipeline(
+            excel_handler=self.excel_handler,
+            data_processor=self.data_processor,
+            report_generator=self.report_generator,
+            load_planner=self.load_planner
+        )
+        
+        # The loader and generator are not thread-safe; reports rendered in
+        # this process (live refreshes, or any report without the worker)
+        # take turns through this lock
+        self.report_lock = threading.Lock()
+        
+        # Import the analysis stack in a worker process while the user picks
+        # a file, so the first report is as fast as later ones
+        worker_error = None
+        try:
+            self.report_worker = ReportWorker(memory_budget=self.load_planner.memory_budget)
+        except Exception as e:
+            worker_error = e
+            self.report_worker = None
         
         # Variables
         self.selected_file = None
         self.processed_data = None
+        self.watcher = None
+        self.watch_report_opened = False
+        self.preview_store = None
+        self.preview_columns = []
+        
+        # Columns and (start, stop) data rows to read; None reads everything
+        self.column_selection = None
+        self.row_selection = None
         
         # Create UI
         self.create_widgets()
         self.center_window()
+        if worker_error is not None:
+            self.status_label.configure(text=f"Reports run in this window (report worker unavailable: {worker_error})")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
     def center_window(self):
         """Center the window on screen"""
@@ -155,13 +194,59 @@ class MainWindow(ctk.CTk):
             variable=self.report_type, value="overview"
         ).pack(anchor="w", padx=10, pady=2)
         
+        ctk.CTkRadioButton(
+            report_frame, text="All Three (One Load)", 
+            variable=self.report_type, value="all"
+        ).pack(anchor="w", padx=10, pady=2)
+        
         # Include charts option
         self.include_charts = ctk.BooleanVar(value=True)
         ctk.CTkCheckBox(
             options_section,
             text="Include Charts and Graphs",
             variable=self.include_charts
-        ).pack(anchor="w", padx=15, pady=(0, 15))
+        ).pack(anchor="w", padx=15, pady=(0, 5))
+        
+        # Incremental profiling option
+        self.incremental_profile = ctk.BooleanVar(value=True)
+        ctk.CTkCheckBox(
+            options_section,
+            text="Reuse Statistics for Appended Rows",
+            variable=self.incremental_profile
+        ).pack(anchor="w", padx=15, pady=(0, 5))
+        
+        # Out-of-core option for files larger than memory
+        self.out_of_core = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            options_section,
+            text="Low-Memory Mode (Summary Only)",
+            variable=self.out_of_core
+        ).pack(anchor="w", padx=15, pady=(0, 5))
+        
+        # Sampled fast report option
+        self.fast_report = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            options_section,
+            text="⚡ Fast Report (10,000-Row Sample)",
+            variable=self.fast_report
+        ).pack(anchor="w", padx=15, pady=(0, 5))
+        
+        # Only the chosen cells are read from the file
+        self.selection_button = ctk.CTkButton(
+            options_section,
+            text="🎯 Choose Columns and Rows...",
+            command=self.choose_selection,
+            state="disabled"
+        )
+        self.selection_button.pack(fill="x", padx=15, pady=(5, 2))
+        
+        self.selection_label = ctk.CTkLabel(
+            options_section,
+            text="All columns, all rows",
+            font=ctk.CTkFont(size=11),
+            text_color="gray"
+        )
+        self.selection_label.pack(anchor="w", padx=15, pady=(0, 10))
         
         # Generate button
         self.generate_button = ctk.CTkButton(
@@ -172,19 +257,46 @@ class MainWindow(ctk.CTk):
             font=ctk.CTkFont(size=16, weight="bold"),
             state="disabled"
         )
-        self.generate_button.pack(fill="x", padx=20, pady=20)
+        self.generate_button.pack(fill="x", padx=20, pady=(20, 10))
+        
+        # Compare against another version of the workbook
+        self.compare_button = ctk.CTkButton(
+            control_frame,
+            text="🔀 Compare With Earlier Version...",
+            command=self.compare_versions,
+            state="disabled"
+        )
+        self.compare_button.pack(fill="x", padx=20, pady=(0, 10))
+        
+        # Earlier reports from the catalog; no workbook is read
+        self.history_button = ctk.CTkButton(
+            control_frame,
+            text="🕘 Report History",
+            command=self.show_history
+        )
+        self.history_button.pack(fill="x", padx=20, pady=(0, 20))
         
         # Progress bar
         self.progress = ctk.CTkProgressBar(control_frame)
-        self.progress.pack(fill="x", padx=20, pady=(0, 20))
+        self.progress.pack(fill="x", padx=20, pady=(0, 10))
         self.progress.set(0)
         
+        # Watch mode toggle
+        self.watch_enabled = ctk.BooleanVar(value=False)
+        self.watch_switch = ctk.CTkSwitch(
+            control_frame,
+            text="👁 Watch File for Changes",
+            variable=self.watch_enabled,
+            command=self.toggle_watch
+        )
+        self.watch_switch.pack(anchor="w", padx=20, pady=(0, 20))
+        
     def create_preview_panel(self, parent):
         """Create preview panel"""
         preview_frame = ctk.CTkFrame(parent)
         preview_frame.grid(row=0, column=1, sticky="nsew", padx=(10, 20), pady=20)
         preview_frame.grid_columnconfigure(0, weight=1)
-        preview_frame.grid_rowconfigure(1, weight=1)
+        preview_frame.grid_rowconfigure(2, weight=1)
         
         ctk.CTkLabel(
             preview_frame,
@@ -194,9 +306,14 @@ class MainWindow(ctk.CTk):
         
         self.preview_text = ctk.CTkTextbox(
             preview_frame,
+            height=170,
             font=ctk.CTkFont(family="Courier", size=12)
         )
-        self.preview_text.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
+        self.preview_text.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 10))
+        
+        # Virtualized table; only the cells in view are drawn
+        self.data_grid = VirtualDataGrid(preview_frame)
+        self.data_grid.grid(row=2, column=0, sticky="nsew", padx=20, pady=(0, 20))
         
         # Initially show welcome message
         welcome_text = """Welcome to Excel Data Analysis Report Generator!
@@ -206,7 +323,7 @@ Steps to get started:
 2. Choose your report type and analysis options
 3. Click 'Generate Report' to create your professional report
 
-Supported formats: .xlsx, .xls
+Supported formats: .xlsx, .xls, .csv, .tsv, .parquet
 The generated report will automatically open in your browser with:
 • Data quality assessment
 • Statistical analysis
@@ -234,13 +351,18 @@ The generated report will automatically open in your browser with:
         file_path = filedialog.askopenfilename(
             title="Select Excel File",
             filetypes=[
+                ("Data files", "*.xlsx *.xls *.csv *.tsv *.parquet"),
                 ("Excel files", "*.xlsx *.xls"),
+                ("CSV/TSV files", "*.csv *.tsv"),
+                ("Parquet files", "*.parquet"),
                 ("All files", "*.*")
             ]
         )
         
         if file_path:
+            self.stop_watch()
             self.selected_file = file_path
+            self.set_selection(None, None)
             filename = os.path.basename(file_path)
             self.file_label.configure(text=filename)
             self.status_label.configure(text=f"Selected: {filename}")
@@ -253,21 +375,36 @@ The generated report will automatically open in your browser with:
         try:
             self.status_label.configure(text="Loading data preview...")
             
-            # Load data using excel handler
-            data = self.excel_handler.load_file(self.selected_file)
+            self.release_preview_store()
+            
+            # Files too large for memory are previewed from disk
+            plan = None if self.out_of_core.get() else self.load_planner.plan(self.selected_file, self.report_type.get())
             
-            if data is not None:
+            if plan is None or plan.strategy in ('out_of_core', 'sampled'):
+                # Spill to disk; the grid decodes visible rows on demand
+                self.preview_store = self.excel_handler.load_out_of_core(self.selected_file)
+                source = ColumnStoreSource(self.preview_store)
+            else:
+                # Load data using excel handler; cached for report generation
+                data = self.excel_handler.load_cached(self.selected_file, chunked=plan.strategy == 'chunked')
+                source = DataFrameSource(data) if data is not None else None
+                
+            if source is not None:
                 # Generate preview text
-                preview = self.generate_preview_text(data)
+                preview = self.generate_preview_text(source)
                 
                 # Update preview
                 self.preview_text.configure(state="normal")
                 self.preview_text.delete("1.0", "end")
                 self.preview_text.insert("1.0", preview)
                 self.preview_text.configure(state="disabled")
+                self.data_grid.set_source(source)
+                self.preview_columns = [str(column) for column in source.columns]
                 
                 # Enable generate button
                 self.generate_button.configure(state="normal")
+                self.selection_button.configure(state="normal")
+                self.compare_button.configure(state="normal")
                 self.status_label.configure(text="File loaded successfully - Ready to generate report")
             else:
                 raise Exception("Failed to load data")
@@ -276,23 +413,169 @@ The generated report will automatically open in your browser with:
             messagebox.showerror("Error", f"Failed to load file:\n{str(e)}")
             self.status_label.configure(text="Error loading file")
             
-    def generate_preview_text(self, data):
-        """Generate preview text from data"""
+    def generate_preview_text(self, source):
+        """Generate preview text from a grid data source"""
+        columns = source.columns
         preview = f"📋 File Information:\n"
-        preview += f"Rows: {len(data)}\n"
-        preview += f"Columns: {len(data.columns)}\n\n"
+        preview += f"Rows: {source.n_rows}\n"
+        preview += f"Columns: {len(columns)}\n\n"
         
         preview += f"📊 Column Names:\n"
-        for i, col in enumerate(data.columns[:10], 1):  # Show first 10 columns
+        for i, col in enumerate(columns[:10], 1):  # Show first 10 columns
             preview += f"{i}. {col}\n"
-        if len(data.columns) > 10:
-            preview += f"... and {len(data.columns) - 10} more columns\n"
+        if len(columns) > 10:
+            preview += f"... and {len(columns) - 10} more columns\n"
             
-        preview += f"\n🔍 Sample Data (first 5 rows):\n"
-        preview += data.head().to_string()
+        preview += f"\n🔍 Scroll the table below to browse all rows and columns"
         
         return preview
         
+    def choose_selection(self):
+        """Pick the columns and data rows that reports read from the file"""
+        window = ctk.CTkToplevel(self)
+        window.title("Choose Columns and Rows")
+        window.geometry("420x560")
+        window.transient(self)
+        window.grab_set()
+        
+        ctk.CTkLabel(window, text="Columns", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=(15, 5))
+        
+        column_frame = ctk.CTkScrollableFrame(window, height=300)
+        column_frame.pack(fill="both", expand=True, padx=20)
+        
+        chosen = set(self.column_selection or self.preview_columns)
+        column_vars = {}
+        for column in self.preview_columns:
+            column_vars[column] = ctk.BooleanVar(value=column in chosen)
+            ctk.CTkCheckBox(column_frame, text=column, variable=column_vars[column]).pack(anchor="w", pady=2)
+            
+        def set_all(value):
+            for var in column_vars.values():
+                var.set(value)
+                
+        buttons = ctk.CTkFrame(window, fg_color="transparent")
+        buttons.pack(fill="x", padx=20, pady=5)
+        ctk.CTkButton(buttons, text="Select All", width=100, command=lambda: set_all(True)).pack(side="left", padx=(0, 10))
+        ctk.CTkButton(buttons, text="Select None", width=100, command=lambda: set_all(False)).pack(side="left")
+        
+        ctk.CTkLabel(
+            window, text="Data rows (first data row is 1; leave empty for all)",
+            font=ctk.CTkFont(size=12)
+        ).pack(pady=(10, 5))
+        
+        rows_frame = ctk.CTkFrame(window, fg_color="transparent")
+        rows_frame.pack(pady=(0, 10))
+        first_entry = ctk.CTkEntry(rows_frame, width=120, placeholder_text="First")
+        first_entry.pack(side="left", padx=5)
+        last_entry = ctk.CTkEntry(rows_frame, width=120, placeholder_text="Last")
+        last_entry.pack(side="left", padx=5)
+        if self.row_selection is not None:
+            start, stop = self.row_selection
+            first_entry.insert(0, str(start + 1))
+            if stop is not None:
+                last_entry.insert(0, str(stop))
+                
+        def apply():
+            columns = [column for column, var in column_vars.items() if var.get()]
+            if not columns:
+                messagebox.showwarning("Warning", "Choose at least one column.", parent=window)
+                return
+            try:
+                first = int(first_entry.get()) if first_entry.get().strip() else 1
+                last = int(last_entry.get()) if last_entry.get().strip() else None
+                if first < 1 or (last is not None and last < first):
+                    raise ValueError
+            except ValueError:
+                messagebox.showwarning("Warning", "Rows must be whole numbers, with the last not before the first.", parent=window)
+                return
+                
+            rows = None if first == 1 and last is None else (first - 1, last)
+            self.set_selection(None if len(columns) == len(self.preview_columns) else columns, rows)
+            window.destroy()
+            
+        ctk.CTkButton(window, text="Apply", command=apply).pack(pady=(0, 15))
+        
+    def set_selection(self, columns, rows):
+        """Store the column and row selection and describe it under the button"""
+        self.column_selection = columns
+        self.row_selection = rows
+        
+        column_text = "All columns" if columns is None else f"{len(columns)} column{'s' if len(columns) != 1 else ''}"
+        if rows is None:
+            row_text = "all rows"
+        else:
+            start, stop = rows
+            row_text = f"rows {start + 1:,} to {'end' if stop is None else f'{stop:,}'}"
+        self.selection_label.configure(text=f"{column_text}, {row_text}")
+        
+    def release_preview_store(self):
+        """Delete the spill files of the previous low-memory preview"""
+        if self.preview_store is not None:
+            self.data_grid.clear()
+            self.preview_store.cleanup()
+            self.preview_store = None
+            
+    def toggle_watch(self):
+        """Start or stop regenerating the report whenever the file changes"""
+        if not self.watch_enabled.get():
+            self.stop_watch()
+            self.status_label.configure(text="Stopped watching file")
+            return
+            
+        if not self.selected_file:
+            self.watch_enabled.set(False)
+            messagebox.showwarning("Warning", "Please select an Excel file first!")
+            return
+            
+        self.start_watch()
+        
+    def start_watch(self):
+        """Watch the selected file and keep a live report up to date"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            
+        # Share the loader and generator so parsed data and charts stay cached
+        pipeline = ReportPipeline(
+            excel_handler=self.excel_handler,
+            report_generator=self.report_generator
+        )
+        self.watcher = pipeline.watch(
+            [self.selected_file],
+            report_type=self.report_type.get(),
+            include_charts=self.include_charts.get(),
+            on_report=lambda file_path, report_path: self.after(
+                0, lambda: self._watch_report_updated(report_path)
+            ),
+            lock=self.report_lock
+        )
+        self.watch_report_opened = False
+        
+        # Build the first live report without waiting for a change; it runs on
+        # the polling thread, so it is queued ahead of any change
+        self.watcher.start(refresh=True)
+        
+        self.status_label.configure(text=f"Watching {os.path.basename(self.selected_file)} for changes...")
+        
+    def stop_watch(self):
+        """Stop watching the selected file"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        self.watch_enabled.set(False)
+        
+    def _watch_report_updated(self, report_path):
+        """Handle a live report refresh"""
+        if self.watcher is None:
+            return
+            
+        updated_at = datetime.now().strftime('%H:%M:%S')
+        self.status_label.configure(text=f"Live report updated at {updated_at}")
+        
+        # The report reloads itself in the browser, so only open it once
+        if not self.watch_report_opened:
+            self.watch_report_opened = True
+            webbrowser.open(f"file://{os.path.abspath(report_path)}")
+            
     def generate_report(self):
         """Generate HTML report"""
         if not self.selected_file:
@@ -310,48 +593,188 @@ The generated report will automatically open in your browser with:
             # Update UI
             self.after(0, lambda: self.generate_button.configure(state="disabled", text="Generating..."))
             self.after(0, lambda: self.status_label.configure(text="Processing data..."))
-            self.after(0, lambda: self.progress.set(0.2))
-            
-            # Load data
-            data = self.excel_handler.load_file(self.selected_file)
-            self.after(0, lambda: self.progress.set(0.4))
+            self.after(0, lambda: self.progress.set(0.1))
             
-            # Process data
-            processed_data = self.data_processor.process_data(
-                data, 
-                report_type=self.report_type.get()
-            )
-            self.after(0, lambda: self.progress.set(0.6))
-            
-            # Generate report
-            report_path = self.report_generator.generate_html_report(
-                processed_data,
-                report_type=self.report_type.get(),
+            runner = self.report_runner()
+            content_hash = file_content_hash(self.selected_file)
+            selection = {'columns': self.column_selection, 'rows': self.row_selection}
+            options = dict(
+                content_hash=content_hash,
                 include_charts=self.include_charts.get(),
-                source_file=os.path.basename(self.selected_file)
+                incremental=self.incremental_profile.get(),
+                progress=self.report_progress,
+                **selection
             )
-            self.after(0, lambda: self.progress.set(0.8))
+            
+            # Hand the frame parsed for the preview to the worker instead of
+            # letting it parse the file again. A selection is read by the
+            # worker itself, since the preview frame holds every cell.
+            data = self.excel_handler.cached_data(content_hash)
+            share = data is not None and runner is self.report_worker and not any(selection.values())
+            
+            # The pipeline reuses an unchanged report and otherwise picks the
+            # load strategy that fits in memory
+            with self.runner_lock(runner):
+                if self.report_type.get() == "all":
+                    # One load and one profile for every report type
+                    reports = runner.run_all(self.selected_file, REPORT_TYPES, cache_only=share, **options)
+                    if share and len(reports) < len(REPORT_TYPES):
+                        # Copy the frame to shared memory only when a report is rendered
+                        runner.share(content_hash, data)
+                        reports = runner.run_all(self.selected_file, REPORT_TYPES, **options)
+                    report_paths = list(reports.values())
+                else:
+                    options.update(
+                        report_type=self.report_type.get(),
+                        out_of_core=self.out_of_core.get(),
+                        sample_size=self.load_planner.sample_size if self.fast_report.get() else None
+                    )
+                    report_path = runner.run(self.selected_file, cache_only=share, **options)
+                    if report_path is None:
+                        runner.share(content_hash, data)
+                        report_path = runner.run(self.selected_file, **options)
+                    report_paths = [report_path]
             
             # Complete
             self.after(0, lambda: self.progress.set(1.0))
-            self.after(0, lambda: self._report_generated_success(report_path))
+            self.after(0, lambda: self._report_generated_success(*report_paths))
+            
+        except Exception as e:
+            self.after(0, lambda: self._report_generated_error(str(e)))
+            
+    def report_runner(self):
+        """The pre-warmed worker process, or the in-process pipeline when it is unavailable"""
+        if self.report_worker is not None and self.report_worker.is_alive():
+            return self.report_worker
+        return self.pipeline
+        
+    def runner_lock(self, runner):
+        """Lock to hold while runner renders; the worker process has its own loader"""
+        return self.report_lock if runner is self.pipeline else nullcontext()
+        
+    def report_progress(self, fraction):
+        """Move the progress bar; safe to call from any thread"""
+        self.after(0, lambda: self.progress.set(fraction))
+        
+    def compare_versions(self):
+        """Report what changed between an earlier workbook and the selected one"""
+        old_file = filedialog.askopenfilename(
+            title="Select Earlier Version",
+            filetypes=[
+                ("Data files", "*.xlsx *.xls *.csv *.tsv *.parquet"),
+                ("All files", "*.*")
+            ]
+        )
+        if not old_file:
+            return
+            
+        dialog = ctk.CTkInputDialog(
+            title="Match Rows",
+            text="Key columns that identify a row (comma separated).\nLeave empty to match whole rows."
+        )
+        keys = dialog.get_input()
+        if keys is None:
+            return
+        key_columns = [key.strip() for key in keys.split(",") if key.strip()]
+        
+        thread = threading.Thread(target=self._compare_thread, args=(old_file, key_columns))
+        thread.daemon = True
+        thread.start()
+        
+    def _compare_thread(self, old_file, key_columns):
+        """Build the comparison report in a separate thread"""
+        try:
+            self.after(0, lambda: self.compare_button.configure(state="disabled"))
+            self.after(0, lambda: self.status_label.configure(text="Comparing workbooks..."))
+            self.after(0, lambda: self.progress.set(0.3))
+            
+            runner = self.report_runner()
+            with self.runner_lock(runner):
+                report_path = runner.compare(
+                    old_file, self.selected_file, key_columns=key_columns, progress=self.report_progress
+                )
             
+            self.after(0, lambda: self.progress.set(1.0))
+            self.after(0, lambda: self._report_generated_success(report_path))
         except Exception as e:
             self.after(0, lambda: self._report_generated_error(str(e)))
+        finally:
+            self.after(0, lambda: self.compare_button.configure(state="normal"))
             
-    def _report_generated_success(self, report_path):
+    def show_history(self):
+        """List earlier reports of the selected file, or of all files, with their headline metrics"""
+        catalog = self.report_generator.catalog
+        if catalog is None:
+            messagebox.showwarning("Warning", "The report catalog is not available.")
+            return
+            
+        reports = catalog.find(source=self.selected_file)
+        window = ctk.CTkToplevel(self)
+        name = os.path.basename(self.selected_file) if self.selected_file else "All Files"
+        window.title(f"Report History - {name}")
+        window.geometry("760x480")
+        window.transient(self)
+        
+        history_frame = ctk.CTkScrollableFrame(window)
+        history_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        history_frame.grid_columnconfigure(0, weight=1)
+        
+        if not reports:
+            ctk.CTkLabel(history_frame, text="No reports generated yet").grid(row=0, column=0, pady=20)
+            
+        for row, report in enumerate(reports):
+            ctk.CTkLabel(
+                history_frame,
+                text=self.history_text(catalog, report),
+                font=ctk.CTkFont(family="Courier", size=12),
+                justify="left",
+                anchor="w"
+            ).grid(row=row, column=0, sticky="ew", padx=(10, 5), pady=5)
+            
+            ctk.CTkButton(
+                history_frame,
+                text="Open",
+                width=70,
+                state="normal" if report['exists'] else "disabled",
+                command=lambda path=report['report_path']: webbrowser.open(f"file://{path}")
+            ).grid(row=row, column=1, padx=(5, 10), pady=5)
+            
+    @staticmethod
+    def history_text(catalog, report):
+        """Summary line of a catalogued report, with changes since the previous run"""
+        created = datetime.fromtimestamp(report['created_at']).strftime('%Y-%m-%d %H:%M')
+        lines = [f"{created}  {report['source_name']}  {report['report_type']} ({report['output_format']})"]
+        
+        previous = catalog.previous(report['id'])
+        metrics = []
+        for name, label in (('total_rows', 'rows'), ('missing_cells', 'missing'),
+                            ('completeness', 'complete %'), ('quality_score', 'quality')):
+            if report[name] is None:
+                continue
+            text = f"{label} {report[name]:,}"
+            if previous and previous[name] is not None and previous[name] != report[name]:
+                text += f" ({report[name] - previous[name]:+,.6g})"
+            metrics.append(text)
+        lines.append("  " + ", ".join(metrics))
+        if not report['exists']:
+            lines.append("  Report file has been deleted")
+        return "\n".join(lines)
+        
+    def _report_generated_success(self, *report_paths):
         """Handle successful report generation"""
         self.generate_button.configure(state="normal", text="🚀 Generate Report")
         self.status_label.configure(text=f"Report generated successfully!")
         
         # Show success message
+        saved_to = "\n".join(report_paths)
         result = messagebox.askyesno(
             "Success", 
-            f"Report generated successfully!\n\nSaved to: {report_path}\n\nWould you like to open it now?"
+            f"Report generated successfully!\n\nSaved to: {saved_to}\n\nWould you like to open it now?"
         )
         
         if result:
-            webbrowser.open(f"file://{os.path.abspath(report_path)}")
+            for report_path in report_paths:
+                webbrowser.open(f"file://{os.path.abspath(report_path)}")
             
         self.progress.set(0)
         
@@ -362,6 +785,14 @@ The generated report will automatically open in your browser with:
         self.progress.set(0)
         
         messagebox.showerror("Error", f"Failed to generate report:\n{error_msg}")
+        
+    def on_close(self):
+        """Stop background work and close the window"""
+        self.stop_watch()
+        self.release_preview_store()
+        if self.report_worker is not None:
+            self.report_worker.stop()
+        self.destroy()
 
 if __name__ == "__main__":
     app = MainWindow()
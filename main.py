@@ -5,6 +5,9 @@ A professional Windows application for converting Excel files to HTML reports
 
 import sys
 import os
+import argparse
+import multiprocessing
+from datetime import datetime
 from pathlib import Path
 
 def get_resource_path(relative_path):
@@ -21,23 +24,281 @@ def get_resource_path(relative_path):
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-try:
-    import customtkinter as ctk
-    from gui.main_window import MainWindow
-except ImportError as e:
-    print(f"Missing required dependencies: {e}")
-    print("Please install requirements: pip install -r requirements.txt")
-    sys.exit(1)
+def parse_row_range(text):
+    """Turn '1001-2000' or '1001-' (data rows, 1-based, inclusive) into a (start, stop) selection"""
+    first, separator, last = text.partition("-")
+    try:
+        start = int(first) - 1 if first.strip() else 0
+        stop = int(last) if last.strip() else None
+        if not separator:
+            stop = start + 1
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected FIRST-LAST, e.g. 1001-2000, got '{text}'")
+    if start < 0 or (stop is not None and stop <= start):
+        raise argparse.ArgumentTypeError(f"Invalid row range '{text}'")
+    return start, stop
+
+def parse_args(argv=None):
+    """Parse command line options; without any the GUI starts"""
+    parser = argparse.ArgumentParser(description="Excel Data Analysis Report Generator")
+    parser.add_argument(
+        "--watch", nargs="+", metavar="PATH",
+        help="Watch workbooks or folders and regenerate reports when they change (headless)"
+    )
+    parser.add_argument(
+        "--report", metavar="FILE",
+        help="Generate a report for one workbook and exit (headless)"
+    )
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("OLD", "NEW"),
+        help="Write a report of the rows and statistics that changed between two workbooks"
+    )
+    parser.add_argument(
+        "--key", action="append", metavar="COLUMN",
+        help="Key column used to match rows when comparing (repeat for composite keys)"
+    )
+    parser.add_argument(
+        "--report-type", choices=["summary", "detailed", "overview", "all"], default="summary",
+        help="Type of report to generate; all builds every type from one load"
+    )
+    parser.add_argument(
+        "--engine", choices=["auto", "calamine", "openpyxl", "xlrd"], default="auto",
+        help="Spreadsheet reader engine; auto picks the fastest installed one"
+    )
+    parser.add_argument(
+        "--format", choices=["html", "json", "msgpack"], default="html",
+        help="Output of --report and --watch: an HTML report, or the statistics as JSON or MessagePack for other tools"
+    )
+    parser.add_argument("--no-charts", action="store_true", help="Leave charts out of the report")
+    parser.add_argument(
+        "--no-type-inference", action="store_true",
+        help="Load columns with the parser's own types instead of inferring numeric and date columns first"
+    )
+    parser.add_argument(
+        "--columns", type=lambda text: [name.strip() for name in text.split(",") if name.strip()],
+        metavar="A,B,...", help="Only read and report these columns (--report)"
+    )
+    parser.add_argument(
+        "--rows", type=parse_row_range, metavar="FIRST-LAST",
+        help="Only read these data rows, e.g. 1001-2000 or 1001- to the end (--report)"
+    )
+    parser.add_argument(
+        "--memory-budget", type=int, metavar="MB",
+        help="Memory the report may use; larger files are streamed, spilled to disk or sampled (default: half the free memory)"
+    )
+    parser.add_argument(
+        "--queue", metavar="DB",
+        help="Shared SQLite work queue; use with --enqueue, --work, --status or --retry-failed"
+    )
+    parser.add_argument(
+        "--enqueue", nargs="+", metavar="PATH",
+        help="Add report jobs for workbooks or folders to the queue"
+    )
+    parser.add_argument("--work", action="store_true", help="Render queued jobs until the queue is drained")
+    parser.add_argument("--workers", type=int, default=1, help="Local worker processes for --work")
+    parser.add_argument("--status", action="store_true", help="Show queued, running, done and failed jobs")
+    parser.add_argument("--retry-failed", action="store_true", help="Queue failed jobs again")
+    parser.add_argument(
+        "--output-dir", metavar="DIR",
+        help="Report directory of a new queue (default: reports next to the database), or whose history to show"
+    )
+    parser.add_argument(
+        "--history", nargs="?", const="", metavar="FILE",
+        help="List earlier reports with their headline statistics, optionally for one workbook"
+    )
+    parser.add_argument(
+        "--compare-runs", nargs=2, type=int, metavar=("OLD_ID", "NEW_ID"),
+        help="Compare the headline statistics of two reports listed by --history"
+    )
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between file checks")
+    parser.add_argument("--debounce", type=float, default=2.0, help="Seconds a file must be stable before reloading")
+    return parser.parse_args(argv)
+
+def build_pipeline(args):
+    """Report pipeline configured from the command line options"""
+    from core.excel_handler import ExcelHandler
+    from core.load_planner import LoadPlanner
+    from core.report_pipeline import ReportPipeline
+
+    excel_handler = ExcelHandler(engine=args.engine, infer_schema=not args.no_type_inference)
+    memory_budget = args.memory_budget * 1024 * 1024 if args.memory_budget else None
+    return ReportPipeline(
+        excel_handler=excel_handler,
+        load_planner=LoadPlanner(excel_handler, memory_budget=memory_budget)
+    )
+
+def run_report(args):
+    """Write one report or statistics export"""
+    from core.data_processor import REPORT_TYPES
+
+    pipeline = build_pipeline(args)
+    report_types = REPORT_TYPES if args.report_type == "all" else [args.report_type]
+    report_paths = pipeline.run_all(
+        args.report,
+        report_types,
+        include_charts=not args.no_charts,
+        output_format=args.format,
+        columns=args.columns,
+        rows=args.rows
+    )
+    for report_path in report_paths.values():
+        print(f"Report: {os.path.abspath(report_path)}")
+
+def run_watch(args):
+    """Regenerate live reports headlessly until interrupted"""
+    pipeline = build_pipeline(args)
+
+    def report_written(file_path, report_path):
+        print(f"Report updated: {os.path.abspath(report_path)} ({os.path.basename(file_path)})")
+
+    watcher = pipeline.watch(
+        args.watch,
+        report_type=args.report_type,
+        include_charts=not args.no_charts,
+        poll_interval=args.poll_interval,
+        debounce=args.debounce,
+        on_report=report_written,
+        output_format=args.format
+    )
+
+    # Build the initial reports so there is something to open straight away
+    watcher.refresh_all()
+
+    print("Watching for changes. Press Ctrl+C to stop.")
+    watcher.run_forever()
+
+def run_compare(args):
+    """Write a comparison report for two workbooks"""
+    pipeline = build_pipeline(args)
+    report_path = pipeline.compare(args.compare[0], args.compare[1], key_columns=args.key)
+    print(f"Comparison report: {os.path.abspath(report_path)}")
+
+def run_queue(args):
+    """Add jobs to, drain or inspect a shared work queue"""
+    from core.data_processor import REPORT_TYPES
+    from core.excel_handler import ExcelHandler
+    from core.work_queue import WorkQueue, QueueWorker, run_local_workers
+
+    work_queue = WorkQueue(args.queue, output_dir=args.output_dir)
+    try:
+        if args.enqueue:
+            supported_formats = ExcelHandler().supported_formats
+            file_paths = []
+            for path in map(Path, args.enqueue):
+                if path.is_dir():
+                    file_paths.extend(sorted(
+                        p for p in path.iterdir() if p.suffix.lower() in supported_formats
+                    ))
+                else:
+                    file_paths.append(path)
+
+            report_types = REPORT_TYPES if args.report_type == "all" else [args.report_type]
+            added = 0
+            for report_type in report_types:
+                added += work_queue.enqueue(
+                    file_paths,
+                    report_type=report_type,
+                    output_format=args.format,
+                    include_charts=not args.no_charts
+                )
+            print(f"Queued {added} job(s) for {len(file_paths)} file(s)")
+
+        if args.retry_failed:
+            print(f"Requeued {work_queue.retry_failed()} failed job(s)")
+
+        if args.work:
+            print(f"Writing reports to {work_queue.output_dir}")
+            if args.workers > 1:
+                run_local_workers(args.queue, args.workers, poll_interval=args.poll_interval)
+            else:
+                def job_finished(job, report_path, error):
+                    name = os.path.basename(job['file_path'])
+                    if error:
+                        print(f"Failed: {name} ({job['report_type']}): {error}")
+                    else:
+                        print(f"Report: {os.path.abspath(report_path)} ({name})")
+
+                QueueWorker(work_queue, poll_interval=args.poll_interval).run(on_job=job_finished)
+
+        if args.status or args.work:
+            counts = work_queue.counts()
+            print(", ".join(f"{state}: {count}" for state, count in counts.items()))
+            for job in work_queue.failures():
+                print(f"Failed after {job['attempts']} attempt(s): {job['file_path']} "
+                      f"({job['report_type']}): {job['last_error']}")
+    finally:
+        work_queue.close()
+
+def run_history(args):
+    """Look up earlier reports in the catalog, without opening any workbook"""
+    from core.report_catalog import ReportCatalog, CATALOG_NAME, METRICS
+
+    catalog = ReportCatalog(Path(args.output_dir or "reports") / CATALOG_NAME)
+    try:
+        if args.compare_runs:
+            comparison = catalog.compare(*args.compare_runs)
+            for side in ('old', 'new'):
+                report = comparison[side]
+                print(f"{side.title()}: #{report['id']} {report['source_name']} ({report['report_type']}), "
+                      f"{datetime.fromtimestamp(report['created_at']):%Y-%m-%d %H:%M}")
+            for name, values in comparison['metrics'].items():
+                delta = values['delta']
+                change = "" if not delta else f" ({delta:+,.6g})"
+                print(f"  {name.replace('_', ' ')}: {values['old']} -> {values['new']}{change}")
+            return
+
+        reports = catalog.find(source=args.history or None)
+        if not reports:
+            print("No matching reports in the catalog")
+        for report in reports:
+            metrics = ", ".join(
+                f"{name.replace('_', ' ')} {report[name]:,}" for name in METRICS[:4] if report[name] is not None
+            )
+            seconds = sum(report[stage] or 0 for stage in ('load_seconds', 'analysis_seconds', 'render_seconds'))
+            missing = "" if report['exists'] else " [deleted]"
+            print(f"#{report['id']} {datetime.fromtimestamp(report['created_at']):%Y-%m-%d %H:%M} "
+                  f"{report['source_name']} {report['report_type']}/{report['output_format']} "
+                  f"{seconds:.2f}s: {metrics}")
+            print(f"    {report['report_path']}{missing}")
+    finally:
+        catalog.close()
+
+def run_gui():
+    """Start the desktop application"""
+    try:
+        import customtkinter as ctk
+        from gui.main_window import MainWindow
+    except ImportError as e:
+        print(f"Missing required dependencies: {e}")
+        print("Please install requirements: pip install -r requirements.txt")
+        sys.exit(1)
 
-def main():
-    """Main entry point for the application"""
     # Set appearance mode and theme
     ctk.set_appearance_mode("system")  # "system", "dark", "light"
     ctk.set_default_color_theme("blue")  # "blue", "green", "dark-blue"
-    
+
     # Create and run the application
     app = MainWindow()
     app.mainloop()
 
+def main():
+    """Main entry point for the application"""
+    args = parse_args()
+
+    if args.queue:
+        run_queue(args)
+    elif args.history is not None or args.compare_runs:
+        run_history(args)
+    elif args.report:
+        run_report(args)
+    elif args.compare:
+        run_compare(args)
+    elif args.watch:
+        run_watch(args)
+    else:
+        run_gui()
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # The report worker is a spawned process; frozen Windows builds need this
+    multiprocessing.freeze_support()
+    main()
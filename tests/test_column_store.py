@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.column_store import ColumnStore
+from core.data_processor import DataProcessor
+
+def make_chunks(count=4, size=500):
+    rng = np.random.default_rng(0)
+    chunks = []
+    for k in range(count):
+        chunk = pd.DataFrame({
+            'city': pd.Series(rng.choice(['Oslo', 'Zürich', '', None, f'new-{k}'], size), dtype=object),
+            'amount': rng.normal(size=size)
+        })
+        chunks.append(chunk)
+    # A later chunk with text in the numeric column
+    chunks[2]['amount'] = chunks[2]['amount'].astype(object)
+    chunks[2].loc[:2, 'amount'] = 'n/a'
+    return chunks
+
+@pytest.fixture
+def store(tmp_path):
+    store = ColumnStore.from_chunks(make_chunks(), scratch_dir=tmp_path)
+    yield store
+    store.cleanup()
+
+def test_text_columns_decode_from_disk_dictionaries(store):
+    expected = pd.concat(make_chunks(), ignore_index=True)['city']
+    
+    # Dictionaries live in files; nothing is kept in memory after the spill
+    assert not store._category_lookup
+    # Codes follow the order of first appearance
+    assert store.categories('city') == list(expected.dropna().unique())
+    
+    decoded = store.series('city')
+    assert decoded.isna().equals(expected.isna())
+    assert (decoded.dropna() == expected.dropna()).all()
+    assert store.series('city', 100, 110).tolist() == expected[100:110].tolist()
+
+def test_many_distinct_values_share_codes_across_chunks(tmp_path):
+    chunks = [pd.DataFrame({'id': [f'id{i % 3000}' for i in range(start, start + 1000)]})
+              for start in range(0, 6000, 1000)]
+    with ColumnStore.from_chunks(chunks, scratch_dir=tmp_path) as store:
+        assert len(store.categories('id')) == 3000
+        assert np.asarray(store.column('id')).max() == 2999
+        assert store.series('id').tolist() == pd.concat(chunks, ignore_index=True)['id'].tolist()
+
+def test_coercions_are_reported(store):
+    assert store.coercions['amount']['values_coerced_to_missing'] == 3
+    assert store.coercions['amount']['examples'] == ['n/a']
+    
+    processed = DataProcessor().process_column_store(store)
+    coercion = processed['schema']['coercions']['amount']
+    assert coercion['values_coerced_to_missing'] == 3
+    assert coercion['values_converted'] == 1997
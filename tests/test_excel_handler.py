@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from core.excel_handler import ExcelHandler
+
+@pytest.fixture
+def orders_csv(tmp_path):
+    path = tmp_path / 'orders.csv'
+    lines = ['Order export', '', 'id,amount,code']
+    lines += [f'{i},{i * 1.5},{i:05d}' for i in range(1, 2001)]
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+def test_delimited_read_matches_chunked_read(orders_csv):
+    handler = ExcelHandler()
+    eager = handler.load_file(orders_csv)
+    chunked = handler.load_chunked(orders_csv, chunksize=300)
+    
+    assert list(eager.columns) == ['id', 'amount', 'code']
+    assert eager['code'].iloc[0] == '00001'
+    pd.testing.assert_frame_equal(eager, chunked)
+    
+def test_delimited_row_selection(orders_csv):
+    data = ExcelHandler().load_file(orders_csv, rows=(10, 20))
+    
+    assert data['id'].tolist() == list(range(11, 21))
+
+def test_only_loadable_formats_are_valid(tmp_path):
+    handler = ExcelHandler()
+    for name in ('book.xlsx', 'book.xlsm'):
+        (tmp_path / name).write_bytes(b'')
+        
+    assert handler.is_valid_file(str(tmp_path / 'book.xlsx'))
+    assert not handler.is_valid_file(str(tmp_path / 'book.xlsm'))
+    assert not handler.is_valid_file(str(tmp_path / 'missing.csv'))
+
+def test_tsv_loads_like_csv(orders_csv, tmp_path):
+    path = tmp_path / 'orders.tsv'
+    with open(orders_csv) as f:
+        path.write_text(f.read().replace(',', '\t'))
+    handler = ExcelHandler()
+    
+    pd.testing.assert_frame_equal(handler.load_file(str(path)), handler.load_file(orders_csv))
+
+def test_parquet_keeps_its_schema(tmp_path):
+    pytest.importorskip('pyarrow')
+    expected = pd.DataFrame({
+        'id': range(1, 101),
+        'amount': [i * 1.5 for i in range(100)],
+        'code': [f'{i:05d}' for i in range(100)],
+        'ordered': pd.date_range('2024-01-01', periods=100, freq='D')
+    })
+    path = tmp_path / 'orders.parquet'
+    expected.to_parquet(path, index=False)
+    
+    data = ExcelHandler().load_file(str(path), columns=['id', 'code', 'ordered'], rows=(10, 20))
+    
+    pd.testing.assert_frame_equal(data, expected[['id', 'code', 'ordered']].iloc[10:20].reset_index(drop=True))
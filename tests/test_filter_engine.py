@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data_processor import DataProcessor
+from core.filter_engine import Contains, Equals, IsNull, Prefix, Range
+
+DAY = pd.Timestamp('2024-01-05')
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(3)
+    n = 500
+    data = pd.DataFrame({
+        'units': rng.integers(0, 5, n),
+        'amount': rng.normal(50, 20, n).round(1),
+        'region': rng.choice(['North', 'south', 'East', 'north-west'], n).astype(object),
+        'ordered': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 30, n), unit='D')
+    })
+    data.loc[::7, 'amount'] = np.nan
+    data.loc[::11, 'region'] = None
+    data.loc[::13, 'ordered'] = pd.NaT
+    return data
+
+@pytest.fixture
+def processor(data):
+    processor = DataProcessor()
+    processor.data = data
+    return processor
+
+@pytest.mark.parametrize('filters, query', [
+    ({'region': 'north'}, "region.str.contains('north', case=False, na=False)"),
+    ({'region': '^nor'}, "region.str.contains('^nor', case=False, na=False)"),
+    ({'units': [1, 3]}, "units in [1, 3]"),
+    ({'amount': {'min': 30, 'max': 60}}, "30 <= amount <= 60"),
+    ({'amount': {'min': 70}}, "amount >= 70"),
+    ({'region': None}, "region.isna()"),
+    ({'units': 2, 'region': 'south'}, "units == 2 and region.str.contains('south', case=False, na=False)"),
+    (Range('amount', 30, 60, inclusive=False) | Equals('units', 0), "(30 < amount < 60) or units == 0"),
+    (Prefix('region', 'NOR') & IsNull('amount', null=False), "region.str.lower().str.startswith('nor', na=False) and amount.notna()"),
+    (Contains('region', 'TH') & Range('ordered', '2024-01-10', '2024-01-20'),
+     "region.str.contains('th', case=False, na=False) and '2024-01-10' <= ordered <= '2024-01-20'"),
+    ({'ordered': DAY}, "ordered == @DAY"),
+    ({'missing_column': 1}, "index == index"),
+])
+def test_filters_match_query(processor, data, filters, query):
+    pd.testing.assert_frame_equal(processor.filter_data(filters), data.query(query, engine='python'))
+
+@pytest.mark.parametrize('columns, ascending', [
+    ('amount', True),
+    ('amount', False),
+    ('region', True),
+    ('ordered', False),
+    (['units', 'amount'], True),
+    (['units', 'amount'], [True, False]),
+    (['region', 'units', 'ordered'], [False, True, False]),
+])
+def test_sorts_match_sort_values(processor, data, columns, ascending):
+    expected = data.sort_values(columns, ascending=ascending, kind='stable', na_position='last')
+    
+    pd.testing.assert_frame_equal(processor.sort_data(columns, ascending), expected)
+    pd.testing.assert_frame_equal(processor.sorted_view(columns, ascending, 10, 20), expected.iloc[10:20])
+
+def test_indexes_follow_replaced_data(processor, data):
+    assert len(processor.filter_data({'units': 4})) == (data['units'] == 4).sum()
+    first = processor.sort_data('amount')
+    
+    replaced = data.assign(units=4 - data['units'], amount=-data['amount'])
+    processor.data = replaced
+    
+    pd.testing.assert_frame_equal(processor.filter_data({'units': 4}), replaced[replaced['units'] == 4])
+    pd.testing.assert_frame_equal(
+        processor.sort_data('amount'), replaced.sort_values('amount', kind='stable')
+    )
+    assert not processor.sort_data('amount').index.equals(first.index)
@@ -0,0 +1,46 @@
+import pytest
+
+from core.excel_handler import ExcelHandler
+from core.load_planner import LoadPlanner
+from core.report_generator import ReportGenerator
+from core.report_pipeline import ReportPipeline
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / 'orders.csv'
+    path.write_text('id,amount\n' + ''.join(f'{i},{i * 1.5}\n' for i in range(200)))
+    return str(path)
+
+def not_called(*args, **kwargs):
+    raise AssertionError("should not have been called")
+
+def test_small_files_are_planned_without_reading_them(workbook, monkeypatch):
+    excel_handler = ExcelHandler()
+    planner = LoadPlanner(excel_handler, memory_budget=64 * 1024 ** 2)
+    monkeypatch.setattr(excel_handler, 'iter_chunks', not_called)
+    monkeypatch.setattr(planner, 'estimate_dimensions', not_called)
+    
+    plan = planner.plan(workbook)
+    assert plan.strategy == 'eager'
+    assert plan.rows is None
+
+def test_files_near_the_budget_are_estimated(workbook):
+    plan = LoadPlanner(ExcelHandler(), memory_budget=64 * 1024).plan(workbook)
+    assert plan.strategy == 'eager'
+    assert plan.rows == 200
+
+def test_cache_hits_do_not_depend_on_the_free_memory(workbook, tmp_path):
+    reports = str(tmp_path / 'reports')
+    
+    def pipeline(memory_budget):
+        excel_handler = ExcelHandler()
+        return ReportPipeline(
+            excel_handler=excel_handler,
+            report_generator=ReportGenerator(output_dir=reports),
+            load_planner=LoadPlanner(excel_handler, memory_budget=memory_budget)
+        )
+        
+    report = pipeline(3 * 1024 ** 3).run(workbook, include_charts=False)
+    again = pipeline(5 * 1024 ** 3)
+    again.data_processor.process_data = not_called
+    assert again.run(workbook, include_charts=False) == report
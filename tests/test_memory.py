@@ -0,0 +1,62 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import core.excel_handler
+from core.data_processor import DataProcessor
+from core.excel_handler import ExcelHandler
+
+ROWS = 200000
+
+@pytest.fixture(scope='module')
+def csv_path(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({f'value_{i}': rng.normal(size=ROWS) for i in range(8)})
+    data['group'] = rng.integers(0, 50, ROWS)
+    path = tmp_path_factory.mktemp('memory') / 'values.csv'
+    data.to_csv(path, index=False, float_format='%.6f')
+    return str(path)
+
+@pytest.fixture
+def numeric_csv(csv_path, monkeypatch):
+    # Arrow allocates outside the Python allocators, hidden from tracemalloc;
+    # the C parser's buffers are numpy arrays it can see
+    monkeypatch.setattr(core.excel_handler, 'has_pyarrow', lambda: False)
+    return csv_path
+
+def peak_allocation(func, *args, **kwargs):
+    """Result of func and the peak bytes allocated while it ran"""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = func(*args, **kwargs)
+        return result, tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+def test_load_peaks_near_one_copy_of_the_frame(numeric_csv):
+    data, peak = peak_allocation(ExcelHandler().load_file, numeric_csv)
+    frame_bytes = data.memory_usage(deep=True).sum()
+    
+    assert len(data) == ROWS
+    # Parser buffers plus the frame; cleaning must not add a copy
+    assert peak < 1.5 * frame_bytes
+
+def test_clean_data_does_not_copy_clean_frames(numeric_csv):
+    handler = ExcelHandler()
+    data = handler.load_file(numeric_csv)
+    
+    cleaned, peak = peak_allocation(handler.clean_data, data)
+    
+    pd.testing.assert_frame_equal(cleaned, data)
+    assert peak < 0.25 * data.memory_usage(deep=True).sum()
+
+def test_processing_shares_the_loaded_frame(numeric_csv):
+    data = ExcelHandler().load_file(numeric_csv)
+    
+    _, peak = peak_allocation(DataProcessor().process_data, data, 'summary')
+    
+    # Frame-sized blocks are never built, so a copy of the data would show
+    assert peak < 1.5 * data.memory_usage(deep=True).sum()
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data_processor import DataProcessor
+from core.histogram import Histogram
+from core.profile_snapshot import ProfileSnapshot
+
+def make_frame(n, seed):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        'amount': rng.normal(100, 15, n),
+        'units': rng.integers(0, 10, n),
+        'region': rng.choice(['north', 'south', 'east-1', 'west'], n),
+        'order_id': [f'ord{seed}-{i}' for i in range(n)],
+        'ordered': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 10**7, n), unit='s')
+    })
+    data.loc[::9, 'amount'] = np.nan
+    return data
+
+def section(report, title):
+    return next(s['content'] for s in report['sections'] if s['title'] == title)
+
+@pytest.fixture
+def workbook(tmp_path):
+    return str(tmp_path / 'orders.xlsx')
+
+@pytest.fixture
+def appended():
+    old = make_frame(20000, 0)
+    # New rows, including repeats of saved rows
+    new = pd.concat([old, make_frame(500, 1), old.iloc[:25]], ignore_index=True)
+    return old, new
+
+def test_incremental_run_profiles_only_appended_rows(workbook, appended, monkeypatch):
+    old, new = appended
+    DataProcessor().process_data(old, 'summary', source_file=workbook)
+    
+    hashed, profiled = [], []
+    hash_rows, compute_stats = ProfileSnapshot.hash_rows, ProfileSnapshot.compute_stats
+    monkeypatch.setattr(ProfileSnapshot, 'hash_rows',
+                        staticmethod(lambda data: hashed.append(len(data)) or hash_rows(data)))
+    monkeypatch.setattr(ProfileSnapshot, 'compute_stats',
+                        classmethod(lambda cls, data: profiled.append(len(data)) or compute_stats(data)))
+    
+    appended_rows = len(new) - len(old)
+    
+    # Whole-frame passes the snapshot replaces may only see appended rows
+    def guard(name):
+        original = getattr(pd.DataFrame, name)
+        def checked(self, *args, **kwargs):
+            assert len(self) <= appended_rows, f'{name} ran over saved rows'
+            return original(self, *args, **kwargs)
+        monkeypatch.setattr(pd.DataFrame, name, checked)
+    for name in ('isnull', 'duplicated', 'memory_usage'):
+        guard(name)
+    monkeypatch.setattr(DataProcessor, 'get_frequencies', None)
+    monkeypatch.setattr(DataProcessor, 'summarize_numeric_array', None)
+    
+    report = DataProcessor().process_data(new, 'summary', source_file=workbook)
+    
+    assert report['incremental_profile'] == {'mode': 'incremental', 'profiled_rows': appended_rows}
+    assert profiled == [appended_rows]
+    # Saved rows hashed once for the fingerprint check, appended rows once
+    assert hashed == [len(old), appended_rows]
+
+def test_incremental_statistics_match_full_run(workbook, appended):
+    old, new = appended
+    DataProcessor().process_data(old, 'summary', source_file=workbook)
+    incremental = DataProcessor().process_data(new, 'summary', source_file=workbook)
+    full = DataProcessor().process_data(new, 'summary')
+    
+    assert incremental['incremental_profile']['mode'] == 'incremental'
+    for key in ('missing_values', 'memory_usage'):
+        assert incremental[key] == full[key]
+    for title in ('Data Overview', 'Text Analysis', 'Time Series Analysis'):
+        assert section(incremental, title) == section(full, title)
+    assert section(incremental, 'Data Overview')['data_quality']['duplicate_rows'] == 25
+    
+    merged, exact = section(incremental, 'Numeric Analysis'), section(full, 'Numeric Analysis')
+    # Few distinct values: every statistic is exact
+    assert merged['units'].pop('quartiles') == exact['units'].pop('quartiles')
+    assert merged['units'] == pytest.approx(exact['units'])
+    # Many distinct values: moments exact, quantiles from the histogram
+    amount, expected = merged['amount'], exact['amount']
+    for key in ('count', 'mean', 'std', 'min', 'max'):
+        assert amount[key] == pytest.approx(expected[key])
+    assert amount['median'] == pytest.approx(expected['median'], abs=0.1)
+    assert amount['quartiles']['q1'] == pytest.approx(expected['quartiles']['q1'], abs=0.1)
+    assert amount['outliers_count'] == pytest.approx(expected['outliers_count'], abs=5)
+
+def test_edited_rows_trigger_full_run(workbook, appended):
+    old, new = appended
+    DataProcessor().process_data(old, 'summary', source_file=workbook)
+    
+    new.loc[3, 'units'] = 99
+    report = DataProcessor().process_data(new, 'summary', source_file=workbook)
+    
+    assert report['incremental_profile'] == {'mode': 'full', 'profiled_rows': len(new)}
+    assert report['numeric_stats']['max']['units'] == 99
+
+def test_edits_in_the_middle_trigger_full_run(workbook, appended):
+    old, new = appended
+    DataProcessor().process_data(old, 'summary', source_file=workbook)
+    
+    new.loc[len(old) // 2, 'amount'] = 1e9
+    report = DataProcessor().process_data(new, 'summary', source_file=workbook)
+    
+    assert report['incremental_profile'] == {'mode': 'full', 'profiled_rows': len(new)}
+    assert report['numeric_stats']['max']['amount'] == 1e9
+
+def test_full_run_statistics_are_exact(workbook, appended):
+    _, new = appended
+    saved = DataProcessor().process_data(new, 'summary', source_file=workbook)
+    plain = DataProcessor().process_data(new, 'summary')
+    
+    assert saved['incremental_profile']['mode'] == 'full'
+    assert section(saved, 'Numeric Analysis') == section(plain, 'Numeric Analysis')
+    assert saved['numeric_stats'] == plain['numeric_stats']
+
+def test_snapshot_round_trip(workbook, appended):
+    old, _ = appended
+    snapshot = ProfileSnapshot.from_data(old)
+    snapshot.save(workbook)
+    loaded = ProfileSnapshot.load(workbook)
+    
+    assert loaded.to_dict() == snapshot.to_dict()
+    assert loaded.matches_prefix(old)
+    assert not loaded.matches_prefix(old.iloc[:-1])
+
+def test_histogram_merge_coarsens_finer_histogram():
+    values = np.random.default_rng(2).normal(10, 3, 50000)
+    fine = Histogram(1024).add(values)
+    coarse = Histogram().merge(fine)
+    
+    assert coarse.count == fine.count == len(values)
+    assert (coarse.min, coarse.max) == (fine.min, fine.max)
+    assert fine.quantile(0.5) == pytest.approx(np.median(values), abs=fine.width)
+    assert coarse.quantile(0.5) == pytest.approx(np.median(values), abs=coarse.width)
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from core import reader_engines
+from core.excel_handler import ExcelHandler
+from core.reader_engines import get_engine, select_engine
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+ENGINES_BY_FILE = {
+    'orders.xlsx': ['calamine', 'openpyxl'],
+    'orders.xls': ['calamine', 'xlrd']
+}
+
+def require(engine_name):
+    if not get_engine(engine_name).is_available():
+        pytest.skip(f"reader engine '{engine_name}' is not installed")
+
+def load(file_name, engine_name, **selection):
+    require(engine_name)
+    handler = ExcelHandler(engine=engine_name)
+    assert handler.get_reader_engine(str(FIXTURES / file_name)).name == engine_name
+    return handler.load_file(str(FIXTURES / file_name), **selection)
+
+@pytest.mark.parametrize('file_name', sorted(ENGINES_BY_FILE))
+def test_engines_load_identical_frames(file_name):
+    first, *others = ENGINES_BY_FILE[file_name]
+    expected = load(file_name, first)
+    
+    assert len(expected) == 40
+    assert expected['ordered'].dtype.kind == 'M'
+    for engine_name in others:
+        pd.testing.assert_frame_equal(load(file_name, engine_name), expected)
+
+@pytest.mark.parametrize('file_name', sorted(ENGINES_BY_FILE))
+def test_engines_agree_on_selections(file_name):
+    selection = {'columns': ['id', 'amount', 'ordered'], 'rows': (5, 15)}
+    first, *others = ENGINES_BY_FILE[file_name]
+    expected = load(file_name, first, **selection)
+    
+    assert expected['id'].tolist() == list(range(6, 16))
+    for engine_name in others:
+        pd.testing.assert_frame_equal(load(file_name, engine_name, **selection), expected)
+
+def test_xlsx_and_xls_fixtures_hold_the_same_data():
+    pd.testing.assert_frame_equal(load('orders.xls', 'xlrd'), load('orders.xlsx', 'openpyxl'))
+
+def test_missing_forced_engine_is_an_error(monkeypatch):
+    monkeypatch.setattr(reader_engines.CalamineEngine, 'is_available', lambda self: False)
+    
+    with pytest.raises(ImportError, match="'calamine' is not installed"):
+        select_engine(str(FIXTURES / 'orders.xlsx'), 'calamine')
+    assert select_engine(str(FIXTURES / 'orders.xlsx')).name == 'openpyxl'
+
+def test_forced_engine_for_other_format_falls_back(capsys):
+    require('openpyxl')
+    
+    assert select_engine(str(FIXTURES / 'orders.xlsx'), 'xlrd').name in ('calamine', 'openpyxl')
+    assert "'xlrd' cannot read '.xlsx' files" in capsys.readouterr().out
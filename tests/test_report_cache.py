@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import pytest
+
+from core.excel_handler import ExcelHandler
+from core.report_cache import ReportCache
+from core.report_generator import ReportGenerator
+from core.report_pipeline import ReportPipeline
+
+@pytest.fixture
+def workbooks(tmp_path):
+    first = tmp_path / 'sales_north.csv'
+    first.write_text('region,amount\nnorth,10\nsouth,20\nnorth,30\n')
+    second = tmp_path / 'sales_copy.csv'
+    shutil.copy(first, second)
+    return str(first), str(second)
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return ReportPipeline(report_generator=ReportGenerator(output_dir=str(tmp_path / 'reports')))
+
+def test_copies_with_the_same_content_get_their_own_reports(pipeline, workbooks):
+    first, second = workbooks
+    first_report = pipeline.run(first, include_charts=False)
+    second_report = pipeline.run(second, include_charts=False)
+    
+    assert first_report != second_report
+    with open(second_report, encoding='utf-8') as f:
+        assert 'sales_copy.csv' in f.read()
+
+def test_cache_hits_are_catalogued(pipeline, workbooks):
+    first, _ = workbooks
+    report = pipeline.run(first, include_charts=False)
+    assert pipeline.run(first, include_charts=False) == report
+    
+    rendered, reused = sorted(pipeline.report_generator.catalog.find(source=first), key=lambda r: r['id'])
+    assert reused['report_path'] == rendered['report_path']
+    assert reused['total_rows'] == rendered['total_rows'] == 3
+    assert reused['options']['cache_hit'] is True
+    assert reused['render_seconds'] == 0
+
+def test_cache_only_lookups_do_not_render(pipeline, workbooks):
+    first, _ = workbooks
+    assert pipeline.run(first, include_charts=False, cache_only=True) is None
+    assert pipeline.run_all(first, include_charts=False, cache_only=True) == {}
+    
+    report = pipeline.run(first, include_charts=False)
+    assert pipeline.run(first, include_charts=False, cache_only=True) == report
+    assert pipeline.run_all(first, include_charts=False, cache_only=True) == {'summary': report}
+    
+def test_reader_options_are_part_of_the_key(pipeline, workbooks, tmp_path):
+    first, _ = workbooks
+    report = pipeline.run(first, include_charts=False)
+    
+    untyped = ReportPipeline(
+        excel_handler=ExcelHandler(infer_schema=False),
+        report_generator=ReportGenerator(output_dir=str(tmp_path / 'reports'))
+    )
+    assert untyped.run(first, include_charts=False) != report
+
+def test_prune_counts_hard_linked_reports_once(tmp_path):
+    cache = ReportCache(tmp_path, tmp_path, max_bytes=1500)
+    report = tmp_path / 'report_summary_0123456789abcdef.html'
+    report.write_bytes(b'x' * 1000)
+    os.link(report, tmp_path / 'latest.html')
+    
+    # 1000 bytes on disk, under the limit, though the two names add up to 2000
+    assert cache.prune() == 0
+    assert report.exists() and (tmp_path / 'latest.html').exists()
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.excel_handler import ExcelHandler
+from core.schema_inference import BOOLEAN, NUMERIC, SchemaInference
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+def test_flags_are_not_numbers():
+    inference = SchemaInference()
+    
+    assert inference.infer_column(pd.Series([True, False, None, True], dtype=object))[0] == BOOLEAN
+    assert inference.infer_column(pd.Series([np.True_, np.False_], dtype=object))[0] == BOOLEAN
+    assert inference.infer_column(pd.Series([*range(19), True], dtype=object))[0] == NUMERIC
+
+def test_workbook_flags_stay_bool():
+    data = ExcelHandler().load_file(str(FIXTURES / 'orders.xlsx'))
+    
+    assert pd.api.types.is_bool_dtype(data['paid'])
+    assert data.attrs['schema']['column_kinds']['paid'] == BOOLEAN
@@ -0,0 +1,64 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.shared_frame import SHM_DIR, SharedFrame, attach_frame
+
+def make_frame():
+    data = pd.DataFrame({
+        'amount': np.arange(10, dtype='float64') * 1.5,
+        'units': np.arange(10),
+        'ordered': pd.date_range('2024-01-01', periods=10),
+        'region': pd.Series(['north', 'south'] * 5, dtype='category'),
+        'code': [f'{i:03d}' for i in range(10)],
+        'mixed': [1, 'a', 2, 'b', 3, 'c', 4, 'd', 5, 'e']
+    })
+    data.attrs['schema'] = {'header_row': 0}
+    return data
+
+def segment_exists(shared):
+    return os.path.exists(os.path.join(SHM_DIR, shared.handle.name.lstrip('/')))
+
+def attach_and_crash(handle, connection):
+    data = attach_frame(handle)
+    connection.send(float(data['amount'].sum()))
+    os._exit(1)
+
+def test_attached_frame_matches_the_published_one():
+    data = make_frame()
+    with SharedFrame(data) as shared:
+        attached = attach_frame(shared.handle)
+        
+    # Views outlive the publisher's release
+    pd.testing.assert_frame_equal(attached, data)
+    assert attached.attrs == data.attrs
+    assert not attached['amount'].to_numpy().flags.writeable
+
+def test_attach_keeps_object_dtypes_of_slices():
+    # Every other row of the mixed column holds only ints
+    data = make_frame().iloc[::2]
+    with SharedFrame(data) as shared:
+        attached = attach_frame(shared.handle)
+        
+    assert attached['mixed'].dtype == object
+    pd.testing.assert_frame_equal(attached, data)
+
+@pytest.mark.skipif(not os.path.isdir(SHM_DIR), reason="segments are not visible as files")
+def test_release_removes_the_segment_after_a_reader_crashes():
+    shared = SharedFrame(make_frame())
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    reader = context.Process(target=attach_and_crash, args=(shared.handle, sender))
+    reader.start()
+    assert receiver.poll(60)
+    assert receiver.recv() == 67.5
+    reader.join()
+    
+    assert reader.exitcode == 1
+    assert segment_exists(shared)
+    shared.release()
+    assert not segment_exists(shared)
+    shared.release()
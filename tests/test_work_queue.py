@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from core.work_queue import DONE, FAILED, LEASED, QUEUED, WorkQueue, run_local_workers
+
+@pytest.fixture
+def workbooks(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / f'region_{i}.csv'
+        path.write_text('region,amount\n' + ''.join(f'r{i},{j}\n' for j in range(20)))
+        paths.append(str(path))
+    broken = tmp_path / 'broken.xlsx'
+    broken.write_bytes(b'not a workbook')
+    return paths, str(broken)
+
+@pytest.fixture
+def work_queue(tmp_path):
+    work_queue = WorkQueue(tmp_path / 'queue.db')
+    yield work_queue
+    work_queue.close()
+
+def test_local_workers_drain_the_queue(workbooks, work_queue):
+    paths, broken = workbooks
+    assert work_queue.enqueue(paths + [broken], include_charts=False, max_attempts=2) == 7
+    
+    exit_codes = run_local_workers(work_queue.db_path, 3, poll_interval=0.1, retry_delay=0)
+    
+    assert exit_codes == [0, 0, 0]
+    assert work_queue.counts() == {QUEUED: 0, LEASED: 0, DONE: 6, FAILED: 1}
+    (failure,) = work_queue.failures()
+    assert failure['file_path'].endswith('broken.xlsx')
+    assert failure['attempts'] == 2
+
+def test_expired_lease_is_reclaimed(workbooks, work_queue):
+    paths, _ = workbooks
+    work_queue.enqueue(paths[:1])
+    
+    job = work_queue.claim('crashed', lease_seconds=0.05)
+    assert work_queue.claim('other') is None
+    time.sleep(0.1)
+    
+    reclaimed = work_queue.claim('other')
+    assert reclaimed['id'] == job['id']
+    assert reclaimed['lease_owner'] == 'other'
+    assert reclaimed['attempts'] == 2
+
+def test_lost_lease_ignores_complete_and_fail(workbooks, work_queue):
+    paths, _ = workbooks
+    work_queue.enqueue(paths[:1])
+    job = work_queue.claim('slow', lease_seconds=0.05)
+    time.sleep(0.1)
+    work_queue.claim('other')
+    
+    assert not work_queue.renew(job['id'], 'slow')
+    assert not work_queue.complete(job['id'], 'slow', 'report.html')
+    assert not work_queue.fail(job['id'], 'slow', 'late error')
+    assert work_queue.counts()[LEASED] == 1
+    assert work_queue.complete(job['id'], 'other', 'report.html')
+    assert work_queue.counts()[DONE] == 1
+
+def test_last_attempt_lease_expiry_marks_job_failed(workbooks, work_queue):
+    paths, _ = workbooks
+    work_queue.enqueue(paths[:1], max_attempts=1)
+    work_queue.claim('crashed', lease_seconds=0.05)
+    time.sleep(0.1)
+    
+    assert work_queue.claim('other') is None
+    (failure,) = work_queue.failures()
+    assert failure['last_error'] == 'Lease expired on crashed'
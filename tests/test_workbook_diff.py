@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.workbook_diff import WorkbookDiff
+
+@pytest.fixture
+def versions():
+    old = pd.DataFrame({
+        'id': [1, 2, 3, 4, 5],
+        'region': ['north', 'south', 'east', 'west', 'north'],
+        'amount': [10, 20, 30, 40, 50]
+    })
+    # 2 removed, 6 added, 3 and 5 modified (5 through a new blank cell)
+    new = pd.DataFrame({
+        'id': [1, 3, 4, 5, 6],
+        'region': ['north', 'east', 'west', 'north', 'south'],
+        'amount': [10.0, 35.0, 40.0, np.nan, 60.0],
+        'note': ['', 'late', '', '', 'new']
+    })
+    return old, new
+
+def test_key_mode_finds_added_removed_and_modified_rows(versions):
+    old, new = versions
+    diff = WorkbookDiff(old, new, key_columns=['id']).compare()
+    
+    assert diff['mode'] == 'key'
+    assert (diff['added_rows'], diff['removed_rows'], diff['modified_rows'], diff['unchanged_rows']) == (1, 1, 2, 2)
+    assert diff['added_columns'] == ['note'] and diff['removed_columns'] == []
+    assert diff['column_changes'] == {'amount': 2}
+    assert diff['added_sample']['rows'] == [[6, 'south', 60.0, 'new']]
+    assert diff['removed_sample']['rows'] == [[2, 'south', 20]]
+    assert diff['modified_sample'] == [
+        {'key': '3', 'changes': {'amount': {'old': 30, 'new': 35.0}}},
+        {'key': '5', 'changes': {'amount': {'old': 50, 'new': ''}}}
+    ]
+
+def test_int_to_float_columns_still_match(versions):
+    old, _ = versions
+    diff = WorkbookDiff(old, old.astype({'amount': 'float64'}), key_columns=['id']).compare()
+    
+    assert (diff['added_rows'], diff['removed_rows'], diff['modified_rows']) == (0, 0, 0)
+
+def test_duplicate_keys_are_paired_by_occurrence():
+    old = pd.DataFrame({'sku': ['a', 'b', 'a', 'a'], 'qty': [1, 2, 3, 4]})
+    new = pd.DataFrame({'sku': ['b', 'a', 'a'], 'qty': [2, 1, 30]})
+    
+    old_rows, new_rows, removed, added = WorkbookDiff.match_rows(
+        old['sku'].to_numpy(), new['sku'].to_numpy()
+    )
+    assert list(zip(old_rows, new_rows)) == [(0, 1), (1, 0), (2, 2)]
+    assert list(removed) == [3] and list(added) == []
+    
+    diff = WorkbookDiff(old, new, key_columns=['sku']).compare()
+    assert (diff['removed_rows'], diff['modified_rows'], diff['unchanged_rows']) == (1, 1, 2)
+    assert diff['removed_sample']['rows'] == [['a', 4]]
+
+def test_row_hash_mode_matches_whole_rows(versions):
+    old, new = versions
+    diff = WorkbookDiff(old, new[['id', 'region', 'amount']]).compare()
+    
+    # Without a key a changed row is one removal and one addition
+    assert diff['mode'] == 'row_hash'
+    assert (diff['added_rows'], diff['removed_rows'], diff['unchanged_rows']) == (3, 3, 2)
+
+def test_missing_key_columns_are_rejected(versions):
+    old, new = versions
+    with pytest.raises(ValueError, match='note'):
+        WorkbookDiff(old, new, key_columns=['note'])
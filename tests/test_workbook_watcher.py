@@ -0,0 +1,34 @@
+import threading
+import time
+
+from core.workbook_watcher import WorkbookWatcher
+
+def test_refresh_runs_on_polling_thread_without_overlap(tmp_path):
+    workbook = tmp_path / 'orders.xlsx'
+    workbook.write_bytes(b'first')
+    
+    calls, active = [], []
+    finished = threading.Event()
+    
+    def on_change(file_path, content_hash):
+        active.append(file_path)
+        assert len(active) == 1, 'refreshes overlapped'
+        calls.append((threading.current_thread(), content_hash))
+        if content_hash is None:
+            # A slow first report; the edit below lands while it renders
+            workbook.write_bytes(b'second')
+            time.sleep(0.1)
+        else:
+            finished.set()
+        active.pop()
+        
+    watcher = WorkbookWatcher([workbook], on_change, poll_interval=0.01, debounce=0.02)
+    watcher.start(refresh=True)
+    try:
+        assert finished.wait(5)
+    finally:
+        watcher.stop()
+        
+    assert calls[0][1] is None and calls[1][1] is not None
+    # Both on the one polling thread, not the caller's
+    assert calls[0][0] is calls[1][0] is not threading.current_thread()
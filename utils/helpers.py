@@ -1,5 +1,6 @@
 import os
 import sys
+import hashlib
 from pathlib import Path
 
 def get_project_root():
@@ -26,4 +27,12 @@ def safe_filename(filename):
     invalid_chars = '<>:"/\\|?*'
     for char in invalid_chars:
         filename = filename.replace(char, '_')
-    return filename 
\ No newline at end of file
+    return filename 
+
+def file_content_hash(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()